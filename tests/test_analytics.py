@@ -0,0 +1,84 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import random
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.app import app
+from zqautonxg.runtime.analytics import HOUR, MINUTE, DurationSketch, ExecutionAnalytics, analytics
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def test_sketch_percentiles_are_within_relative_error():
+    rng = random.Random(7)
+    values = sorted(rng.lognormvariate(5, 1.5) for _ in range(5000))
+    halves = DurationSketch(), DurationSketch()
+    for i, value in enumerate(values):
+        halves[i % 2].add(value)
+    halves[0].merge(halves[1])
+    for q in (0.5, 0.9, 0.95, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(halves[0].quantile(q) - exact) / exact < 0.05
+
+
+def test_rollups_merge_minute_and_hour_buckets():
+    rollups = ExecutionAnalytics()
+    now = time.time()
+    for i in range(120):
+        at = now - i * 30  # one execution every 30s over the last hour
+        rollups.record("wf", "failed" if i % 4 == 0 else "success", 100.0 + i, at)
+    rollups.record("other", "success", 5.0, now)
+
+    since = now - 10 * MINUTE
+    result = rollups.query(["wf"], since, now, MINUTE)
+    summary = result["workflows"]["wf"]
+    expected = [i for i in range(120) if now - i * 30 >= since // MINUTE * MINUTE]
+    assert summary["executions"] == len(expected)
+    assert summary["duration_ms"]["min"] == 100.0
+
+    hourly = rollups.query(None, now - 2 * HOUR, now, HOUR, series=True)
+    assert hourly["workflows"]["wf"]["executions"] == 120
+    assert hourly["workflows"]["wf"]["by_status"] == {"failed": 30, "success": 90}
+    assert hourly["workflows"]["wf"]["success_rate"] == 0.75
+    assert sum(p["executions"] for p in hourly["workflows"]["wf"]["series"]) == 120
+    assert hourly["total"]["executions"] == 121
+
+    rollups.forget("wf")
+    assert list(rollups.query(None, now - HOUR, now, MINUTE)["workflows"]) == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_analytics_endpoint_reports_finished_executions(client):
+    response = await client.post(
+        "/api/v1/workflows",
+        json={"name": "Analytics", "nodes": [{"id": "a", "type": "passthrough", "position": {"x": 0, "y": 0}, "data": {}}], "edges": []},
+    )
+    workflow_id = response.json()["id"]
+    for _ in range(3):
+        await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")
+
+    response = await client.get(
+        "/api/v1/analytics/executions", params={"workflow_id": workflow_id, "window": "1h", "series": "true"}
+    )
+    data = response.json()
+    assert data["resolution"] == "minute"
+    summary = data["workflows"][workflow_id]
+    assert summary["executions"] == 3 and summary["success_rate"] == 1.0
+    assert summary["duration_ms"]["p95"] is not None
+    assert summary["series"][-1]["start"] <= data["until"]
+
+    assert (await client.get("/api/v1/analytics/executions", params={"window": "7d"})).json()["resolution"] == "hour"
+    assert (await client.get("/api/v1/analytics/executions", params={"window": "soon"})).status_code == 400
+
+    await client.delete(f"/api/v1/workflows/{workflow_id}")
+    assert workflow_id not in analytics.workflows
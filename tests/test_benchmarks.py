@@ -0,0 +1,76 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import json
+
+import pytest
+
+from zqautonxg.api.v1 import logs, workflows
+from zqautonxg.benchmarks import suite
+
+TINY_PROFILE = {
+    "requests": 10,
+    "concurrency": 2,
+    "crud_cycles": 2,
+    "graph_sizes": [10],
+    "executions": 1,
+    "log_history": 200,
+    "queries": 1,
+    "ws_clients": [2],
+    "broadcasts": 1,
+}
+
+
+def test_in_process_suite_reports_every_scenario():
+    history_before = list(logs.logs_history)
+    workflows_before = set(workflows.workflows_db)
+
+    report = suite.run("asgi", TINY_PROFILE)
+
+    json.dumps(report)
+    metrics = report["metrics"]
+    for name in (
+        "health.rps",
+        "workflow_crud.ops_per_s",
+        "execute.10.p50_ms",
+        "logs_query.p99_ms",
+        "broadcast.2.p50_ms",
+    ):
+        assert metrics[name]["value"] > 0
+    # Seeded fixtures are cleaned up again
+    assert set(workflows.workflows_db) == workflows_before
+    assert len(logs.logs_history) == len(history_before) + 1
+
+
+@pytest.mark.slow
+def test_uvicorn_suite_broadcasts_to_real_websockets():
+    report = suite.run("uvicorn", TINY_PROFILE, ["health", "broadcast"])
+    assert report["metrics"]["health.rps"]["value"] > 0
+    assert report["metrics"]["broadcast.2.p99_ms"]["value"] > 0
+
+
+def test_compare_flags_regressions_in_the_right_direction():
+    baseline = {
+        "metrics": {
+            "health.rps": suite.metric(1000.0, "req/s", "higher"),
+            "health.p50_ms": suite.metric(1.0, "ms", "lower"),
+        }
+    }
+    better = {
+        "metrics": {
+            "health.rps": suite.metric(1500.0, "req/s", "higher"),
+            "health.p50_ms": suite.metric(0.5, "ms", "lower"),
+        }
+    }
+    worse = {
+        "metrics": {
+            "health.rps": suite.metric(700.0, "req/s", "higher"),
+            "health.p50_ms": suite.metric(1.5, "ms", "lower"),
+        }
+    }
+    assert suite.compare(better, baseline) == []
+    assert {r["metric"] for r in suite.compare(worse, baseline)} == {
+        "health.rps",
+        "health.p50_ms",
+    }
+    assert suite.compare(worse, baseline, tolerance=0.6) == []
@@ -0,0 +1,113 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import os
+import pickle
+
+import pytest
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution
+from zqautonxg.runtime import compute, nodes
+from zqautonxg.runtime.columnar import Table, concat_tables
+from zqautonxg.runtime.executor import run_workflow
+
+RECORDS = [
+    {"id": 1, "name": "alpha", "score": 0.5, "active": True},
+    {"id": 2, "name": "βeta", "score": 1.25, "active": False},
+    {"id": 3, "name": "", "score": -3.0, "active": True},
+]
+
+
+def test_records_round_trip_with_inferred_schema():
+    table = Table.from_records(RECORDS)
+    assert table.schema == {"id": "int64", "name": "string", "score": "float64", "active": "bool"}
+    assert table.to_records() == RECORDS
+    assert table["name"][1] == "βeta"
+    assert table.nbytes < len(repr(RECORDS))
+
+
+def test_slice_and_select_are_views():
+    table = Table.from_records(RECORDS)
+    tail = table.slice(1).select(["id", "name"])
+    assert tail.to_pydict() == {"id": [2, 3], "name": ["βeta", ""]}
+    assert tail["id"].data.obj is table["id"].data.obj
+
+
+def test_pickle_and_shared_file_round_trip(tmp_path):
+    table = Table.from_records(RECORDS).slice(1)
+    assert pickle.loads(pickle.dumps(table)) == table
+
+    handle = table.share(str(tmp_path))
+    mapped = pickle.loads(pickle.dumps(handle)).open()
+    handle.unlink()
+    assert not os.path.exists(handle.path)
+    assert mapped == table
+    with pytest.raises(TypeError):
+        mapped["id"].data[0] = 99
+
+
+def test_concat_joins_buffers_of_slices():
+    table = Table.from_records(RECORDS)
+    joined = concat_tables([table.slice(1, 3), table.slice(0, 1), table.slice(2, 2)])
+    assert joined.to_records() == RECORDS[1:] + RECORDS[:1]
+    assert joined.schema == table.schema
+    with pytest.raises(ValueError):
+        concat_tables([table, table.select(["id"])])
+
+
+def test_mismatched_columns_are_rejected():
+    with pytest.raises(ValueError):
+        Table.from_pydict({"a": [1, 2], "b": [1]})
+
+
+def scale_scores(node, inputs):
+    table = inputs["source"]
+    factor = node.data["factor"]
+    return Table.from_pydict(
+        {"id": table["id"].to_list(), "score": [s * factor for s in table["score"].to_list()]}
+    )
+
+
+@pytest.fixture
+def table_node_types():
+    seen = {}
+
+    async def source(node, inputs):
+        return Table.from_records(RECORDS)
+
+    async def sink(node, inputs):
+        seen.update(inputs)
+        return inputs["scale"].slice(0, 2)
+
+    nodes.register_node_type("test-source", source)
+    nodes.register_node_type("test-scale", scale_scores, executor="process")
+    nodes.register_node_type("test-sink", sink)
+    yield seen
+    for name in ("test-source", "test-scale", "test-sink"):
+        nodes.node_types.pop(name)
+    compute.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_tables_flow_through_process_nodes(table_node_types):
+    workflow = Workflow(
+        name="Columnar",
+        nodes=[
+            {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": data}
+            for node_id, node_type, data in (
+                ("source", "test-source", {}),
+                ("scale", "test-scale", {"factor": 2}),
+                ("sink", "test-sink", {}),
+            )
+        ],
+        edges=[
+            {"id": "e1", "source": "source", "target": "scale"},
+            {"id": "e2", "source": "scale", "target": "sink"},
+        ],
+    )
+    execution = WorkflowExecution(workflow_id=workflow.id)
+    await run_workflow(workflow, execution)
+
+    assert execution.status == "success", execution.error
+    assert isinstance(table_node_types["scale"], Table)
+    assert execution.result["outputs"] == {"sink": {"id": [1, 2], "score": [1.0, 2.5]}}
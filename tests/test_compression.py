@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
+from zqautonxg import web
 from zqautonxg.app import app
+from zqautonxg.web import compression
 
 def test_gzip_compression_enabled():
     """
@@ -13,7 +15,49 @@ def test_gzip_compression_enabled():
     # Verify that the response is compressed
     assert "Content-Encoding" in response.headers
     assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
 
-    # Verify content length is significantly smaller than uncompressed (2278 bytes)
-    # Compressed size should be roughly 300-600 bytes for this content
-    assert int(response.headers["content-length"]) < 1500
+    # Verify content length is significantly smaller than uncompressed
+    identity = client.get("/metrics", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in identity.headers
+    assert int(response.headers["content-length"]) < len(identity.content) / 2
+
+
+def test_negotiation_follows_weights_then_server_preference():
+    offered = ["zstd", "br", "gzip"]
+    assert web.negotiate("gzip, deflate, br, zstd", offered) == "zstd"
+    assert web.negotiate("gzip;q=1.0, br;q=0.5", offered) == "gzip"
+    assert web.negotiate("br;q=0, *", offered) == "zstd"
+    assert web.negotiate("identity", offered) is None
+    assert web.negotiate("", offered) is None
+
+
+def test_levels_drop_for_large_bodies_and_streams_are_skipped():
+    assert compression.compression_level("gzip", 10_000) > compression.compression_level("gzip", 10_000_000)
+    assert compression.compressible("application/json")
+    assert compression.compressible("text/plain; version=0.0.4; charset=utf-8")
+    assert not compression.compressible("text/event-stream")
+    assert not compression.compressible("image/png")
+
+
+def test_small_responses_are_not_compressed():
+    client = TestClient(app)
+    response = client.get("/version", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_ui_is_served_precompressed_with_etag():
+    client = TestClient(app)
+    response = client.get("/ui", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "<html" in response.text.lower()
+
+    etag = response.headers["ETag"]
+    cached = client.get("/ui", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    plain = client.get("/ui", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers and plain.headers["ETag"] != etag
+    assert client.get("/ui/missing.js").status_code == 404
@@ -0,0 +1,99 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution
+from zqautonxg.runtime import compute, nodes
+from zqautonxg.runtime.executor import run_workflow
+
+
+def spin(node, inputs):
+    # Pure-Python busy loop: holds the GIL, so it must not run on the loop
+    deadline = time.perf_counter() + node.data.get("seconds", 0.3)
+    count = 0
+    while time.perf_counter() < deadline:
+        count += 1
+    return {"pid": os.getpid(), "count": count}
+
+
+def digest(node, inputs):
+    return hashlib.sha256(node.data["text"].encode() * 10_000).hexdigest()
+
+
+@pytest.fixture
+def cpu_node_types():
+    nodes.register_node_type("test-spin", spin, executor="process")
+    nodes.register_node_type("test-digest", digest, executor="thread")
+    yield
+    nodes.node_types.pop("test-spin")
+    nodes.node_types.pop("test-digest")
+    compute.shutdown()
+
+
+def _workflow(*node_specs):
+    return Workflow(
+        name="CPU",
+        nodes=[
+            {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": data}
+            for node_id, node_type, data in node_specs
+        ],
+        edges=[],
+    )
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        nodes.register_node_type("test-bad", spin, executor="gpu")
+
+
+@pytest.mark.asyncio
+async def test_process_nodes_do_not_block_the_event_loop(cpu_node_types):
+    await compute.pools["process"].warm()
+    workflow = _workflow(("spin", "test-spin", {"seconds": 0.4}), ("hash", "test-digest", {"text": "zq"}))
+    execution = WorkflowExecution(workflow_id=workflow.id)
+
+    gaps = []
+
+    async def ticker():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticking = asyncio.create_task(ticker())
+    await run_workflow(workflow, execution)
+    ticking.cancel()
+
+    assert execution.status == "success", execution.error
+    outputs = execution.result["outputs"]
+    assert outputs["spin"]["pid"] != os.getpid()
+    assert outputs["hash"] == digest(workflow.nodes[1], {})
+    assert max(gaps) < 0.2
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_queue_depth(cpu_node_types):
+    pool = compute.ComputePool("thread", 1)
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def block():
+        asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+
+    tasks = [asyncio.create_task(pool.submit(block)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert REGISTRY.get_sample_value("zqautonxg_compute_pool_queue_depth", {"pool": "thread"}) == 2
+    assert REGISTRY.get_sample_value("zqautonxg_compute_pool_utilization", {"pool": "thread"}) == 1
+    release.set()
+    await asyncio.gather(*tasks)
+    assert REGISTRY.get_sample_value("zqautonxg_compute_pool_busy_workers", {"pool": "thread"}) == 0
+    pool.shutdown()
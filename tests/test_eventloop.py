@@ -0,0 +1,100 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from zqautonxg.app import app
+from zqautonxg.observability import eventloop
+from zqautonxg.observability.eventloop import LoopMonitor
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+async def settle(monitor, beats=3):
+    await asyncio.sleep(monitor.interval * beats)
+
+
+@pytest.mark.asyncio
+async def test_stall_is_reported_with_the_blocking_stack():
+    delivered = []
+
+    async def on_stall(report):
+        delivered.append(report)
+
+    monitor = LoopMonitor(interval=0.01, threshold=0.05, report_interval=60)
+    await monitor.start(on_stall=on_stall)
+    try:
+        await settle(monitor)
+        block_the_loop(0.3)
+        await settle(monitor)
+    finally:
+        await monitor.stop()
+
+    assert monitor.stalls == 1
+    assert len(delivered) == 1
+    report = delivered[0]
+    assert "block_the_loop" in report["location"]
+    assert "test_stall_is_reported_with_the_blocking_stack" in report["stack"]
+    assert report["blocked_ms"] >= 250
+    assert list(monitor.reports) == delivered
+
+
+@pytest.mark.asyncio
+async def test_reports_are_rate_limited():
+    monitor = LoopMonitor(interval=0.01, threshold=0.03, report_interval=60)
+    await monitor.start()
+    try:
+        for _ in range(3):
+            await settle(monitor)
+            block_the_loop(0.15)
+        await settle(monitor)
+    finally:
+        await monitor.stop()
+
+    assert monitor.stalls == 3
+    assert len(monitor.reports) == 1
+    assert monitor.suppressed == 2
+
+
+@pytest.mark.asyncio
+async def test_lag_is_sampled_without_stalls():
+    before = REGISTRY.get_sample_value("zqautonxg_event_loop_lag_seconds_count")
+    monitor = LoopMonitor(interval=0.01, threshold=1.0)
+    await monitor.start()
+    try:
+        await settle(monitor, beats=5)
+    finally:
+        await monitor.stop()
+    assert REGISTRY.get_sample_value("zqautonxg_event_loop_lag_seconds_count") >= before + 3
+    assert monitor.stalls == 0
+    assert not monitor.running
+
+
+@pytest.mark.asyncio
+async def test_loop_endpoint_requires_admin(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    monitor = LoopMonitor(interval=0.01, threshold=0.05)
+    monkeypatch.setattr(eventloop, "monitor", monitor)
+    response = await client.get("/debug/profile/loop")
+    assert response.status_code == 403
+    response = await client.get("/debug/profile/loop", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["stalls"] == 0
+    assert body["threshold_ms"] == 50
+    assert body["reports"] == []
@@ -0,0 +1,213 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+
+from zqautonxg import events
+from zqautonxg.api.v1 import logs, network
+from zqautonxg.events.redis_bus import RedisConnection
+
+
+class FakeRedis:
+    """Local stand-in for a Redis server: PING, PUBLISH and SUBSCRIBE over RESP2."""
+
+    def __init__(self):
+        self.subscribers = {}
+        self.publish_count = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        connection = RedisConnection(reader, writer)
+        try:
+            while True:
+                command = await connection.read_reply()
+                name = command[0].decode().upper()
+                if name == "PING":
+                    writer.write(b"+PONG\r\n")
+                elif name == "PUBLISH":
+                    self.publish_count += 1
+                    channel, payload = command[1], command[2]
+                    receivers = self.subscribers.get(channel, [])
+                    for subscriber in receivers:
+                        subscriber.write(connection.encode("message", channel, payload))
+                    writer.write(b":%d\r\n" % len(receivers))
+                elif name == "SUBSCRIBE":
+                    for index, channel in enumerate(command[1:], start=1):
+                        self.subscribers.setdefault(channel, []).append(writer)
+                        writer.write(
+                            b"*3\r\n$9\r\nsubscribe\r\n"
+                            + b"$%d\r\n%s\r\n" % (len(channel), channel)
+                            + b":%d\r\n" % index
+                        )
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for writers in self.subscribers.values():
+                if writer in writers:
+                    writers.remove(writer)
+            writer.close()
+
+
+@pytest_asyncio.fixture
+async def redis_url():
+    fake = FakeRedis()
+    url = await fake.start()
+    yield fake, url
+    await fake.stop()
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_in_process_bus_delivers_immediately():
+    bus = events.create_bus("memory")
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    bus.subscribe("logs", handler)
+    await bus.publish("logs", {"message": "hello"})
+    assert received == [{"message": "hello"}]
+
+
+def test_backends_must_implement_publish():
+    class Silent(events.EventBus):
+        pass
+
+    with pytest.raises(TypeError):
+        Silent()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_fans_out_across_workers_in_batches(redis_url):
+    fake, url = redis_url
+    worker_a = events.create_bus("redis", url)
+    worker_b = events.create_bus("redis", url)
+    received = {"a": [], "b": []}
+
+    for name, bus in (("a", worker_a), ("b", worker_b)):
+        async def handler(batch, name=name):
+            received[name].extend(batch)
+
+        bus.subscribe("logs", handler)
+        await bus.start()
+    try:
+        await _wait_for(lambda: worker_a.connected and worker_b.connected)
+
+        for i in range(200):
+            await worker_a.publish("logs", {"seq": i})
+        await _wait_for(lambda: len(received["b"]) == 200)
+        await _wait_for(lambda: len(received["a"]) == 200)
+
+        assert [event["seq"] for event in received["b"]] == list(range(200))
+        # 200 publishes went out as a handful of batched PUBLISH commands
+        assert fake.publish_count < 20
+    finally:
+        await worker_a.stop()
+        await worker_b.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_survives_unencodable_events(redis_url):
+    _, url = redis_url
+    bus = events.create_bus("redis", url)
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    bus.subscribe("logs", handler)
+    await bus.start()
+    try:
+        await _wait_for(lambda: bus.connected)
+        await bus.publish("logs", {"at": datetime(2025, 1, 1, tzinfo=timezone.utc)})
+        await _wait_for(lambda: len(received) == 1)
+        assert received == [{"at": "2025-01-01 00:00:00+00:00"}]
+
+        circular = {}
+        circular["self"] = circular
+        await bus.publish("logs", circular)
+        await asyncio.sleep(0.05)
+        await bus.publish("logs", {"seq": 1})
+        await _wait_for(lambda: len(received) == 2, timeout=3.0)
+        assert received[-1] == {"seq": 1}
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_subscribes_handlers_added_after_start(redis_url):
+    _, url = redis_url
+    bus = events.create_bus("redis", url)
+    await bus.start()
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    try:
+        await _wait_for(lambda: bus.connected)
+        bus.subscribe("topology", handler)
+        await asyncio.sleep(0.05)
+        await bus.publish("topology", {"type": "bridge_deployed"})
+        await _wait_for(lambda: received == [{"type": "bridge_deployed"}])
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_without_start_delivers_locally():
+    bus = events.create_bus("redis", "redis://127.0.0.1:1/0")
+    received = []
+
+    async def handler(batch):
+        received.extend(batch)
+
+    bus.subscribe("topology", handler)
+    await bus.publish("topology", {"type": "bridge_deployed"})
+    assert received == [{"type": "bridge_deployed"}]
+
+
+class _Client:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, message):
+        self.messages.append(message)
+
+
+@pytest.mark.asyncio
+async def test_log_and_topology_streams_consume_the_bus(monkeypatch):
+    client = _Client()
+    monkeypatch.setattr(logs, "active_connections", [client])
+    monkeypatch.setattr(logs, "logs_history", [])
+    monkeypatch.setattr(network, "topology_connections", [client])
+
+    await logs.broadcast_log(logs.LogEntry(level="INFO", message="via bus"))
+    await network.deploy_bridge(name="b1", region="eu-west")
+
+    assert logs.logs_history[-1]["message"] == "via bus"
+    assert '"via bus"' in client.messages[0]
+    assert '"bridge_deployed"' in client.messages[1]
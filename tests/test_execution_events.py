@@ -0,0 +1,160 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.app import app
+from zqautonxg.runtime import nodes, progress
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def gated_node_type():
+    gate = asyncio.Event()
+
+    async def gated(node, inputs):
+        await gate.wait()
+        return {"released": True}
+
+    nodes.register_node_type("test-gated", gated)
+    yield gate
+    nodes.node_types.pop("test-gated")
+
+
+def _parse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _node(node_id, node_type="passthrough"):
+    return {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": {}}
+
+
+async def _create(client, *node_list, edges=()):
+    response = await client.post(
+        "/api/v1/workflows", json={"name": "Events", "nodes": list(node_list), "edges": list(edges)}
+    )
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_finished_execution_replays_and_resumes(client):
+    workflow_id = await _create(
+        client, _node("a"), _node("b"), edges=[{"id": "e", "source": "a", "target": "b"}]
+    )
+    execution = (await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")).json()
+    url = f"/api/v1/workflows/{workflow_id}/executions/{execution['id']}/events"
+
+    response = await client.get(url)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse(response.text)
+    assert [(e[1], e[2].get("node_id")) for e in events] == [
+        ("execution_started", None),
+        ("node_started", "a"),
+        ("node_finished", "a"),
+        ("node_started", "b"),
+        ("node_finished", "b"),
+        ("execution_finished", None),
+    ]
+    assert [e[0] for e in events] == [1, 2, 3, 4, 5, 6]
+    assert events[-1][2]["status"] == "success"
+
+    resumed = _parse((await client.get(url, headers={"Last-Event-ID": "4"})).text)
+    assert [e[0] for e in resumed] == [5, 6]
+
+
+@pytest.mark.asyncio
+async def test_stream_follows_a_running_execution(client, gated_node_type):
+    workflow_id = await _create(client, _node("slow", "test-gated"))
+    running = asyncio.create_task(client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}"))
+    for _ in range(100):
+        history = (await client.get(f"/api/v1/workflows/{workflow_id}/history")).json()
+        if history:
+            break
+        await asyncio.sleep(0.01)
+
+    url = f"/api/v1/workflows/{workflow_id}/executions/{history[0]['id']}/events"
+    streaming = asyncio.create_task(client.get(url))
+    await asyncio.sleep(0.05)
+    assert not streaming.done()
+
+    gated_node_type.set()
+    events = _parse((await streaming).text)
+    await running
+    assert events[-2][1] == "node_finished" and events[-2][2]["status"] == "success"
+    assert events[-1][1] == "execution_finished"
+
+
+@pytest.mark.asyncio
+async def test_unknown_execution_is_404(client):
+    workflow_id = await _create(client)
+    response = await client.get(
+        f"/api/v1/workflows/{workflow_id}/executions/00000000-0000-0000-0000-000000000000/events"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_evicted_finished_execution_reports_its_outcome(client):
+    workflow_id = await _create(client, _node("a"))
+    execution = (await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")).json()
+    progress.execution_events.pop(execution["id"])
+
+    url = f"/api/v1/workflows/{workflow_id}/executions/{execution['id']}/events"
+    response = await asyncio.wait_for(client.get(url, headers={"Last-Event-ID": "3"}), 5)
+    assert _parse(response.text) == [(4, "execution_finished", {
+        "id": 4, "event": "execution_finished", "execution_id": execution["id"],
+        "workflow_id": workflow_id, "status": "success",
+        "duration_ms": execution["duration_ms"], "error": None,
+    })]
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_when_its_buffer_is_evicted(client, gated_node_type, monkeypatch):
+    monkeypatch.setattr(progress, "MAX_EXECUTION_STREAMS", 1)
+    workflow_id = await _create(client, _node("slow", "test-gated"))
+    running = asyncio.create_task(client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}"))
+    for _ in range(100):
+        history = (await client.get(f"/api/v1/workflows/{workflow_id}/history")).json()
+        if history:
+            break
+        await asyncio.sleep(0.01)
+
+    url = f"/api/v1/workflows/{workflow_id}/executions/{history[0]['id']}/events"
+    streaming = asyncio.create_task(client.get(url))
+    await asyncio.sleep(0.05)
+    assert not streaming.done()
+
+    progress.get_events("another-execution", create=True)
+    events = _parse((await asyncio.wait_for(streaming, 5)).text)
+    assert events[0][1] == "execution_started"
+    gated_node_type.set()
+    await running
+
+
+def test_rerun_of_an_execution_is_buffered_after_the_first():
+    events = progress.ExecutionEvents()
+    for run in ("first", "second"):
+        events.append(run, 1, "execution_started", {})
+        events.append(run, 2, "node_started", {})
+        events.append(run, 2, "node_started", {})  # redelivered
+    events.append("second", 3, "execution_finished", {})
+    assert [(event_id, event) for event_id, event, _ in events.since(0)] == [
+        (1, "execution_started"), (2, "node_started"),
+        (3, "execution_started"), (4, "node_started"), (5, "execution_finished"),
+    ]
+    assert events.finished
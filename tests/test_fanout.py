@@ -0,0 +1,211 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution, WorkflowNode
+from zqautonxg.runtime import nodes, progress
+from zqautonxg.runtime.columnar import Table
+from zqautonxg.runtime.executor import run_workflow
+from zqautonxg.runtime.fanout import MapRun
+
+
+@pytest.fixture
+def chunk_node_types():
+    state = {"active": 0, "peak": 0, "calls": [], "failures": {}}
+
+    async def double(node, inputs):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            await asyncio.sleep(0.001)
+            items = inputs["items"]
+            state["calls"].append(items[0])
+            if state["failures"].get(items[0], 0) > 0:
+                state["failures"][items[0]] -= 1
+                raise RuntimeError("flaky chunk")
+            return [item * node.data.get("factor", 2) for item in items]
+        finally:
+            state["active"] -= 1
+
+    async def total(node, inputs):
+        return sum(next(iter(inputs.values())))
+
+    async def scale_table(node, inputs):
+        table = inputs["items"]
+        return Table.from_pydict({"x": [value * 10 for value in table["x"].to_list()]})
+
+    nodes.register_node_type("test-double", double)
+    nodes.register_node_type("test-total", total)
+    nodes.register_node_type("test-scale-table", scale_table)
+    yield state
+    for name in ("test-double", "test-total", "test-scale-table"):
+        nodes.node_types.pop(name)
+
+
+def _node(node_id, node_type, **data):
+    return {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": data}
+
+
+async def _run(*workflow_nodes, edges=()):
+    workflow = Workflow(
+        name="Map",
+        nodes=list(workflow_nodes),
+        edges=[{"id": f"e{i}", "source": s, "target": t} for i, (s, t) in enumerate(edges)],
+    )
+    execution = WorkflowExecution(workflow_id=workflow.id)
+    await run_workflow(workflow, execution)
+    return execution
+
+
+@pytest.mark.asyncio
+async def test_map_chunks_with_bounded_parallelism(chunk_node_types):
+    execution = await _run(
+        _node("source", "passthrough", records=list(range(1000))),
+        _node(
+            "map", "map", path="records", chunk_size=64, concurrency=3,
+            node={"type": "test-double", "data": {"factor": 3}},
+        ),
+        edges=[("source", "map")],
+    )
+    assert execution.status == "success"
+    assert execution.result["outputs"]["map"] == [item * 3 for item in range(1000)]
+    assert len(chunk_node_types["calls"]) == 16
+    assert chunk_node_types["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_retried_alone(chunk_node_types):
+    chunk_node_types["failures"] = {20: 2}
+    execution = await _run(
+        _node("map", "map", items=list(range(40)), chunk_size=10, chunk_retries=2,
+              node={"type": "test-double"}),
+    )
+    assert execution.status == "success"
+    assert sorted(chunk_node_types["calls"]) == [0, 10, 20, 20, 20, 30]
+
+    chunk_node_types["failures"] = {20: 5}
+    execution = await _run(
+        _node("map", "map", items=list(range(40)), chunk_size=10, chunk_retries=1,
+              node={"type": "test-double"}),
+    )
+    assert execution.status == "failed"
+    assert "chunk 2 failed after 2 attempt(s)" in execution.error
+
+
+@pytest.mark.asyncio
+async def test_map_runs_sub_workflow_per_chunk(chunk_node_types):
+    execution = await _run(
+        _node(
+            "map", "map", items=list(range(10)), chunk_size=4, combiner="sum",
+            workflow={
+                "nodes": [_node("double", "test-double"), _node("total", "test-total")],
+                "edges": [{"id": "e", "source": "double", "target": "total"}],
+            },
+        ),
+    )
+    assert execution.status == "success"
+    assert execution.result["outputs"]["map"] == 90
+
+
+@pytest.mark.asyncio
+async def test_sub_workflow_nodes_share_the_map_concurrency(chunk_node_types):
+    execution = await _run(
+        _node(
+            "map", "map", items=list(range(12)), chunk_size=3, concurrency=2, combiner="collect",
+            workflow={"nodes": [_node(f"d{i}", "test-double") for i in range(4)], "edges": []},
+        ),
+    )
+    assert execution.status == "success"
+    assert len(chunk_node_types["calls"]) == 16
+    assert chunk_node_types["peak"] == 2
+
+
+def test_map_is_registered_without_importing_the_executor_first():
+    code = (
+        "import sys; from zqautonxg.runtime.nodes import node_types; "
+        "assert 'map' in node_types; "
+        "import zqautonxg.runtime.executor as executor; assert not hasattr(executor, 'fanout')"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_cancels_sibling_sub_workflows(chunk_node_types):
+    finished = []
+
+    async def work(node, inputs):
+        first = inputs["items"][0]
+        if first == 0:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("bad chunk")
+        await asyncio.sleep(0.05)
+        finished.append(first)
+        return inputs["items"]
+
+    nodes.register_node_type("test-fail-first", work)
+    try:
+        execution = await _run(
+            _node("map", "map", items=list(range(8)), chunk_size=2, concurrency=4,
+                  workflow={"nodes": [_node("work", "test-fail-first")], "edges": []}),
+        )
+        await asyncio.sleep(0.1)
+    finally:
+        nodes.node_types.pop("test-fail-first")
+    assert execution.status == "failed"
+    assert finished == []
+
+
+@pytest.mark.asyncio
+async def test_workers_wait_behind_a_slow_chunk(chunk_node_types):
+    started = []
+    ahead = []
+
+    async def work(node, inputs):
+        started.append(inputs["items"][0])
+        if inputs["items"][0] == 0:
+            await asyncio.sleep(0.05)
+            ahead.extend(started[1:])
+        return inputs["items"]
+
+    nodes.register_node_type("test-slow-first", work)
+    try:
+        node = WorkflowNode(**_node("map", "map", items=list(range(10)), chunk_size=1, concurrency=2,
+                                    node={"type": "test-slow-first"}))
+        output = await MapRun(node, {}).run()
+    finally:
+        nodes.node_types.pop("test-slow-first")
+    assert output == list(range(10))
+    # While chunk 0 ran, the other worker stopped after buffering two outputs
+    assert ahead == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_map_slices_tables_and_concatenates(chunk_node_types):
+    table = Table.from_pydict({"x": list(range(25))})
+    node = WorkflowNode(**_node("map", "map", chunk_size=10, node={"type": "test-scale-table"}))
+    output = await MapRun(node, {"up": table}).run()
+    assert output == Table.from_pydict({"x": [value * 10 for value in range(25)]})
+
+
+@pytest.mark.asyncio
+async def test_chunk_progress_is_streamed(chunk_node_types):
+    execution = await _run(
+        _node("map", "map", items=[1, 2, 3], chunk_size=1, stream_outputs=True, node={"type": "test-double"}),
+    )
+    events = progress.get_events(str(execution.id))
+    chunks = [data for _, event, data in events.events if event == "chunk_finished"]
+    assert sorted(data["chunk"] for data in chunks) == [0, 1, 2]
+    assert {data["chunks"] for data in chunks} == {3}
+    assert sorted(data["output"][0] for data in chunks) == [2, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_invalid_map_config_fails_the_node(chunk_node_types):
+    execution = await _run(_node("map", "map", items=[1], node={"type": "test-double"}, combiner="nope"))
+    assert execution.status == "failed"
+    assert "Unknown combiner" in execution.error
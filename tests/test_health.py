@@ -0,0 +1,131 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import json
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg import events
+from zqautonxg.app import app
+from zqautonxg.observability import health
+from zqautonxg.observability.eventloop import LoopMonitor
+from zqautonxg.observability.health import HealthMonitor
+from zqautonxg.runtime import compute
+from zqautonxg.storage import open_database
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest_asyncio.fixture
+async def monitor(monkeypatch):
+    loop_monitor = LoopMonitor(interval=0.01, threshold=1.0)
+    await loop_monitor.start()
+    monitor = HealthMonitor(interval=0.05, timeout=0.2, loop_monitor=loop_monitor)
+    monkeypatch.setattr(health, "monitor", monitor)
+    yield monitor
+    await monitor.stop()
+    await loop_monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_ready_reflects_cached_probe_results(client, monitor):
+    calls = []
+    healthy = True
+
+    async def flaky():
+        calls.append(1)
+        return healthy, {"calls": len(calls)}
+
+    monitor.add("flaky", flaky)
+    monitor.add("event_bus", health.event_bus_probe(events.bus))
+    monitor.add("compute", health.compute_probe(compute.pools))
+    monitor.add("storage", health.storage_probe(open_database("sqlite://:memory:")))
+
+    response = await client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["status"] == "starting"
+
+    await monitor.run_once()
+    for _ in range(20):
+        response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert len(calls) == 1  # polling never runs probes
+    body = response.json()
+    assert body["status"] == "ready"
+    assert set(body["checks"]) == {"flaky", "event_bus", "compute", "storage", "event_loop"}
+
+    healthy = False
+    await monitor.run_once()
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["failed"] == ["flaky"]
+
+
+@pytest.mark.asyncio
+async def test_slow_probes_time_out_and_background_loop_refreshes(client, monitor):
+    async def hangs():
+        await asyncio.sleep(10)
+        return True, {}
+
+    async def optional():
+        raise RuntimeError("down")
+
+    monitor.add("hangs", hangs)
+    monitor.add("optional", optional, critical=False)
+    await monitor.start()
+    await asyncio.sleep(0.5)
+
+    body = json.loads(monitor.readiness()[1])
+    assert body["checks"]["hangs"]["error"].startswith("timed out")
+    assert body["checks"]["optional"] == {**body["checks"]["optional"], "status": "fail", "error": "down"}
+    assert body["failed"] == ["hangs"]
+    assert (await client.get("/health/live")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_draining_and_stale_results_are_not_ready(client, monitor):
+    await monitor.run_once()
+    assert monitor.readiness()[0] == 200
+
+    monitor.checked_at -= 10
+    assert monitor.readiness()[0] == 503
+
+    await monitor.run_once()
+    monitor.drain()
+    response = await client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["status"] == "draining"
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_comes_from_the_loop_monitor(monitor):
+    await asyncio.sleep(0.03)
+    await monitor.run_once()
+    assert monitor.results["event_loop"]["status"] == "ok"
+
+    monitor.max_loop_lag = 0.05
+    time.sleep(0.1)  # block the loop past the threshold
+    await asyncio.sleep(0.03)
+    await monitor.run_once()
+    check = monitor.results["event_loop"]
+    assert check["status"] == "fail" and check["lag_ms"] >= 50
+    assert monitor.readiness()[0] == 503
+
+    idle = HealthMonitor(loop_monitor=LoopMonitor())
+    await idle.run_once()
+    assert "event_loop" not in idle.results  # no lag to report while the loop monitor is off
+
+
+def test_compute_probe_reports_saturation():
+    class Pool:
+        workers, busy, waiting = 2, 2, 9
+
+    healthy, details = asyncio.run(health.compute_probe({"thread": Pool()}, max_backlog=4)())
+    assert not healthy and details["pools"]["thread"]["waiting"] == 9
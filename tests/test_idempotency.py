@@ -0,0 +1,156 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.admission import DatabaseIdempotencyStore, MemoryIdempotencyStore
+from zqautonxg.admission import idempotency
+from zqautonxg.admission.idempotency import MISMATCH, NEW, PENDING, REPLAY, StoredResponse
+from zqautonxg.app import app
+from zqautonxg.runtime import nodes
+from zqautonxg.storage import Database
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def slow_node_type():
+    calls = {"count": 0}
+
+    async def slow(node, inputs):
+        calls["count"] += 1
+        await asyncio.sleep(0.1)
+        return {}
+
+    nodes.register_node_type("test-idem-slow", slow)
+    yield calls
+    nodes.node_types.pop("test-idem-slow")
+
+
+WORKFLOW = {"name": "Idempotent", "nodes": [], "edges": []}
+
+
+@pytest.mark.asyncio
+async def test_retried_create_returns_original_response(client):
+    headers = {"Idempotency-Key": "create-1"}
+    first = await client.post("/api/v1/workflows", json=WORKFLOW, headers=headers)
+    retry = await client.post("/api/v1/workflows", json=WORKFLOW, headers=headers)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json()["id"] == first.json()["id"]
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    reused = await client.post(
+        "/api/v1/workflows", json={**WORKFLOW, "name": "Other"}, headers=headers
+    )
+    assert reused.status_code == 422
+
+    # Keys are scoped per client
+    other_client = await client.post(
+        "/api/v1/workflows", json=WORKFLOW, headers={**headers, "X-API-Key": "tenant-b"}
+    )
+    assert other_client.json()["id"] != first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_executions_are_coalesced(client, slow_node_type):
+    created = await client.post("/api/v1/workflows", json={
+        "name": "Slow",
+        "nodes": [{"id": "n", "type": "test-idem-slow", "position": {"x": 0, "y": 0}, "data": {}}],
+        "edges": [],
+    })
+    workflow_id = created.json()["id"]
+
+    url = f"/api/v1/workflows/execute?workflow_id={workflow_id}"
+    responses = await asyncio.gather(*(
+        client.post(url, headers={"Idempotency-Key": "exec-1"}) for _ in range(3)
+    ))
+    assert {r.json()["id"] for r in responses} == {responses[0].json()["id"]}
+    assert slow_node_type["count"] == 1
+    history = (await client.get(f"/api/v1/workflows/{workflow_id}/history")).json()
+    assert len(history) == 1
+
+
+@pytest.mark.asyncio
+async def test_database_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "idem.db")
+    worker_a = DatabaseIdempotencyStore(Database(path))
+    worker_b = DatabaseIdempotencyStore(Database(path))
+
+    assert await worker_a.begin("k", "fp", "a") == (NEW, None)
+    assert await worker_b.begin("k", "fp", "b") == (PENDING, None)
+    assert await worker_b.begin("k", "other", "b") == (MISMATCH, None)
+
+    waiter = asyncio.create_task(worker_b.wait("k", 2.0))
+    await worker_a.complete("k", "a", StoredResponse(201, [(b"content-type", b"application/json")], b"{}"))
+    shared = await waiter
+    assert shared.status == 201 and shared.body == b"{}"
+
+    state, replay = await worker_b.begin("k", "fp", "b")
+    assert state == REPLAY and replay.headers == [(b"content-type", b"application/json")]
+
+    assert await worker_a.begin("failed", "fp", "a") == (NEW, None)
+    await worker_a.release("failed", "a")
+    assert await worker_b.begin("failed", "fp", "b") == (NEW, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "database"])
+async def test_only_the_owner_completes_a_key(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(idempotency, "LOCK_SECONDS", 0.05)
+    if backend == "memory":
+        store = MemoryIdempotencyStore()
+    else:
+        store = DatabaseIdempotencyStore(Database(str(tmp_path / "idem.db")))
+
+    assert await store.begin("k", "fp", "first") == (NEW, None)
+    await asyncio.sleep(0.1)
+    # The first request's lock expired and a retry took the key over
+    assert await store.begin("k", "fp", "second") == (NEW, None)
+    assert not await store.refresh("k", "first")
+    await store.complete("k", "first", StoredResponse(201, [], b"stale"))
+    await store.release("k", "first")
+    assert await store.begin("k", "fp", "third") == (PENDING, None)
+
+    assert await store.refresh("k", "second")
+    await store.complete("k", "second", StoredResponse(201, [], b"fresh"))
+    state, replay = await store.begin("k", "fp", "third")
+    assert state == REPLAY and replay.body == b"fresh"
+
+
+@pytest.mark.asyncio
+async def test_lock_is_held_while_the_request_runs(client, slow_node_type, monkeypatch):
+    monkeypatch.setattr(idempotency, "LOCK_SECONDS", 0.03)
+    created = await client.post("/api/v1/workflows", json={
+        "name": "Slow",
+        "nodes": [{"id": "n", "type": "test-idem-slow", "position": {"x": 0, "y": 0}, "data": {}}],
+        "edges": [],
+    })
+    url = f"/api/v1/workflows/execute?workflow_id={created.json()['id']}"
+
+    async def retry():
+        await asyncio.sleep(0.06)  # past LOCK_SECONDS, while the first request still runs
+        return await client.post(url, headers={"Idempotency-Key": "exec-long"})
+
+    first, second = await asyncio.gather(client.post(url, headers={"Idempotency-Key": "exec-long"}), retry())
+    assert second.json()["id"] == first.json()["id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert slow_node_type["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_store_is_bounded():
+    store = MemoryIdempotencyStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        assert await store.begin(key, "fp", key) == (NEW, None)
+        await store.complete(key, key, StoredResponse(200, [], b""))
+    assert list(store.entries) == ["b", "c"]
@@ -0,0 +1,116 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import json
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg import events
+from zqautonxg.api.v1 import logs
+from zqautonxg.app import app
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    await logs.ingest_buffer.stop()
+
+
+@pytest.fixture
+def deliveries():
+    batches = []
+
+    async def record(entries):
+        batches.append(entries)
+
+    events.bus.subscribe(logs.LOG_CHANNEL, record)
+    yield batches
+    events.bus.handlers[logs.LOG_CHANNEL].remove(record)
+
+
+@pytest.mark.asyncio
+async def test_ingest_json_array_is_flushed_as_one_batch(client, deliveries):
+    entries = [{"message": f"entry {i}", "level": "warning", "metadata": {"i": i}} for i in range(50)]
+    response = await client.post("/api/v1/logs/ingest", json=entries)
+    assert response.status_code == 202
+    assert response.json() == {"accepted": 50, "rejected": 0, "errors": []}
+
+    await logs.ingest_buffer.stop()
+    assert len(deliveries) == 1
+    assert [e["message"] for e in deliveries[0]] == [f"entry {i}" for i in range(50)]
+    assert deliveries[0][0]["level"] == "WARN"
+    assert logs.logs_history[-1]["message"] == "entry 49"
+
+
+@pytest.mark.asyncio
+async def test_ingest_ndjson_reports_rejected_lines(client, deliveries):
+    body = "\n".join([
+        json.dumps({"message": "ok", "timestamp": "2025-01-01T00:00:00"}),
+        "{not json",
+        json.dumps({"message": "bad level", "level": "LOUD"}),
+        "",
+        json.dumps({"level": "INFO"}),
+        json.dumps({"message": "also ok", "level": "error"}),
+    ])
+    response = await client.post(
+        "/api/v1/logs/ingest", content=body, headers={"content-type": "application/x-ndjson"}
+    )
+    assert response.status_code == 202
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (2, 3)
+    assert [e["index"] for e in result["errors"]] == [1, 2, 4]
+
+    await logs.ingest_buffer.stop()
+    assert [(e["message"], e["level"]) for e in deliveries[0]] == [("ok", "INFO"), ("also ok", "ERROR")]
+    assert deliveries[0][0]["timestamp"] == "2025-01-01T00:00:00"
+
+
+@pytest.mark.asyncio
+async def test_ingest_validates_and_clamps_timestamps(client, deliveries):
+    response = await client.post("/api/v1/logs/ingest", json=[
+        {"message": "bad", "timestamp": "yesterday"},
+        {"message": "future", "timestamp": "2999-01-01T00:00:00+00:00"},
+        {"message": "past", "timestamp": "2025-01-01T00:00:00Z"},
+    ])
+    result = response.json()
+    assert (result["accepted"], result["rejected"]) == (2, 1)
+    assert result["errors"] == [{"index": 0, "error": "timestamp must be an ISO 8601 string"}]
+
+    await logs.ingest_buffer.stop()
+    future, past = deliveries[0]
+    assert not future["timestamp"].startswith("2999")
+    assert past["timestamp"] == "2025-01-01T00:00:00Z"
+
+
+@pytest.mark.asyncio
+async def test_ingest_rejects_malformed_body(client):
+    response = await client.post(
+        "/api/v1/logs/ingest", content="{oops", headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 400
+
+    response = await client.post(
+        "/api/v1/logs/ingest", content="[]", headers={"content-type": "application/json", "content-length": "2x"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid Content-Length header"
+
+
+@pytest.mark.asyncio
+async def test_ingest_applies_backpressure_when_buffer_is_full(client, monkeypatch):
+    monkeypatch.setattr(logs.ingest_buffer, "capacity", 3)
+    first = await client.post("/api/v1/logs/ingest", json=[{"message": "a"}, {"message": "b"}])
+    assert first.status_code == 202
+
+    second = await client.post("/api/v1/logs/ingest", json=[{"message": "c"}, {"message": "d"}])
+    assert second.status_code == 503
+    assert second.headers["retry-after"] == "1"
+    assert second.json()["accepted"] == 0
+
+    await logs.ingest_buffer.stop()
+    third = await client.post("/api/v1/logs/ingest", json=[{"message": "c"}, {"message": "d"}])
+    assert third.status_code == 202
@@ -0,0 +1,193 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.api.v1 import logs
+from zqautonxg.app import app
+from zqautonxg.storage import StorageError, logstore
+from zqautonxg.storage.logstore import INDEX_RECORD, LogStore, entry_time
+
+START = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1)
+
+
+def _entries(first, count, level="INFO"):
+    return [
+        {
+            "timestamp": (START + timedelta(seconds=i)).isoformat(),
+            "level": level,
+            "message": f"entry {i}",
+            "metadata": {},
+        }
+        for i in range(first, first + count)
+    ]
+
+
+def _fill(store, count, batch=10):
+    for first in range(0, count, batch):
+        for path in store.append(_entries(first, batch)):
+            store.seal(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LogStore(str(tmp_path), segment_bytes=4096, block_bytes=1024, retention_seconds=1e12)
+    yield store
+    store.close()
+
+
+def test_segments_rotate_seal_and_read_back_newest_first(store, tmp_path):
+    _fill(store, 505, batch=5)
+    names = os.listdir(tmp_path)
+    assert sum(n.endswith(".seg") for n in names) > 3
+    assert sum(n.endswith(".idx") for n in names) == sum(n.endswith(".seg") for n in names)
+    assert sum(n.endswith(".log") for n in names) == 1
+
+    everything = store.read(1000)
+    assert [e["message"] for e in everything] == [f"entry {i}" for i in range(505)]
+    assert [e["message"] for e in store.read(3)] == ["entry 502", "entry 503", "entry 504"]
+
+
+def test_index_ranges_and_time_filters(store, tmp_path):
+    _fill(store, 500)
+    seg = sorted(n for n in os.listdir(tmp_path) if n.endswith(".idx"))[0]
+    with open(tmp_path / seg, "rb") as f:
+        records = [INDEX_RECORD.unpack_from(f.read(), 0)]
+    oldest, newest, offset, length = records[0]
+    assert offset == 0 and length > 0
+    assert oldest == entry_time(_entries(0, 1)[0]) and newest > oldest
+
+    since = entry_time(_entries(100, 1)[0])
+    before = entry_time(_entries(110, 1)[0])
+    page = store.read(100, since=since, before=before)
+    assert [e["message"] for e in page] == [f"entry {i}" for i in range(100, 110)]
+
+
+def test_filters_by_level_and_search(store):
+    store.append(_entries(0, 5) + _entries(5, 5, level="ERROR"))
+    assert [e["message"] for e in store.read(10, level="ERROR", search="ENTRY 7")] == ["entry 7"]
+
+
+def test_retention_by_size_and_age(tmp_path):
+    store = LogStore(str(tmp_path), segment_bytes=4096, block_bytes=1024, retention_seconds=1e12)
+    _fill(store, 500)
+    sealed = sorted(n for n in os.listdir(tmp_path) if n.endswith(".seg"))
+    store.read(1000)
+    indexes = list(store._indexes.values())
+    assert indexes
+
+    store.retention_bytes = 1
+    assert store.enforce_retention() == len(sealed)
+    assert not any(n.endswith((".seg", ".idx")) for n in os.listdir(tmp_path))
+    assert all(index.closed for index in indexes)
+
+    store.retention_bytes = 1 << 30
+    _fill(store, 500)
+    store.retention_seconds = 60
+    remaining = store.read(1000)
+    assert store.enforce_retention(now=entry_time(_entries(300, 1)[0])) > 0
+    assert 0 < len(store.read(1000)) < len(remaining)
+    assert store.read(1000)[-1] == remaining[-1]
+    store.close()
+
+
+def test_only_one_writer_and_leftover_segments_are_sealed(tmp_path):
+    first = LogStore(str(tmp_path), segment_bytes=1 << 20)
+    first.append(_entries(0, 10))
+    second = LogStore(str(tmp_path), segment_bytes=1 << 20)
+    assert second.append(_entries(10, 10)) == []
+    assert first.is_writer and not second.is_writer
+    first.close()
+
+    second._lock_retry_at = 0.0
+    ready = second.append(_entries(10, 10))
+    assert second.is_writer and len(ready) == 1
+    for path in ready:
+        second.seal(path)
+    assert [e["message"] for e in second.read(100)] == [f"entry {i}" for i in range(20)]
+    second.close()
+
+
+def test_active_segment_is_indexed_as_it_fills(store, tmp_path, monkeypatch):
+    store.segment_bytes = 1 << 20
+    store.append(_entries(0, 300))
+    [active] = [n for n in os.listdir(tmp_path) if n.endswith(".log")]
+    size = os.path.getsize(tmp_path / active)
+    records = os.path.getsize(tmp_path / active.replace(".log", ".lidx")) // INDEX_RECORD.size
+    assert records >= size // 1024 // 2
+
+    parsed = []
+    parse = logstore._parse_lines
+    monkeypatch.setattr(logstore, "_parse_lines", lambda data: parsed.append(len(data)) or parse(data))
+    since = entry_time(_entries(290, 1)[0])
+    assert [e["message"] for e in store.read(100, since=since)] == [f"entry {i}" for i in range(290, 300)]
+    assert sum(parsed) < size / 4
+
+    parsed.clear()
+    assert [e["message"] for e in store.read(3)] == ["entry 297", "entry 298", "entry 299"]
+    assert sum(parsed) < size / 4
+    assert [e["message"] for e in store.read(1000)] == [f"entry {i}" for i in range(300)]
+
+
+def test_retention_runs_while_appending(store, tmp_path, monkeypatch):
+    _fill(store, 500)
+    assert any(n.endswith(".seg") for n in os.listdir(tmp_path))
+    store.retention_seconds = 1
+    store._retention_at = 0.0
+    store.append([{**_entries(0, 1)[0], "timestamp": datetime.utcnow().isoformat()}])
+    assert not any(n.endswith(".seg") for n in os.listdir(tmp_path))
+
+
+def test_log_store_with_several_workers_needs_redis(tmp_path, monkeypatch):
+    monkeypatch.setattr(logstore, "_log_store", None)
+    monkeypatch.setenv("LOG_STORE_DIR", str(tmp_path))
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.setenv("EVENT_BUS", "memory")
+    with pytest.raises(StorageError):
+        logstore.open_log_store()
+
+    monkeypatch.setenv("EVENT_BUS", "redis")
+    store = logstore.open_log_store()
+    assert store is logstore.get_log_store()
+    store.close()
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path, monkeypatch):
+    store = LogStore(str(tmp_path), segment_bytes=4096, block_bytes=1024, retention_seconds=1e12)
+    monkeypatch.setattr(logstore, "_log_store", store)
+    monkeypatch.setattr(logs, "logs_history", [])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    await logs.close_log_store()
+
+
+@pytest.mark.asyncio
+async def test_history_pages_into_older_segments(client, monkeypatch):
+    monkeypatch.setattr(logs, "MAX_LOGS_HISTORY", 50)
+    for first in range(0, 500, 50):
+        await logs.deliver_logs(_entries(first, 50))
+    await logs.close_log_store()
+    assert len(logs.logs_history) == 50
+
+    recent = (await client.get("/api/v1/logs/history?limit=20")).json()
+    assert recent[-1]["message"] == "entry 499"
+
+    page = (await client.get("/api/v1/logs/history", params={"limit": 200})).json()
+    assert [e["message"] for e in page] == [f"entry {i}" for i in range(300, 500)]
+    older = (await client.get(
+        "/api/v1/logs/history", params={"limit": 200, "before": page[0]["timestamp"]}
+    )).json()
+    assert [e["message"] for e in older] == [f"entry {i}" for i in range(100, 300)]
+
+    found = (await client.post("/api/v1/logs/query", params={"search": "entry 12", "limit": 5})).json()
+    assert [e["message"] for e in found] == ["entry 125", "entry 126", "entry 127", "entry 128", "entry 129"]
+
+    bad = await client.post("/api/v1/logs/query", params={"since": "yesterday"})
+    assert bad.status_code == 400
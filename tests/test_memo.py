@@ -0,0 +1,112 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import threading
+import time
+
+import pytest
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution
+from zqautonxg.runtime import memo, nodes
+from zqautonxg.runtime.columnar import Table
+from zqautonxg.runtime.executor import run_workflow
+
+
+@pytest.fixture
+def counting_node_type(monkeypatch):
+    monkeypatch.setattr(memo, "node_cache", memo.NodeCache())
+    monkeypatch.setattr("zqautonxg.runtime.executor.node_cache", memo.node_cache)
+    calls = []
+
+    async def enrich(node, inputs):
+        calls.append(node.id)
+        return {"enriched": node.data["source"]}
+
+    nodes.register_node_type("test-enrich", enrich)
+    yield calls
+    nodes.node_types.pop("test-enrich")
+
+
+def _workflow(node_id, **data):
+    return Workflow(
+        name="Memo",
+        nodes=[{"id": node_id, "type": "test-enrich", "position": {"x": 0, "y": 0}, "data": data}],
+        edges=[],
+    )
+
+
+async def _run(workflow):
+    execution = WorkflowExecution(workflow_id=workflow.id)
+    trace = await run_workflow(workflow, execution)
+    return execution, trace
+
+
+@pytest.mark.asyncio
+async def test_repeated_node_is_served_from_cache(counting_node_type):
+    first, _ = await _run(_workflow("a", source="crm", cache=True))
+    # Same type, config and inputs in another workflow; node id does not matter
+    second, trace = await _run(_workflow("b", source="crm", cache=True, retries=2))
+
+    assert counting_node_type == ["a"]
+    assert first.result["cached_nodes"] == []
+    assert second.result["cached_nodes"] == ["b"]
+    assert second.result["outputs"] == {"b": {"enriched": "crm"}}
+    assert trace.spans[1].attributes["zq.node.cache"] == "hit"
+
+    await _run(_workflow("c", source="erp", cache=True))
+    await _run(_workflow("d", source="crm"))
+    assert counting_node_type == ["a", "c", "d"]
+
+
+def test_keys_are_stable_and_content_addressed():
+    table = Table.from_pydict({"id": [1, 2]})
+    key = memo.cache_key("t", {"b": 1, "a": [1, 2]}, {"up": table})
+    assert key == memo.cache_key("t", {"a": [1, 2], "b": 1, "cache": True}, {"up": Table.from_pydict({"id": [1, 2]})})
+    assert key != memo.cache_key("t", {"b": 1, "a": [1, 2]}, {"up": Table.from_pydict({"id": [1, 3]})})
+    assert memo.cache_key("t", {}, {"up": object()}) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_evicts_lru():
+    cache = memo.NodeCache(max_entries=2)
+    await cache.put("a", 1, ttl=60)
+    await cache.put("b", 2, ttl=60)
+    assert await cache.get("a") == 1
+    await cache.put("c", 3, ttl=60)
+    assert await cache.get("b") is memo.MISS
+    assert await cache.get("a") == 1
+
+    await cache.put("short", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert await cache.get("short") is memo.MISS
+
+
+@pytest.mark.asyncio
+async def test_disk_persistence_survives_restart(tmp_path):
+    await memo.NodeCache(directory=str(tmp_path)).put("k", {"v": 1}, ttl=60)
+    assert await memo.NodeCache(directory=str(tmp_path)).get("k") == {"v": 1}
+
+    await memo.NodeCache(directory=str(tmp_path)).put("old", 1, ttl=0.01)
+    time.sleep(0.02)
+    restarted = memo.NodeCache(directory=str(tmp_path))
+    assert await restarted.prune() == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["k.pkl"]
+
+
+@pytest.mark.asyncio
+async def test_disk_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    cache = memo.NodeCache(directory=str(tmp_path))
+    threads = []
+    for name in ("_load", "_save"):
+        original = getattr(cache, name)
+
+        def record(*args, _original=original):
+            threads.append(threading.current_thread())
+            return _original(*args)
+
+        monkeypatch.setattr(cache, name, record)
+    await cache.put("k", 1, ttl=60)
+    cache.entries.clear()
+    assert await cache.get("k") == 1
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,119 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.api.v1.nodes import NodeRegistry, nodes_db
+from zqautonxg.app import app
+from zqautonxg.models.node import NodeConfig
+
+
+@pytest_asyncio.fixture
+async def client():
+    nodes_db.clear()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    nodes_db.clear()
+
+
+def _fleet(count, node_type="connector"):
+    ids = [str(uuid4()) for _ in range(count)]
+    for node_id in ids:
+        nodes_db.configure(UUID(node_id), {"type": node_type})
+    return ids
+
+
+def test_registry_keeps_indexes_consistent():
+    registry = NodeRegistry()
+    a = NodeConfig(type="search")
+    b = NodeConfig(type="search", enabled=False)
+    c = NodeConfig(type="scheduler")
+    for node in (a, b, c):
+        registry.put(node)
+    assert registry.count("search") == 2 and registry.count(enabled=False) == 1
+
+    registry.set_enabled(b.id)
+    registry.set_enabled(c.id, False)
+    assert [n.id for n in registry.select("search", True)] == [a.id, b.id]
+    assert registry.summary() == {
+        "total": 3,
+        "enabled": 2,
+        "disabled": 1,
+        "by_type": {"search": {"enabled": 2, "disabled": 0}, "scheduler": {"enabled": 0, "disabled": 1}},
+    }
+
+    registry.remove(c.id)
+    assert "scheduler" not in registry.summary()["by_type"]
+    with pytest.raises(KeyError):
+        registry.toggle_many([a.id, uuid4()])
+    assert registry[a.id].enabled
+
+
+@pytest.mark.asyncio
+async def test_status_is_filtered_and_paginated(client):
+    connectors = _fleet(30)
+    _fleet(10, "search")
+    await client.post("/api/v1/nodes/bulk/toggle", json={"node_ids": connectors[:5], "enabled": False})
+
+    response = await client.get("/api/v1/nodes/status", params={"type": "connector", "enabled": "true", "limit": 10})
+    assert response.headers["x-total-count"] == "25"
+    page = response.json()
+    assert list(page) == connectors[5:15] and set(page.values()) == {"enabled"}
+
+    response = await client.get("/api/v1/nodes/status", params={"enabled": "false"})
+    assert list(response.json()) == connectors[:5]
+
+    summary = (await client.get("/api/v1/nodes/summary")).json()
+    assert summary["total"] == 40 and summary["disabled"] == 5
+    assert summary["by_type"]["search"] == {"enabled": 10, "disabled": 0}
+
+
+@pytest.mark.asyncio
+async def test_bulk_toggle_is_all_or_nothing(client):
+    ids = _fleet(3)
+    response = await client.post("/api/v1/nodes/bulk/toggle", json={"node_ids": ids + [str(uuid4())]})
+    assert response.status_code == 404
+    assert len(response.json()["detail"]["missing"]) == 1
+    assert (await client.get("/api/v1/nodes/summary")).json()["disabled"] == 0
+
+    response = await client.post("/api/v1/nodes/bulk/toggle", json={"node_ids": ids + ids[:1]})
+    assert response.json() == {"updated": 3, "enabled": 0, "disabled": 3}
+
+
+@pytest.mark.asyncio
+async def test_bulk_config_replaces_merges_and_creates(client):
+    ids = _fleet(2)
+    new_id = str(uuid4())
+    response = await client.put(
+        "/api/v1/nodes/bulk/config",
+        json={"node_ids": ids, "config": {"timeout_ms": 5000}, "merge": True,
+              "updates": {new_id: {"type": "search", "provider": "bing"}}},
+    )
+    assert response.json() == {"updated": 2, "created": 1}
+    config = (await client.get(f"/api/v1/nodes/{ids[0]}/config")).json()["config"]
+    assert config == {"type": "connector", "timeout_ms": 5000}
+    assert (await client.get(f"/api/v1/nodes/{new_id}/config")).json()["type"] == "search"
+
+    await client.put("/api/v1/nodes/bulk/config", json={"node_ids": ids[:1], "config": {"x": 1}})
+    assert (await client.get(f"/api/v1/nodes/{ids[0]}/config")).json()["config"] == {"x": 1}
+
+    response = await client.put("/api/v1/nodes/bulk/config", json={"node_ids": ids})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_invalid_bulk_config_changes_nothing(client):
+    before = (await client.get("/api/v1/nodes/summary")).json()["total"]
+    valid, invalid = str(uuid4()), str(uuid4())
+    response = await client.put(
+        "/api/v1/nodes/bulk/config",
+        json={"updates": {valid: {"type": "x"}, invalid: {"type": 123}}},
+    )
+    assert response.status_code == 422
+    assert (await client.get("/api/v1/nodes/summary")).json()["total"] == before
+    assert (await client.get(f"/api/v1/nodes/{valid}/config")).status_code == 404
@@ -0,0 +1,99 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import marshal
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.app import app
+from zqautonxg.observability import profiling
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+@pytest.fixture(autouse=True)
+def admin_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.mark.asyncio
+async def test_profiling_requires_admin_token(client, monkeypatch):
+    response = await client.get("/debug/profile/requests")
+    assert response.status_code == 403
+    response = await client.get("/debug/profile/requests", headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 403
+
+    monkeypatch.delenv("ADMIN_TOKEN")
+    response = await client.get("/debug/profile/requests", headers=ADMIN)
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_collapsed_and_pstats(client):
+    response = await client.get(
+        "/debug/profile/cpu", params={"seconds": 0.2, "interval": 0.01}, headers=ADMIN
+    )
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    stack, count = response.text.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+    response = await client.get(
+        "/debug/profile/cpu", params={"seconds": 0.1, "format": "pstats"}, headers=ADMIN
+    )
+    assert response.status_code == 200
+    assert isinstance(marshal.loads(response.content), dict)
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_rejects_bad_window(client):
+    response = await client.get("/debug/profile/cpu", params={"seconds": 600}, headers=ADMIN)
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_memory_snapshot_diff(client):
+    try:
+        first = await client.post("/debug/profile/memory/snapshots", headers=ADMIN)
+        assert first.status_code == 200
+        retained = [bytearray(1024) for _ in range(100)]
+        second = await client.post("/debug/profile/memory/snapshots", headers=ADMIN)
+        assert second.status_code == 200
+
+        response = await client.get(
+            "/debug/profile/memory/diff",
+            params={"base": first.json()["snapshot_id"], "target": second.json()["snapshot_id"]},
+            headers=ADMIN,
+        )
+        assert response.status_code == 200
+        diff = response.json()
+        assert diff["size_diff_bytes"] > 100 * 1024
+        assert any("test_profiling.py" in stat["location"] for stat in diff["top"])
+        del retained
+    finally:
+        await client.delete("/debug/profile/memory", headers=ADMIN)
+    assert not profiling.memory_snapshots
+
+
+@pytest.mark.asyncio
+async def test_single_request_profiling_via_header(client):
+    response = await client.get("/health", headers={"X-Profile": "1", **ADMIN})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    report = await client.get(f"/debug/profile/requests/{profile_id}", headers=ADMIN)
+    assert report.status_code == 200
+    assert "function calls" in report.text
+
+    # Without the admin token the header is ignored
+    response = await client.get("/health", headers={"X-Profile": "1"})
+    assert "X-Profile-Id" not in response.headers
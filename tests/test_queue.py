@@ -0,0 +1,160 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.api.v1 import workflows
+from zqautonxg.app import app
+from zqautonxg.runtime.queue import ExecutionQueue, QueueWorker
+from zqautonxg.storage import Database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "queue.db")
+
+
+def _queues(db_path, count=2, **kwargs):
+    # One connection per queue, like separate app instances sharing the file
+    return [ExecutionQueue(Database(db_path), **kwargs) for _ in range(count)]
+
+
+def test_concurrent_workers_never_claim_the_same_job(db_path):
+    first, second = _queues(db_path)
+    for i in range(10):
+        first.enqueue(f"job-{i}", "wf", {"n": i})
+
+    claimed_a = first.claim("a", limit=5)
+    claimed_b = second.claim("b", limit=10)
+    ids_a = {job.id for job in claimed_a}
+    ids_b = {job.id for job in claimed_b}
+    assert len(ids_a) == 5 and len(ids_b) == 5
+    assert not ids_a & ids_b
+    assert first.claim("a") == []
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_rejected(db_path):
+    first, second = _queues(db_path, lease_seconds=0.05)
+    first.enqueue("job", "wf", {})
+
+    [stale] = first.claim("a")
+    assert second.claim("b") == []
+    time.sleep(0.1)
+    [fresh] = second.claim("b")
+    assert fresh.id == "job" and fresh.attempts == 2
+
+    assert first.heartbeat([stale]) == [stale]
+    assert not first.complete(stale, "success", {"by": "a"})
+    assert second.complete(fresh, "success", {"by": "b"})
+    assert first.get("job")["result"] == {"by": "b"}
+
+
+def test_heartbeat_keeps_the_lease(db_path):
+    first, second = _queues(db_path, lease_seconds=0.1)
+    first.enqueue("job", "wf", {})
+    [job] = first.claim("a")
+    for _ in range(3):
+        time.sleep(0.05)
+        assert first.heartbeat([job]) == []
+        assert second.claim("b") == []
+
+
+def test_job_fails_after_max_attempts(db_path):
+    [queue] = _queues(db_path, count=1, lease_seconds=0.01, max_attempts=2)
+    queue.enqueue("job", "wf", {})
+    for _ in range(2):
+        assert len(queue.claim("a")) == 1
+        time.sleep(0.02)
+    assert queue.claim("a") == []
+    job = queue.get("job")
+    assert job["status"] == "failed"
+    assert "2 attempt" in job["error"]
+
+
+def test_claims_rotate_between_workflows(db_path):
+    [queue] = _queues(db_path, count=1)
+    for i in range(5):
+        queue.enqueue(f"busy-{i}", "busy", {})
+    queue.enqueue("quiet-0", "quiet", {})
+
+    order = [job.workflow_id for job in queue.claim("a", limit=3)]
+    assert order == ["busy", "quiet", "busy"]
+
+
+def test_finished_jobs_drop_payload_and_are_purged(db_path):
+    [queue] = _queues(db_path, count=1)
+    queue.enqueue("done", "wf", {"workflow": "snapshot"})
+    queue.enqueue("waiting", "wf", {})
+    [job] = queue.claim("a", limit=1)
+    assert queue.depth() == {"queued": 1, "leased": 1}
+
+    assert queue.complete(job, "success", {"ok": True})
+    assert queue.get("done")["payload"] is None
+    assert queue.depth() == {"queued": 1}
+
+    assert queue.purge(retention=60) == 0
+    assert queue.purge(retention=-1) == 1
+    assert queue.get("done") is None
+    assert queue.get("waiting") is not None
+
+
+@pytest.mark.asyncio
+async def test_stop_releases_unfinished_jobs(db_path):
+    first, second = _queues(db_path)
+    first.enqueue("slow", "wf", {})
+    started = asyncio.Event()
+
+    async def handler(job):
+        started.set()
+        await asyncio.sleep(10)
+        return {}
+
+    worker = QueueWorker(first, handler, poll_interval=0.01, owner="a")
+    await worker.start()
+    await asyncio.wait_for(started.wait(), 1)
+    await worker.stop(timeout=0.01)
+
+    # Claimable straight away, without waiting for the lease to expire
+    [job] = second.claim("b")
+    assert job.id == "slow" and job.attempts == 1
+
+
+@pytest_asyncio.fixture
+async def queue_mode(db_path, monkeypatch):
+    monkeypatch.setenv("STORAGE_URL", f"sqlite:///{db_path}")
+    monkeypatch.setattr("zqautonxg.storage.database._database", None)
+    monkeypatch.setattr(workflows, "EXECUTION_MODE", "queue")
+    await workflows.start_queue_worker()
+    yield
+    await workflows.stop_queue_worker(5)
+    monkeypatch.setattr(workflows, "execution_queue", None)
+
+
+@pytest.mark.asyncio
+async def test_queued_execution_runs_on_worker(queue_mode):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post("/api/v1/workflows", json={
+            "name": "Queued",
+            "nodes": [{"id": "n1", "type": "passthrough", "position": {"x": 0, "y": 0}, "data": {"v": 1}}],
+            "edges": [],
+        })
+        workflow_id = created.json()["id"]
+
+        response = await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")
+        assert response.status_code == 202
+        assert response.json()["status"] == "pending"
+
+        for _ in range(100):
+            history = (await client.get(f"/api/v1/workflows/{workflow_id}/history")).json()
+            if history[0]["status"] == "success":
+                break
+            await asyncio.sleep(0.02)
+        assert history[0]["status"] == "success"
+        assert history[0]["result"]["outputs"] == {"n1": {"v": 1}}
+        assert workflows.execution_queue.depth() == {}
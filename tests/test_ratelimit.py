@@ -0,0 +1,201 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import ipaddress
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from prometheus_client import REGISTRY
+
+from zqautonxg.admission import (
+    MemoryBucketStore,
+    Policy,
+    RateLimitMiddleware,
+    RedisBucketStore,
+    parse_rules,
+)
+from zqautonxg.admission import ratelimit
+from zqautonxg.admission.ratelimit import api_key_digest, client_identity
+from zqautonxg.app import app
+
+RULES = "POST /api/v1/workflows/execute client=10/s:10 workflow=1/m:2; PUT /api/v1/workflows/{workflow_id} client=1/s"
+
+
+@pytest_asyncio.fixture
+async def client():
+    limited = RateLimitMiddleware(app, parse_rules(RULES))
+    async with AsyncClient(transport=ASGITransport(app=limited), base_url="http://test") as c:
+        yield c
+
+
+async def _workflow(client):
+    response = await client.post("/api/v1/workflows", json={"name": "Limited", "nodes": [], "edges": []})
+    return response.json()["id"]
+
+
+def test_policy_parsing():
+    policy = Policy.parse("client=100/m:20")
+    assert policy.rate == pytest.approx(100 / 60)
+    assert policy.burst == 20
+    assert Policy.parse("workflow=5/10s").rate == 0.5
+    with pytest.raises(ValueError):
+        Policy.parse("tenant=1/s")
+    with pytest.raises(ValueError):
+        parse_rules("POST /only-a-path")
+
+
+def test_bucket_refills_at_rate():
+    store = MemoryBucketStore()
+    policy = Policy.parse("client=2/s:2")
+    assert store.take_now([("k", policy)], 0.0) == [(True, 1.0)]
+    assert store.take_now([("k", policy)], 0.0) == [(True, 0.0)]
+    assert store.take_now([("k", policy)], 0.0)[0][0] is False
+    assert store.take_now([("k", policy)], 0.5) == [(True, 0.0)]
+    assert store.take_now([("k", policy)], 100.0) == [(True, 1.0)]
+
+
+def test_rejection_charges_no_bucket():
+    store = MemoryBucketStore()
+    wide, narrow = Policy.parse("client=10/s:10"), Policy.parse("workflow=1/m:1")
+    assert store.take_now([("client", wide), ("workflow", narrow)], 0.0) == [(True, 9.0), (True, 0.0)]
+    for _ in range(5):
+        assert store.take_now([("client", wide), ("workflow", narrow)], 0.0) == [(True, 9.0), (False, 0.0)]
+    assert store.take_now([("client", wide)], 0.0) == [(True, 8.0)]
+
+
+@pytest.mark.asyncio
+async def test_workflow_bucket_rejects_with_headers(client):
+    workflow_id = await _workflow(client)
+    before = REGISTRY.get_sample_value(
+        "zqautonxg_rate_limit_rejections_total",
+        {"route": "/api/v1/workflows/execute", "key": "workflow"},
+    ) or 0
+
+    for remaining in (1, 0):
+        response = await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")
+        assert response.status_code == 202
+        assert response.headers["RateLimit-Remaining"] == str(remaining)
+        assert response.headers["RateLimit-Policy"] == "2;w=120"
+
+    response = await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 60
+    assert response.json()["detail"] == "Rate limit exceeded for workflow"
+    assert REGISTRY.get_sample_value(
+        "zqautonxg_rate_limit_rejections_total",
+        {"route": "/api/v1/workflows/execute", "key": "workflow"},
+    ) == before + 1
+
+    # Another workflow still has its own bucket
+    other = await _workflow(client)
+    response = await client.post(f"/api/v1/workflows/execute?workflow_id={other}")
+    assert response.status_code == 202
+
+
+@pytest.mark.asyncio
+async def test_clients_are_keyed_by_trusted_api_key(client, monkeypatch):
+    monkeypatch.setattr(ratelimit, "TRUSTED_API_KEYS", {api_key_digest("one"), api_key_digest("two")})
+    workflow_id = await _workflow(client)
+    url = f"/api/v1/workflows/{workflow_id}"
+    assert (await client.put(url, json={"name": "a"}, headers={"X-API-Key": "one"})).status_code == 200
+    assert (await client.put(url, json={"name": "b"}, headers={"X-API-Key": "one"})).status_code == 429
+    assert (await client.put(url, json={"name": "c"}, headers={"X-API-Key": "two"})).status_code == 200
+    # Unknown keys share the caller's IP bucket instead of getting a fresh one
+    assert (await client.put(url, json={"name": "d"}, headers={"X-API-Key": "made-up"})).status_code == 200
+    assert (await client.put(url, json={"name": "e"}, headers={"X-API-Key": "also-made-up"})).status_code == 429
+    # Unlimited routes pass through without headers
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert "RateLimit-Limit" not in response.headers
+
+
+def test_forwarded_for_is_only_believed_from_trusted_proxies(monkeypatch):
+    def identity(peer, forwarded):
+        return client_identity({
+            "type": "http",
+            "client": (peer, 1234),
+            "headers": [(b"x-forwarded-for", forwarded.encode())],
+        })
+
+    assert identity("203.0.113.9", "198.51.100.1") == "ip:203.0.113.9"
+
+    monkeypatch.setattr(ratelimit, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+    assert identity("10.0.0.2", "198.51.100.1") == "ip:198.51.100.1"
+    # A client-supplied hop left of the real client is ignored
+    assert identity("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.7") == "ip:198.51.100.1"
+    assert identity("10.0.0.2", "not-an-ip") == "ip:10.0.0.2"
+    assert identity("203.0.113.9", "198.51.100.1") == "ip:203.0.113.9"
+
+
+@pytest.mark.asyncio
+async def test_redis_store_falls_back_to_local_buckets():
+    store = RedisBucketStore("redis://127.0.0.1:1/0")
+    policy = Policy.parse("client=1/s:1")
+    errors = REGISTRY.get_sample_value("zqautonxg_rate_limit_backend_errors_total") or 0
+    assert (await store.take([("k", policy)]))[0][0] is True
+    assert (await store.take([("k", policy)]))[0][0] is False
+    assert REGISTRY.get_sample_value("zqautonxg_rate_limit_backend_errors_total") == errors + 1
+
+
+class ScriptRedis:
+    """Answers the take script with a local bucket store, one slow reply at a time per connection."""
+
+    def __init__(self):
+        self.buckets = MemoryBucketStore()
+        self.active = 0
+        self.peak = 0
+        self.connections = 0
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            args = []
+            for _ in range(int(header[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2].decode())
+            if args[0] == "EVALSHA":
+                writer.write(b"-NOSCRIPT No matching script\r\n")
+                await writer.drain()
+                continue
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.02)
+            self.active -= 1
+            count = int(args[2])
+            keys, rates = args[3:3 + count], args[3 + count:]
+            buckets = [
+                (key, Policy("client", float(rates[2 * i]), float(rates[2 * i + 1]), "test"))
+                for i, key in enumerate(keys)
+            ]
+            results = self.buckets.take_now(buckets, 0.0)
+            reply = [b"*%d\r\n" % (count + 1), b":%d\r\n" % all(allowed for allowed, _ in results)]
+            for _, tokens in results:
+                data = repr(tokens).encode()
+                reply.append(b"$%d\r\n%s\r\n" % (len(data), data))
+            writer.write(b"".join(reply))
+            await writer.drain()
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_store_pools_connections_and_charges_atomically():
+    fake = ScriptRedis()
+    server = await asyncio.start_server(fake._handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    store = RedisBucketStore(f"redis://127.0.0.1:{port}/0", pool_size=3)
+    wide, narrow = Policy.parse("client=10/s:10"), Policy.parse("workflow=1/m:1")
+    try:
+        assert await store.take([("c", wide), ("w", narrow)]) == [(True, 9.0), (True, 0.0)]
+        assert await store.take([("c", wide), ("w", narrow)]) == [(True, 9.0), (False, 0.0)]
+        await asyncio.gather(*(store.take([(f"k{i}", wide)]) for i in range(9)))
+        assert fake.peak == 3
+        assert fake.connections == 3
+    finally:
+        await store.close()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,119 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from zqautonxg import server
+from zqautonxg.api.v1 import workflows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_defaults_follow_cpu_count_and_installed_accelerators(monkeypatch):
+    monkeypatch.delenv("WORKERS", raising=False)
+    args = server.build_parser().parse_args([])
+    assert args.workers == (os.cpu_count() or 1)
+
+    config = server.uvicorn_config(args)
+    assert config["app"] == "zqautonxg.app:app"
+    assert config["loop"] in ("uvloop", "asyncio")
+    assert config["http"] in ("httptools", "h11")
+    assert config["timeout_graceful_shutdown"] == args.graceful_timeout
+
+
+class _DeadProcess:
+    pid = 0
+    exitcode = 1
+
+    def is_alive(self):
+        return False
+
+
+def test_dead_workers_restart_with_backoff_then_give_up(monkeypatch):
+    monkeypatch.setattr(server, "POLL_INTERVAL", 0.001)
+    monkeypatch.setattr(server, "RESTART_BACKOFF", 0.02)
+    monkeypatch.setattr(server, "MAX_RESTARTS", 3)
+    supervisor = server.Supervisor({"host": "127.0.0.1", "port": 0}, 1, False, 1.0)
+    spawned = []
+
+    def spawn(index):
+        spawned.append(time.monotonic())
+        supervisor.processes[index] = _DeadProcess()
+
+    monkeypatch.setattr(supervisor, "_spawn", spawn)
+    handlers = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+    try:
+        assert supervisor.run() == 1
+    finally:
+        signal.signal(signal.SIGINT, handlers[0])
+        signal.signal(signal.SIGTERM, handlers[1])
+
+    # The first start plus MAX_RESTARTS restarts, each waiting twice as long
+    assert len(spawned) == 4
+    gaps = [later - earlier for earlier, later in zip(spawned, spawned[1:])]
+    assert gaps[0] >= 0.02 and gaps[1] >= 0.04 and gaps[2] >= 0.08
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="SO_REUSEPORT unavailable")
+def test_reuse_port_listeners_share_a_port():
+    first = server.bind_socket("127.0.0.1", 0, reuse_port=True)
+    port = first.getsockname()[1]
+    second = server.bind_socket("127.0.0.1", port, reuse_port=True)
+    try:
+        assert second.getsockname()[1] == port
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.asyncio
+async def test_drain_executions_waits_for_inflight():
+    execution_id = uuid4()
+    workflows.inflight_executions.add(execution_id)
+    try:
+        assert await workflows.drain_executions(0.1) == 1
+    finally:
+        workflows.inflight_executions.discard(execution_id)
+    assert await workflows.drain_executions(0.1) == 0
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("reuse_port", ["--reuse-port", "--no-reuse-port"])
+def test_multi_worker_server_serves_and_shuts_down(reuse_port):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "zqautonxg.server",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", "2", reuse_port, "--graceful-timeout", "2", "--no-banner",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.2)
+        assert response.json()["status"] == "healthy"
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=30) == 0
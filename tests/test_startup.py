@@ -0,0 +1,59 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import subprocess
+import sys
+
+from zqautonxg.benchmarks import startup
+
+
+def test_package_import_is_side_effect_free():
+    """Importing the package prints nothing and does not load the web stack."""
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, zqautonxg; "
+            "print(sorted(m for m in ('fastapi', 'zqautonxg.app', 'zqautonxg.api.v1.logs') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip() == "[]"
+
+
+def test_app_module_builds_lazily():
+    """Importing zqautonxg.app neither builds the app nor imports routers or subsystems."""
+    deferred = (
+        "zqautonxg.api.v1.workflows", "zqautonxg.admission", "zqautonxg.events", "zqautonxg.web",
+        "zqautonxg.observability", "zqautonxg.runtime", "zqautonxg.storage",
+    )
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys, zqautonxg.app as m; deferred = {deferred!r}; "
+            "print(m._app is None, any(name in sys.modules for name in deferred)); "
+            "m.app; print(m._app is not None, all(name in sys.modules for name in deferred))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.split() == ["True", "False", "True", "True"]
+
+
+def test_api_v1_exports_every_router():
+    from zqautonxg import app
+    from zqautonxg.api import v1
+
+    assert sorted(v1.__all__) == sorted(app.API_V1_ROUTERS)
+
+
+def test_startup_benchmark_reports_metrics():
+    summary = startup.run(runs=1)
+    for metric in startup.METRICS:
+        assert summary[metric]["median"] > 0
+    assert startup.check_budgets(summary, {}) == []
+    assert startup.check_budgets(summary, {"package_import_ms": 0.0})
@@ -0,0 +1,172 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import json
+import subprocess
+import sys
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.app import app
+from zqautonxg.observability import tracing
+from zqautonxg.runtime import nodes
+from zqautonxg.runtime.columnar import Table
+from zqautonxg.runtime.executor import payload_size
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def test_node_types():
+    attempts = {"count": 0}
+
+    async def slow(node, inputs):
+        await asyncio.sleep(node.data.get("sleep", 0.05))
+        return {"slept": True}
+
+    async def flaky(node, inputs):
+        attempts["count"] += 1
+        if attempts["count"] < 2:
+            raise RuntimeError("transient")
+        return {"inputs": sorted(inputs)}
+
+    nodes.register_node_type("test-slow", slow)
+    nodes.register_node_type("test-flaky", flaky)
+    yield attempts
+    nodes.node_types.pop("test-slow")
+    nodes.node_types.pop("test-flaky")
+
+
+def _node(node_id, node_type="passthrough", **data):
+    return {"id": node_id, "type": node_type, "position": {"x": 0, "y": 0}, "data": data}
+
+
+def _edge(source, target):
+    return {"id": f"{source}-{target}", "source": source, "target": target}
+
+
+async def _execute(client, workflow):
+    created = await client.post("/api/v1/workflows", json=workflow)
+    workflow_id = created.json()["id"]
+    response = await client.post(f"/api/v1/workflows/execute?workflow_id={workflow_id}")
+    assert response.status_code == 202
+    return workflow_id, response.json()
+
+
+@pytest.mark.asyncio
+async def test_trace_records_spans_and_critical_path(client, test_node_types):
+    # a -> (fast, slow) -> join; the slow branch dominates latency
+    workflow = {
+        "name": "Diamond",
+        "nodes": [
+            _node("a"),
+            _node("fast"),
+            _node("slow", "test-slow", sleep=0.05),
+            _node("join", "test-flaky", retries=2),
+        ],
+        "edges": [_edge("a", "fast"), _edge("a", "slow"), _edge("fast", "join"), _edge("slow", "join")],
+    }
+    workflow_id, execution = await _execute(client, workflow)
+    assert execution["status"] == "success"
+    assert execution["duration_ms"] >= 50
+    assert execution["result"]["nodes_executed"] == 4
+    assert execution["result"]["outputs"] == {"join": {"inputs": ["fast", "slow"]}}
+
+    response = await client.get(
+        f"/api/v1/workflows/{workflow_id}/executions/{execution['id']}/trace"
+    )
+    assert response.status_code == 200
+    trace = response.json()
+    root, *node_spans = trace["spans"]
+    assert root["name"] == "workflow.execute"
+    assert {s["attributes"]["zq.node.id"] for s in node_spans} == {"a", "fast", "slow", "join"}
+    assert all(s["parent_span_id"] == root["span_id"] for s in node_spans)
+
+    join = next(s for s in node_spans if s["attributes"]["zq.node.id"] == "join")
+    assert join["attributes"]["zq.node.attempts"] == 2
+    # Plain payloads are not measured; only tables report their size
+    assert "zq.node.bytes_in" not in join["attributes"]
+
+    path = trace["critical_path"]
+    assert path["nodes"] == ["a", "slow", "join"]
+    assert path["dominant_node"] == "slow"
+
+
+@pytest.mark.asyncio
+async def test_trace_as_otlp_json(client):
+    workflow_id, execution = await _execute(
+        client, {"name": "Single", "nodes": [_node("only")], "edges": []}
+    )
+    response = await client.get(
+        f"/api/v1/workflows/{workflow_id}/executions/{execution['id']}/trace",
+        params={"format": "otlp"},
+    )
+    spans = response.json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert len(spans) == 2
+    assert all(len(span["traceId"]) == 32 and len(span["spanId"]) == 16 for span in spans)
+
+
+@pytest.mark.asyncio
+async def test_cyclic_workflow_fails(client):
+    workflow = {
+        "name": "Cycle",
+        "nodes": [_node("a"), _node("b")],
+        "edges": [_edge("a", "b"), _edge("b", "a")],
+    }
+    _, execution = await _execute(client, workflow)
+    assert execution["status"] == "failed"
+    assert "cycle" in execution["error"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_trace_is_404(client):
+    workflow_id, _ = await _execute(client, {"name": "Empty", "nodes": [], "edges": []})
+    response = await client.get(
+        f"/api/v1/workflows/{workflow_id}/executions/00000000-0000-0000-0000-000000000000/trace"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_exporters_write_file_and_post_to_collector(client, tmp_path, monkeypatch):
+    received = []
+
+    def collector(request: httpx.Request) -> httpx.Response:
+        received.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={})
+
+    path = tmp_path / "spans.jsonl"
+    monkeypatch.setattr(tracing, "exporters", [
+        tracing.FileSpanExporter(str(path)),
+        tracing.OTLPHttpSpanExporter("http://collector:4318", transport=httpx.MockTransport(collector)),
+    ])
+
+    await _execute(client, {"name": "Exported", "nodes": [_node("n1")], "edges": []})
+    await tracing.flush()
+
+    exported = json.loads(path.read_text().splitlines()[-1])
+    assert len(exported["resourceSpans"][0]["scopeSpans"][0]["spans"]) == 2
+    assert received and received[0][0] == "/v1/traces"
+
+
+def test_httpx_is_imported_only_when_exporting():
+    code = "import sys, zqautonxg.app; assert 'httpx' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+    with pytest.raises(TypeError):
+        tracing.SpanExporter()
+
+
+def test_payload_size_counts_table_bytes_only():
+    table = Table.from_pydict({"n": [1, 2, 3]})
+    assert payload_size(table) == table.nbytes > 0
+    assert payload_size({"a": table, "b": {"x": 1}}) == table.nbytes
+    assert payload_size({"x": list(range(1000))}) is None
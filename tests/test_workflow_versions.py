@@ -0,0 +1,153 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import random
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from zqautonxg.api.v1 import workflows
+from zqautonxg.app import app
+from zqautonxg.models.workflow import Workflow, WorkflowNode
+from zqautonxg.runtime.versions import PersistentMap, VersionHistory
+
+
+@pytest_asyncio.fixture
+async def client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+class Colliding:
+    """Key whose hash collides with every other instance."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __hash__(self):
+        return 42
+
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.name == self.name
+
+
+def node(node_id, label="x"):
+    return {"id": node_id, "type": "transform", "position": {"x": 0, "y": 0}, "data": {"label": label}}
+
+
+def test_persistent_map_matches_dict():
+    rng = random.Random(7)
+    reference = {}
+    pmap = PersistentMap()
+    snapshots = []
+    for step in range(3000):
+        key = f"k{rng.randrange(500)}"
+        if rng.random() < 0.3:
+            reference.pop(key, None)
+            pmap = pmap.delete(key)
+        else:
+            reference[key] = step
+            pmap = pmap.set(key, step)
+        if step % 500 == 0:
+            snapshots.append((dict(reference), pmap))
+    assert dict(pmap.items()) == reference
+    assert len(pmap) == len(reference)
+    # Earlier maps are unaffected by later changes
+    for expected, snapshot in snapshots:
+        assert dict(snapshot.items()) == expected
+
+
+def test_persistent_map_diff_and_collisions():
+    keys = [Colliding(name) for name in "abc"]
+    base = PersistentMap.from_items((key, i) for i, key in enumerate(keys))
+    assert base.get(Colliding("b")) == 1
+    changed = base.set(Colliding("b"), 10).delete(Colliding("c")).set(Colliding("d"), 3)
+    assert sorted((k.name, old, new) for k, old, new in base.diff(changed)) == [
+        ("b", 1, 10), ("c", 2, None), ("d", None, 3)
+    ]
+    assert base.set(keys[0], 0) is base
+    assert Colliding("c") not in changed
+
+
+def test_unchanged_nodes_are_shared_between_versions():
+    nodes = [WorkflowNode(**node(f"n{i}")) for i in range(2000)]
+    history = VersionHistory(Workflow(name="big", nodes=nodes))
+    edited = list(nodes)
+    edited[10] = WorkflowNode(**node("n10", "edited"))
+    version = history.commit(nodes=[WorkflowNode(**n.model_dump()) for n in edited])
+    first = history.get(1)
+
+    assert version.number == 2
+    assert version.nodes.get("n11")[1] is first.nodes.get("n11")[1]
+    # Only the path to the edited node was copied
+    shared = sum(a is b for a, b in zip(first.nodes._root.children, version.nodes._root.children))
+    assert shared == len(first.nodes._root.children) - 1
+    diff = history.diff(first, version)
+    assert [change["id"] for change in diff["nodes"]["changed"]] == ["n10"]
+    assert history.commit(nodes=edited) is version
+    assert [n.id for n in history.workflow(version).nodes] == [n.id for n in nodes]
+
+
+@pytest.mark.asyncio
+async def test_version_history_endpoints(client):
+    created = await client.post(
+        "/api/v1/workflows", json={"name": "versioned", "nodes": [node("a"), node("b")], "edges": []}
+    )
+    workflow_id = created.json()["id"]
+    assert created.json()["version"] == 1
+
+    updated = await client.put(
+        f"/api/v1/workflows/{workflow_id}",
+        json={"name": "versioned v2", "nodes": [node("a", "changed"), node("c")]},
+    )
+    assert updated.json()["version"] == 2
+    assert [n["id"] for n in updated.json()["nodes"]] == ["a", "c"]
+
+    old = (await client.get(f"/api/v1/workflows/{workflow_id}/versions/1")).json()
+    assert old["name"] == "versioned"
+    assert [n["id"] for n in old["nodes"]] == ["a", "b"]
+
+    diff = (await client.get(f"/api/v1/workflows/{workflow_id}/versions/2/diff")).json()
+    assert diff["fields"] == {"name": {"from": "versioned", "to": "versioned v2"}}
+    assert [n["id"] for n in diff["nodes"]["added"]] == ["c"]
+    assert [n["id"] for n in diff["nodes"]["removed"]] == ["b"]
+    assert diff["nodes"]["changed"][0]["to"]["data"] == {"label": "changed"}
+
+    restored = await client.post(f"/api/v1/workflows/{workflow_id}/versions/1/restore")
+    assert restored.json()["version"] == 3
+    assert restored.json()["name"] == "versioned"
+    listing = (await client.get(f"/api/v1/workflows/{workflow_id}/versions")).json()
+    assert [v["version"] for v in listing] == [1, 2, 3]
+    assert (await client.get(f"/api/v1/workflows/{workflow_id}/versions/9")).status_code == 404
+
+    await client.delete(f"/api/v1/workflows/{workflow_id}")
+    assert workflows.workflow_versions.get(workflows.UUID(workflow_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_executions_are_pinned_to_a_version(client):
+    created = await client.post("/api/v1/workflows", json={"name": "pinned"})
+    workflow_id = created.json()["id"]
+    await client.put(f"/api/v1/workflows/{workflow_id}", json={"description": "second"})
+
+    current = await client.post("/api/v1/workflows/execute", params={"workflow_id": workflow_id})
+    pinned = await client.post(
+        "/api/v1/workflows/execute", params={"workflow_id": workflow_id, "version": 1}
+    )
+    assert current.json()["workflow_version"] == 2
+    assert pinned.json()["workflow_version"] == 1
+    missing = await client.post(
+        "/api/v1/workflows/execute", params={"workflow_id": workflow_id, "version": 7}
+    )
+    assert missing.status_code == 404
+    await client.delete(f"/api/v1/workflows/{workflow_id}")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_node_ids_are_rejected(client):
+    response = await client.post(
+        "/api/v1/workflows", json={"name": "dupes", "nodes": [node("a"), node("a")]}
+    )
+    assert response.status_code == 422
@@ -44,6 +44,8 @@ import logging
 logging.getLogger("zqautonxg").addHandler(logging.NullHandler())
 
 # ZQAutoNXG startup banner
+# Printed by the server launcher, never on import: importing the package must
+# stay side-effect free so worker spawns and test runs start fast.
 def _startup_banner() -> None:
     """Display ZQAutoNXG startup information"""
     banner = f"""
@@ -58,7 +60,3 @@ def _startup_banner() -> None:
     ╚══════════════════════════════════════════════════════════════╝
     """
     print(banner)
-
-# Display banner when imported
-if __name__ != "__main__":
-    _startup_banner()
\ No newline at end of file
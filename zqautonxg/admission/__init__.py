@@ -0,0 +1,84 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Admission control for ZQAutoNXG platform.
+
+``RATE_LIMIT_ENABLED=true`` turns on token-bucket limits for the execute and
+write endpoints (rules in ``RATE_LIMIT_RULES``). Buckets live in each worker
+unless ``RATE_LIMIT_BACKEND=redis``, which shares them through ``REDIS_URL``.
+
+Create and execute requests carrying an ``Idempotency-Key`` header are
+deduplicated; keys are kept for ``IDEMPOTENCY_TTL`` seconds.
+"""
+
+import os
+from typing import Optional
+
+from .idempotency import (
+    DatabaseIdempotencyStore,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+)
+from .ratelimit import (
+    DEFAULT_RULES,
+    BucketStore,
+    MemoryBucketStore,
+    Policy,
+    RateLimitMiddleware,
+    RedisBucketStore,
+    Rule,
+    client_identity,
+    parse_rules,
+)
+
+
+def create_store(backend: str = "memory", url: str = "redis://localhost:6379/0") -> BucketStore:
+    """Create a bucket store for ``backend`` (``memory`` or ``redis``)."""
+    if backend == "memory":
+        return MemoryBucketStore()
+    if backend == "redis":
+        return RedisBucketStore(url)
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+def rate_limit_options() -> Optional[dict]:
+    """Middleware options from the environment, or ``None`` when disabled."""
+    if os.getenv("RATE_LIMIT_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    return {
+        "rules": parse_rules(os.getenv("RATE_LIMIT_RULES") or DEFAULT_RULES),
+        "store": create_store(
+            os.getenv("RATE_LIMIT_BACKEND", "memory"),
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        ),
+    }
+
+
+def idempotency_options() -> dict:
+    """Idempotency middleware options from the environment."""
+    return {
+        "ttl": float(os.getenv("IDEMPOTENCY_TTL", 86400)),
+        "max_keys": int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10_000)),
+    }
+
+
+__all__ = [
+    "DEFAULT_RULES",
+    "BucketStore",
+    "DatabaseIdempotencyStore",
+    "IdempotencyMiddleware",
+    "IdempotencyStore",
+    "MemoryIdempotencyStore",
+    "MemoryBucketStore",
+    "Policy",
+    "RateLimitMiddleware",
+    "RedisBucketStore",
+    "Rule",
+    "client_identity",
+    "create_store",
+    "idempotency_options",
+    "parse_rules",
+    "rate_limit_options",
+]
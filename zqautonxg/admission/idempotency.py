@@ -0,0 +1,443 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+``Idempotency-Key`` support for create and execute endpoints.
+
+The first request with a given key (per client) runs normally and its
+response is stored together with a fingerprint of the request (method, path,
+query and body). Retries with the same key and fingerprint get the stored
+response back, marked ``Idempotent-Replayed: true``, without running the
+endpoint again; a retry that arrives while the first request is still
+running waits for it and shares its response. Reusing a key for a different
+request is rejected with ``422``.
+
+A running request holds its key with an owner token and refreshes the lock
+every ``LOCK_SECONDS / 3`` seconds, so a slow request keeps it however long
+it takes while a crashed worker's key is freed after ``LOCK_SECONDS``. Only
+the owner can complete or release a key: a request whose lock was lost
+anyway cannot overwrite the response of the request that took it over.
+
+Server errors (5xx) are not stored, so a failed attempt can be retried.
+Entries expire after ``ttl`` seconds and the in-memory store keeps at most
+``max_keys`` of them. With ``STORAGE_URL`` set, keys live in the shared
+database so retries landing on another worker or instance are deduplicated
+too.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from zqautonxg.storage import Database, get_database
+
+from .ratelimit import api_key_digest, client_identity
+
+logger = logging.getLogger("zqautonxg.admission.idempotency")
+
+IDEMPOTENT_ROUTES = (
+    ("POST", "/api/v1/workflows"),
+    ("POST", "/api/v1/workflows/execute"),
+)
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY = 1_048_576
+# A pending key whose request never finished (crashed worker) is freed after this
+LOCK_SECONDS = 60.0
+WAIT_TIMEOUT = 30.0
+
+IDEMPOTENCY_REQUESTS = Counter(
+    "zqautonxg_idempotency_requests_total", "Requests carrying an Idempotency-Key", ["outcome"]
+)
+
+
+class StoredResponse:
+    """A response recorded for replay."""
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "status": self.status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+        })
+
+    @classmethod
+    def from_json(cls, data: str, body: bytes) -> "StoredResponse":
+        meta = json.loads(data)
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["headers"]]
+        return cls(meta["status"], headers, body)
+
+
+# Outcomes of IdempotencyStore.begin()
+NEW, REPLAY, PENDING, MISMATCH = "new", "replay", "pending", "mismatch"
+
+
+class IdempotencyStore(ABC):
+    """Where idempotency keys and their responses are kept."""
+
+    @abstractmethod
+    async def begin(self, key: str, fingerprint: str, owner: str) -> Tuple[str, Optional[StoredResponse]]:
+        """Claim ``key`` for ``owner`` or report its state: ``NEW``, ``REPLAY``, ``PENDING`` or ``MISMATCH``."""
+
+    @abstractmethod
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        """Wait for a pending ``key``; ``None`` if it was released or timed out."""
+
+    @abstractmethod
+    async def refresh(self, key: str, owner: str) -> bool:
+        """Extend ``owner``'s lock on a pending ``key``; ``False`` if it no longer holds it."""
+
+    @abstractmethod
+    async def complete(self, key: str, owner: str, response: StoredResponse) -> None:
+        """Store the response of ``owner``'s request, unless its lock was taken over."""
+
+    @abstractmethod
+    async def release(self, key: str, owner: str) -> None:
+        """Forget ``owner``'s pending ``key`` so the request can be retried."""
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "owner", "expires_at", "response", "done")
+
+    def __init__(self, fingerprint: str, owner: str, expires_at: float) -> None:
+        self.fingerprint = fingerprint
+        self.owner = owner
+        self.expires_at = expires_at
+        self.response: Optional[StoredResponse] = None
+        self.done = asyncio.Event()
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Keys held in this process, oldest evicted first."""
+
+    def __init__(self, ttl: float = 86400.0, max_keys: int = 10_000) -> None:
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in creation order, so expired ones are at the front
+        while self.entries:
+            entry = next(iter(self.entries.values()))
+            if entry.expires_at > now and (len(self.entries) < self.max_keys or entry.response is None):
+                break  # over capacity, but never evict a request that is still running
+            self.entries.popitem(last=False)
+
+    def _owned(self, key: str, owner: str) -> Optional[_Entry]:
+        entry = self.entries.get(key)
+        if entry is None or entry.owner != owner or entry.response is not None:
+            return None
+        return entry
+
+    async def begin(self, key: str, fingerprint: str, owner: str) -> Tuple[str, Optional[StoredResponse]]:
+        now = time.monotonic()
+        self._evict(now)
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self.entries[key]
+            entry.done.set()  # waiters on the abandoned entry retry against the new one
+            entry = None
+        if entry is None:
+            self.entries[key] = _Entry(fingerprint, owner, now + LOCK_SECONDS)
+            return NEW, None
+        if entry.fingerprint != fingerprint:
+            return MISMATCH, None
+        if entry.response is not None:
+            return REPLAY, entry.response
+        return PENDING, None
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            await asyncio.wait_for(entry.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return entry.response
+
+    async def refresh(self, key: str, owner: str) -> bool:
+        entry = self._owned(key, owner)
+        if entry is None:
+            return False
+        entry.expires_at = time.monotonic() + LOCK_SECONDS
+        return True
+
+    async def complete(self, key: str, owner: str, response: StoredResponse) -> None:
+        entry = self._owned(key, owner)
+        if entry is None:
+            return
+        entry.response = response
+        entry.expires_at = time.monotonic() + self.ttl
+        self.entries.move_to_end(key)
+        entry.done.set()
+
+    async def release(self, key: str, owner: str) -> None:
+        entry = self._owned(key, owner)
+        if entry is not None:
+            del self.entries[key]
+            entry.done.set()
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    owner TEXT,                        -- token of the request holding the key
+    response TEXT,                     -- status and headers; NULL while pending
+    body BLOB,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idempotency_keys_expiry ON idempotency_keys (expires_at);
+"""
+POLL_INTERVAL = 0.05
+PURGE_EVERY = 1000
+
+
+class DatabaseIdempotencyStore(IdempotencyStore):
+    """Keys in the storage database, shared by every worker using it."""
+
+    def __init__(self, database: Database, ttl: float = 86400.0) -> None:
+        self.database = database
+        self.ttl = ttl
+        self._begins = 0
+        database.executescript(SCHEMA)
+        columns = {row["name"] for row in database.fetchall("PRAGMA table_info(idempotency_keys)")}
+        if "owner" not in columns:  # created before keys had owners
+            database.execute("ALTER TABLE idempotency_keys ADD COLUMN owner TEXT")
+
+    def _begin(self, key: str, fingerprint: str, owner: str) -> Tuple[str, Optional[StoredResponse]]:
+        now = time.time()
+        with self.database.transaction() as db:
+            self._begins += 1
+            if self._begins % PURGE_EVERY == 0:
+                db.execute("DELETE FROM idempotency_keys WHERE expires_at <= ?", (now,))
+            row = db.execute(
+                "SELECT fingerprint, response, body, expires_at FROM idempotency_keys WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row["expires_at"] <= now:
+                db.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                db.execute(
+                    "INSERT INTO idempotency_keys (key, fingerprint, owner, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, owner, now + LOCK_SECONDS),
+                )
+                return NEW, None
+        if row["fingerprint"] != fingerprint:
+            return MISMATCH, None
+        if row["response"] is not None:
+            return REPLAY, StoredResponse.from_json(row["response"], row["body"])
+        return PENDING, None
+
+    def _lookup(self, key: str) -> Tuple[bool, Optional[StoredResponse]]:
+        row = self.database.fetchone("SELECT response, body FROM idempotency_keys WHERE key = ?", (key,))
+        if row is None:
+            return True, None
+        if row["response"] is None:
+            return False, None
+        return True, StoredResponse.from_json(row["response"], row["body"])
+
+    async def begin(self, key: str, fingerprint: str, owner: str) -> Tuple[str, Optional[StoredResponse]]:
+        return await self.database.run(self._begin, key, fingerprint, owner)
+
+    async def wait(self, key: str, timeout: float) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            finished, response = await self.database.run(self._lookup, key)
+            if finished:
+                return response
+            await asyncio.sleep(POLL_INTERVAL)
+        return None
+
+    async def refresh(self, key: str, owner: str) -> bool:
+        cursor = await self.database.run(
+            self.database.execute,
+            "UPDATE idempotency_keys SET expires_at = ? WHERE key = ? AND owner = ? AND response IS NULL",
+            (time.time() + LOCK_SECONDS, key, owner),
+        )
+        return cursor.rowcount > 0
+
+    async def complete(self, key: str, owner: str, response: StoredResponse) -> None:
+        await self.database.run(
+            self.database.execute,
+            "UPDATE idempotency_keys SET response = ?, body = ?, expires_at = ? "
+            "WHERE key = ? AND owner = ? AND response IS NULL",
+            (response.to_json(), response.body, time.time() + self.ttl, key, owner),
+        )
+
+    async def release(self, key: str, owner: str) -> None:
+        await self.database.run(
+            self.database.execute,
+            "DELETE FROM idempotency_keys WHERE key = ? AND owner = ? AND response IS NULL",
+            (key, owner),
+        )
+
+
+def _json_response(status: int, detail: str) -> StoredResponse:
+    body = json.dumps({"detail": detail}).encode()
+    return StoredResponse(
+        status, [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())], body
+    )
+
+
+async def _hold(store: IdempotencyStore, key: str, owner: str) -> None:
+    """Keep refreshing ``owner``'s lock on ``key`` until cancelled."""
+    while True:
+        await asyncio.sleep(LOCK_SECONDS / 3)
+        try:
+            if not await store.refresh(key, owner):
+                logger.warning(f"Idempotency key {key!r} was taken over while its request was running")
+                return
+        except Exception as e:
+            logger.warning(f"Failed to refresh idempotency key {key!r}: {e}")
+
+
+async def _send_response(send: Send, response: StoredResponse, extra: Iterable[Tuple[bytes, bytes]] = ()) -> None:
+    await send({"type": "http.response.start", "status": response.status, "headers": response.headers + list(extra)})
+    await send({"type": "http.response.body", "body": response.body})
+
+
+class IdempotencyMiddleware:
+    """Deduplicate retried requests that carry an ``Idempotency-Key``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: Optional[IdempotencyStore] = None,
+        routes: Iterable[Tuple[str, str]] = IDEMPOTENT_ROUTES,
+        ttl: float = 86400.0,
+        max_keys: int = 10_000,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.routes = set(routes)
+        self.ttl = ttl
+        self.max_keys = max_keys
+
+    def _store(self) -> IdempotencyStore:
+        if self.store is None:
+            database = get_database()
+            if database is not None:
+                self.store = DatabaseIdempotencyStore(database, self.ttl)
+            else:
+                self.store = MemoryIdempotencyStore(self.ttl, self.max_keys)
+        return self.store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_response(send, _json_response(400, "Invalid Idempotency-Key header"))
+            return
+
+        # Buffer the body to fingerprint it, then replay it to the app
+        messages: List[Message] = []
+        body = hashlib.sha256()
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body.update(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""),
+                        body.digest()])
+        ).hexdigest()
+        client = client_identity(scope)
+        api_key = headers.get("x-api-key")
+        if api_key and not client.startswith("key:"):
+            # An unrecognised key still keeps callers behind one address apart
+            client += ":" + api_key_digest(api_key)
+        key = f"{client}:{scope['path']}:{idempotency_key}"
+        store = self._store()
+        owner = secrets.token_hex(16)
+
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while True:
+            state, stored = await store.begin(key, fingerprint, owner)
+            if state == REPLAY and stored is not None:
+                IDEMPOTENCY_REQUESTS.labels(outcome="replayed").inc()
+                await _send_response(send, stored, [(b"idempotent-replayed", b"true")])
+                return
+            if state == MISMATCH:
+                IDEMPOTENCY_REQUESTS.labels(outcome="mismatch").inc()
+                await _send_response(
+                    send, _json_response(422, "Idempotency-Key was already used for a different request")
+                )
+                return
+            if state == NEW:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await _send_response(
+                    send, _json_response(409, "A request with this Idempotency-Key is still in progress")
+                )
+                return
+            stored = await store.wait(key, remaining)
+            if stored is not None:
+                IDEMPOTENCY_REQUESTS.labels(outcome="coalesced").inc()
+                await _send_response(send, stored, [(b"idempotent-replayed", b"true")])
+                return
+            # Released (the first attempt failed) or the lock expired: try to claim it
+
+        IDEMPOTENCY_REQUESTS.labels(outcome="executed").inc()
+        pending = list(messages)
+
+        async def replay_receive() -> Message:
+            if pending:
+                return pending.pop(0)
+            return await receive()
+
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= MAX_STORED_BODY:
+                    chunks.append(chunk)
+            await send(message)
+
+        holder = asyncio.create_task(_hold(store, key, owner))
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await store.release(key, owner)
+            raise
+        finally:
+            holder.cancel()
+        if status >= 500 or size > MAX_STORED_BODY:
+            await store.release(key, owner)
+        else:
+            await store.complete(key, owner, StoredResponse(status, headers, b"".join(chunks)))
@@ -0,0 +1,420 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Token-bucket rate limiting for execute and write endpoints.
+
+Each rule matches a method and path template and carries one or more
+policies, keyed either by client or by the ``workflow_id`` path or query
+parameter. A client is its ``X-API-Key`` when the key is one of
+``RATE_LIMIT_API_KEYS``, else its IP; ``X-Forwarded-For`` is only believed
+when the connection comes from one of ``RATE_LIMIT_TRUSTED_PROXIES``
+(addresses or CIDR ranges), so an unknown key or a forged header cannot
+buy a fresh bucket. A bucket holds up to
+``burst`` tokens and refills at ``rate`` tokens per second; a request takes
+one token from every bucket it maps to and is rejected with ``429`` when any
+of them is empty, in which case no bucket is charged. All of a request's
+buckets are checked and charged together: one pass over a dict in memory,
+or one Redis script call.
+
+Rules are written as ``METHOD PATH key=RATE/PERIOD[:BURST] ...`` separated by
+``;``, e.g.::
+
+    POST /api/v1/workflows/execute client=20/s:40 workflow=10/s:20
+
+The first rule matching a request applies, so specific paths go before
+templated ones.
+
+Responses carry ``RateLimit-Limit``, ``RateLimit-Remaining``,
+``RateLimit-Reset`` and ``RateLimit-Policy`` for the most constrained
+policy, plus ``Retry-After`` on rejection.
+"""
+
+import asyncio
+import hashlib
+import ipaddress
+import json
+import logging
+import math
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Tuple, Union
+from urllib.parse import parse_qs
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from zqautonxg.events.redis_bus import RedisConnection, RedisError
+
+logger = logging.getLogger("zqautonxg.admission.ratelimit")
+
+DEFAULT_RULES = (
+    "POST /api/v1/workflows/execute client=20/s:40 workflow=10/s:20; "
+    "POST /api/v1/workflows client=10/s:20; "
+    "PUT /api/v1/workflows/{workflow_id} client=10/s:20 workflow=5/s:10; "
+    "DELETE /api/v1/workflows/{workflow_id} client=10/s:20; "
+    "POST /api/v1/workflows/activate client=10/s:20 workflow=5/s:10; "
+    "PUT /api/v1/nodes/bulk/config client=2/s:5; "
+    "POST /api/v1/nodes/bulk/toggle client=2/s:5; "
+    "PUT /api/v1/nodes/{node_id}/config client=10/s:20; "
+    "POST /api/v1/nodes/toggle/{node_id} client=10/s:20"
+)
+MAX_BUCKETS = 100_000
+KEY_PREFIX = "zqautonxg:ratelimit:"
+REDIS_POOL_SIZE = 4
+
+PERIODS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def api_key_digest(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()[:32]
+
+
+def _split(text: str) -> List[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+TRUSTED_API_KEYS: FrozenSet[str] = frozenset(
+    api_key_digest(key) for key in _split(os.getenv("RATE_LIMIT_API_KEYS", ""))
+)
+TRUSTED_PROXIES: List[Network] = [
+    ipaddress.ip_network(network, strict=False) for network in _split(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", ""))
+]
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "zqautonxg_rate_limit_rejections_total", "Requests rejected by rate limiting", ["route", "key"]
+)
+RATE_LIMIT_BACKEND_ERRORS = Counter(
+    "zqautonxg_rate_limit_backend_errors_total", "Shared rate limit store failures (fell back to local)"
+)
+
+
+class Policy:
+    """A token bucket definition: ``burst`` tokens refilled at ``rate``/s."""
+
+    __slots__ = ("key", "rate", "burst", "spec")
+
+    def __init__(self, key: str, rate: float, burst: float, spec: str) -> None:
+        if key not in ("client", "workflow"):
+            raise ValueError(f"Unknown rate limit key {key!r}; expected client or workflow")
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Invalid rate limit {spec!r}")
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self.spec = spec
+
+    @classmethod
+    def parse(cls, text: str) -> "Policy":
+        match = re.fullmatch(r"(\w+)=(\d+(?:\.\d+)?)/(\d*)([smh])(?::(\d+))?", text)
+        if match is None:
+            raise ValueError(f"Invalid rate limit policy {text!r}")
+        key, count, multiple, unit, burst = match.groups()
+        window = PERIODS[unit] * (int(multiple) if multiple else 1)
+        count_value = float(count)
+        return cls(key, count_value / window, float(burst) if burst else max(1.0, count_value), text)
+
+    def header(self) -> str:
+        return f"{math.floor(self.burst)};w={math.ceil(self.burst / self.rate)}"
+
+
+class Rule:
+    """Policies applied to one method and path template."""
+
+    def __init__(self, method: str, template: str, policies: List[Policy]) -> None:
+        self.method = method.upper()
+        self.template = template
+        self.policies = policies
+        pattern = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", re.escape(template))
+        self.pattern: Pattern[str] = re.compile(pattern + "$")
+
+
+def parse_rules(text: str) -> List[Rule]:
+    rules = []
+    for chunk in text.split(";"):
+        parts = chunk.split()
+        if not parts:
+            continue
+        if len(parts) < 3:
+            raise ValueError(f"Invalid rate limit rule {chunk.strip()!r}")
+        rules.append(Rule(parts[0], parts[1], [Policy.parse(p) for p in parts[2:]]))
+    return rules
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(scope: Scope) -> str:
+    """The peer address, or the ``X-Forwarded-For`` hop our proxies vouch for."""
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if not _is_trusted_proxy(address):
+        return address
+    forwarded = Headers(scope=scope).get("x-forwarded-for")
+    if not forwarded:
+        return address
+    # Walk back from the nearest hop; the first one not added by a trusted
+    # proxy is the client (anything further left is client-supplied)
+    for hop in reversed(_split(forwarded)):
+        try:
+            ipaddress.ip_address(hop)
+        except ValueError:
+            return address
+        address = hop
+        if not _is_trusted_proxy(hop):
+            break
+    return address
+
+
+def client_identity(scope: Scope) -> str:
+    """Who sent the request: its ``X-API-Key`` if trusted, else the client IP."""
+    api_key = Headers(scope=scope).get("x-api-key")
+    if api_key:
+        digest = api_key_digest(api_key)
+        if digest in TRUSTED_API_KEYS:
+            return "key:" + digest
+    return "ip:" + client_ip(scope)
+
+
+def refill(tokens: float, updated: float, now: float, policy: Policy) -> float:
+    return min(policy.burst, tokens + max(0.0, now - updated) * policy.rate)
+
+
+class BucketStore(ABC):
+    """Where token buckets are kept."""
+
+    @abstractmethod
+    async def take(self, buckets: List[Tuple[str, Policy]]) -> List[Tuple[bool, float]]:
+        """Take one token from every bucket if all of them have one.
+
+        Returns ``(allowed, tokens left)`` per bucket; if any bucket is
+        empty, none is charged and ``allowed`` marks the ones that had a
+        token.
+        """
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBucketStore(BucketStore):
+    """Buckets held in this process, least recently used evicted first."""
+
+    def __init__(self, max_buckets: int = MAX_BUCKETS) -> None:
+        self.max_buckets = max_buckets
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, buckets: List[Tuple[str, Policy]]) -> List[Tuple[bool, float]]:
+        return self.take_now(buckets, time.monotonic())
+
+    def take_now(self, buckets: List[Tuple[str, Policy]], now: float) -> List[Tuple[bool, float]]:
+        levels = []
+        for key, policy in buckets:
+            state = self.buckets.get(key)
+            levels.append(policy.burst if state is None else refill(state[0], state[1], now, policy))
+        admitted = all(tokens >= 1 for tokens in levels)
+        results = []
+        for (key, _), tokens in zip(buckets, levels):
+            allowed = tokens >= 1
+            if admitted:
+                tokens -= 1
+            if key in self.buckets:
+                self.buckets.move_to_end(key)
+            elif len(self.buckets) >= self.max_buckets:
+                self.buckets.popitem(last=False)
+            self.buckets[key] = (tokens, now)
+            results.append((allowed, tokens))
+        return results
+
+
+# Refill every bucket, charge them all only if each has a token, and store
+# atomically; Redis TIME keeps workers on one clock. ARGV holds rate and
+# burst per key; the reply is the admission flag then the level per key.
+TAKE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local admitted = 1
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[2 * i - 1])
+  local burst = tonumber(ARGV[2 * i])
+  local state = redis.call('HMGET', key, 't', 'u')
+  local tokens = tonumber(state[1]) or burst
+  local updated = tonumber(state[2]) or now
+  tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+  levels[i] = tokens
+  if tokens < 1 then
+    admitted = 0
+  end
+end
+local reply = {admitted}
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[2 * i - 1])
+  local burst = tonumber(ARGV[2 * i])
+  local tokens = levels[i]
+  if admitted == 1 then
+    tokens = tokens - 1
+  end
+  redis.call('HSET', key, 't', tostring(tokens), 'u', tostring(now))
+  redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+  reply[i + 1] = tostring(tokens)
+end
+return reply
+"""
+TAKE_SCRIPT_SHA = hashlib.sha1(TAKE_SCRIPT.encode()).hexdigest()
+
+
+class RedisBucketStore(BucketStore):
+    """Buckets shared by all workers through Redis.
+
+    Requests use up to ``pool_size`` connections at once. Falls back to a
+    local store while Redis is unreachable, so an outage degrades to
+    per-worker limits rather than rejecting or failing requests.
+    """
+
+    def __init__(self, url: str, pool_size: int = REDIS_POOL_SIZE) -> None:
+        self.url = url
+        self.fallback = MemoryBucketStore()
+        self._idle: List[RedisConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._retry_at = 0.0
+
+    async def _evaluate(self, *args: str) -> List[Any]:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await RedisConnection.open(self.url)
+            try:
+                try:
+                    reply = await connection.execute("EVALSHA", TAKE_SCRIPT_SHA, *args)
+                except RedisError as e:
+                    if not str(e).startswith("NOSCRIPT"):
+                        raise
+                    reply = await connection.execute("EVAL", TAKE_SCRIPT, *args)
+            except BaseException:
+                await connection.close()
+                raise
+            self._idle.append(connection)
+        if not isinstance(reply, list):
+            raise TypeError(f"Unexpected rate limit script reply: {reply!r}")
+        return reply
+
+    async def take(self, buckets: List[Tuple[str, Policy]]) -> List[Tuple[bool, float]]:
+        if time.monotonic() < self._retry_at:
+            return await self.fallback.take(buckets)
+        args = [str(len(buckets))] + [KEY_PREFIX + key for key, _ in buckets]
+        for _, policy in buckets:
+            args += [repr(policy.rate), repr(policy.burst)]
+        try:
+            admitted, *levels = await self._evaluate(*args)
+            tokens = [float(level) for level in levels]
+        except (OSError, ConnectionError, RedisError, ValueError, TypeError) as e:
+            RATE_LIMIT_BACKEND_ERRORS.inc()
+            logger.error(f"Rate limit store unavailable, using local buckets: {e}")
+            await self.close()
+            self._retry_at = time.monotonic() + 1.0
+            return await self.fallback.take(buckets)
+        if admitted == 1:
+            return [(True, level) for level in tokens]
+        return [(level >= 1, level) for level in tokens]
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await connection.close()
+
+
+class RateLimitMiddleware:
+    """Apply ``rules`` to matching HTTP requests."""
+
+    def __init__(self, app: ASGIApp, rules: List[Rule], store: Optional[BucketStore] = None) -> None:
+        self.app = app
+        self.store = store or MemoryBucketStore()
+        self.rules: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            self.rules.setdefault(rule.method, []).append(rule)
+
+    def _match(self, scope: Scope) -> Optional[Tuple[Rule, Dict[str, str]]]:
+        for rule in self.rules.get(scope["method"], ()):
+            match = rule.pattern.match(scope["path"])
+            if match:
+                return rule, match.groupdict()
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        matched = self._match(scope)
+        if matched is None:
+            await self.app(scope, receive, send)
+            return
+        rule, params = matched
+
+        buckets: List[Tuple[str, Policy]] = []
+        for policy in rule.policies:
+            if policy.key == "client":
+                subject = client_identity(scope)
+            else:
+                subject = params.get("workflow_id") or (
+                    parse_qs(scope.get("query_string", b"").decode()).get("workflow_id", [""])[0]
+                )
+                if not subject:
+                    continue
+            buckets.append((f"{rule.method}:{rule.template}:{policy.key}:{subject}", policy))
+        if not buckets:
+            await self.app(scope, receive, send)
+            return
+
+        results = await self.store.take(buckets)
+        rejected: Optional[Tuple[float, Policy]] = None
+        for (_, policy), (allowed, tokens) in zip(buckets, results):
+            if not allowed and rejected is None:
+                rejected = (tokens, policy)
+                RATE_LIMIT_REJECTIONS.labels(route=rule.template, key=policy.key).inc()
+        tightest = min(
+            ((tokens, policy) for (_, policy), (_, tokens) in zip(buckets, results)), key=lambda item: item[0]
+        )
+
+        tokens, policy = rejected or tightest
+        headers = {
+            "RateLimit-Limit": str(math.floor(policy.burst)),
+            "RateLimit-Remaining": str(math.floor(tokens)),
+            "RateLimit-Reset": str(math.ceil((policy.burst - tokens) / policy.rate)),
+            "RateLimit-Policy": policy.header(),
+        }
+
+        if rejected is not None:
+            retry_after = max(1, math.ceil((1 - tokens) / policy.rate))
+            body = json.dumps({
+                "detail": f"Rate limit exceeded for {policy.key}",
+                "retry_after": retry_after,
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                ] + [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                for name, value in headers.items():
+                    response_headers.append(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -3,8 +3,18 @@
 
 """
 API v1 module.
+
+Router modules are imported on first attribute access so that importing the
+package does not pull in every router and its models.
 """
 
-from . import logs, network, nodes, workflows
+from importlib import import_module
+from typing import Any
+
+__all__ = ["workflows", "nodes", "logs", "network", "analytics"]
+
 
-__all__ = ["workflows", "nodes", "logs", "network"]
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
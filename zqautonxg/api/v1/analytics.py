@@ -0,0 +1,64 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Analytics API router.
+"""
+
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query
+
+from zqautonxg.runtime.analytics import HOUR_RETENTION, MINUTE, analytics
+
+logger = logging.getLogger("zqautonxg.api.analytics")
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_window(window: str) -> int:
+    match = re.fullmatch(r"(\d+)([mhd])", window)
+    if match is None or int(match.group(1)) == 0:
+        raise HTTPException(status_code=400, detail="window must look like 15m, 6h or 7d")
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def _isoformat(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+@router.get("/executions")
+async def get_execution_analytics(
+    workflow_id: Optional[List[UUID]] = Query(None),
+    window: str = "24h",
+    series: bool = False,
+) -> Dict[str, Any]:
+    """Execution counts, success rate and duration percentiles over a window.
+
+    Covers the given workflows (repeat ``workflow_id``), or every workflow
+    with executions in the window. Windows within minute retention use
+    minute buckets, longer ones hour buckets; ``since`` in the response is
+    the start of the first bucket. ``series`` adds one point per bucket.
+    """
+    now = time.time()
+    since = now - min(parse_window(window), HOUR_RETENTION)
+    width = analytics.resolution(since, now)
+    since = since // width * width
+    ids = [str(w) for w in workflow_id] if workflow_id else None
+    result = analytics.query(ids, since, now, width, series)
+    if series:
+        for summary in result["workflows"].values():
+            for point in summary["series"]:
+                point["start"] = _isoformat(point["start"])
+    return {
+        "since": _isoformat(since),
+        "until": _isoformat(now),
+        "resolution": "minute" if width == MINUTE else "hour",
+        **result,
+    }
@@ -8,21 +8,45 @@ Logs API router with WebSocket support.
 import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Gauge
+
+from zqautonxg import events
+from zqautonxg.storage.logstore import entry_time, get_log_store
 
 logger = logging.getLogger("zqautonxg.api.logs")
 router = APIRouter(prefix="/logs", tags=["logs"])
 
-# In-memory log storage (last 1000 entries)
+# Most recent entries; older ones are read from the on-disk log store
+# (LOG_STORE_DIR) when it is configured
 logs_history: List[Dict[str, Any]] = []
 MAX_LOGS_HISTORY = 1000
 
-# Active WebSocket connections
+# Active WebSocket connections (this worker only; events arrive via the bus)
 active_connections: List[WebSocket] = []
 
+# Event bus channel carrying log entries between workers
+LOG_CHANNEL = "logs"
+
+# Ingestion: entries are buffered and flushed to the bus in batches
+LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARN", "ERROR"})
+LEVEL_ALIASES = {"WARNING": "WARN", "CRITICAL": "ERROR", "FATAL": "ERROR"}
+INGEST_BUFFER_SIZE = int(os.getenv("LOG_INGEST_BUFFER_SIZE", 100_000))
+INGEST_BATCH_SIZE = int(os.getenv("LOG_INGEST_BATCH_SIZE", 5000))
+INGEST_FLUSH_INTERVAL = float(os.getenv("LOG_INGEST_FLUSH_MS", 50)) / 1000
+INGEST_MAX_BYTES = int(os.getenv("LOG_INGEST_MAX_BYTES", 16 * 1024 * 1024))
+MAX_REPORTED_ERRORS = 100
+
+LOG_INGEST_ENTRIES = Counter("zqautonxg_log_ingest_entries_total", "Ingested log entries", ["result"])
+LOG_INGEST_BUFFERED = Gauge("zqautonxg_log_ingest_buffered", "Log entries waiting to be flushed")
+
 
 class LogEntry:
     """Log entry model."""
@@ -43,26 +67,220 @@ class LogEntry:
 
 
 async def broadcast_log(log_entry: LogEntry) -> None:
-    """Broadcast log entry to all connected WebSocket clients."""
-    message = json.dumps(log_entry.to_dict())
-    
+    """Publish a log entry to the WebSocket clients of every worker."""
+    await events.bus.publish(LOG_CHANNEL, log_entry.to_dict())
+
+
+async def broadcast_stall(report: Dict[str, Any]) -> None:
+    """Publish an event-loop stall report as a WARN entry."""
+    await broadcast_log(LogEntry(
+        "WARN",
+        f"Event loop blocked for {report['blocked_ms']:.0f}ms at {report['location']}",
+        metadata={"source": "event_loop", **report},
+    ))
+
+
+# Segments being compressed in worker threads
+sealing: Set["asyncio.Task[None]"] = set()
+
+
+async def persist_logs(entries: List[Dict[str, Any]]) -> None:
+    """Append entries to the on-disk store and seal full segments, off the loop."""
+    store = get_log_store()
+    if store is None:
+        return
+    try:
+        ready = await asyncio.to_thread(store.append, entries)
+    except OSError as e:
+        logger.error(f"Could not persist {len(entries)} log entries: {e}")
+        return
+    for path in ready:
+        task = asyncio.create_task(asyncio.to_thread(store.seal, path))
+        sealing.add(task)
+        task.add_done_callback(_sealed)
+
+
+def _sealed(task: "asyncio.Task[None]") -> None:
+    sealing.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Could not seal log segment: {task.exception()}")
+
+
+async def close_log_store() -> None:
+    """Wait for segments being sealed and release the store."""
+    if sealing:
+        await asyncio.gather(*sealing, return_exceptions=True)
+    store = get_log_store()
+    if store is not None:
+        store.close()
+
+
+async def deliver_logs(entries: List[Dict[str, Any]]) -> None:
+    """Event bus fan-in: store a batch of entries and send it to local clients."""
+    await persist_logs(entries)
+
     # Store in history
-    logs_history.append(log_entry.to_dict())
-    if len(logs_history) > MAX_LOGS_HISTORY:
-        logs_history.pop(0)
+    logs_history.extend(entries)
+    overflow = len(logs_history) - MAX_LOGS_HISTORY
+    if overflow > 0:
+        del logs_history[:overflow]
+    
+    if not active_connections:
+        return
     
-    # Broadcast to all connections
+    # Serialize once per batch, then broadcast to all connections
+    messages = [json.dumps(entry) for entry in entries]
     disconnected = []
     for connection in active_connections:
         try:
-            await connection.send_text(message)
+            for message in messages:
+                await connection.send_text(message)
         except Exception as e:
             logger.error(f"Error broadcasting to connection: {e}")
             disconnected.append(connection)
     
     # Remove disconnected clients
     for connection in disconnected:
-        active_connections.remove(connection)
+        if connection in active_connections:
+            active_connections.remove(connection)
+
+
+events.bus.subscribe(LOG_CHANNEL, deliver_logs)
+
+
+class LogIngestBuffer:
+    """Write-behind buffer between ``POST /logs/ingest`` and the log store.
+
+    Requests only append to the buffer; a background task flushes it every
+    ``flush_interval`` seconds (or once ``batch_size`` entries are waiting)
+    as one batch on the event bus, so each flush is a single store append
+    and broadcast. A full buffer refuses new batches instead of growing.
+    """
+
+    def __init__(self, capacity: int, batch_size: int, flush_interval: float) -> None:
+        self.capacity = capacity
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.entries: Deque[Dict[str, Any]] = deque()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._batch_full: Optional[asyncio.Event] = None
+
+    def offer(self, entries: List[Dict[str, Any]]) -> bool:
+        """Queue ``entries`` for writing; ``False`` if they do not fit."""
+        if len(self.entries) + len(entries) > self.capacity:
+            return False
+        self.entries.extend(entries)
+        LOG_INGEST_BUFFERED.set(len(self.entries))
+        if self._task is None or self._task.done():
+            # The flusher runs while there is something to write, then exits
+            self._batch_full = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop())
+        elif len(self.entries) >= self.batch_size and self._batch_full is not None:
+            self._batch_full.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write out everything buffered now; returns the number of entries."""
+        written = 0
+        while self.entries:
+            count = min(len(self.entries), self.batch_size)
+            batch = [self.entries.popleft() for _ in range(count)]
+            LOG_INGEST_BUFFERED.set(len(self.entries))
+            await events.bus.publish_many(LOG_CHANNEL, batch)
+            written += count
+        return written
+
+    async def _flush_loop(self) -> None:
+        batch_full = self._batch_full
+        while self.entries:
+            if len(self.entries) < self.batch_size and batch_full is not None:
+                try:
+                    await asyncio.wait_for(batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                batch_full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Log ingest flush failed: {e}")
+                await asyncio.sleep(self.flush_interval)
+
+    async def stop(self) -> None:
+        """Flush what is buffered now and wait for the flusher to finish."""
+        if self._task is not None:
+            if self._batch_full is not None:
+                self._batch_full.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+ingest_buffer = LogIngestBuffer(INGEST_BUFFER_SIZE, INGEST_BATCH_SIZE, INGEST_FLUSH_INTERVAL)
+
+
+def validate_entry(raw: Any, received_at: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Normalize one ingested entry, or explain why it was rejected."""
+    if not isinstance(raw, dict):
+        return None, "entry must be an object"
+    message = raw.get("message")
+    if not isinstance(message, str) or not message:
+        return None, "message must be a non-empty string"
+    level = raw.get("level", "INFO")
+    if not isinstance(level, str):
+        return None, "level must be a string"
+    level = level.upper()
+    level = LEVEL_ALIASES.get(level, level)
+    if level not in LOG_LEVELS:
+        return None, f"unknown level {raw.get('level')!r}"
+    metadata = raw.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        return None, "metadata must be an object"
+    timestamp = raw.get("timestamp") or received_at
+    if not isinstance(timestamp, str):
+        return None, "timestamp must be an ISO 8601 string"
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return None, "timestamp must be an ISO 8601 string"
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    if moment.timestamp() > time.time():
+        # A client clock running ahead would write entries retention never expires
+        timestamp = received_at
+    return {"timestamp": timestamp, "level": level, "message": message, "metadata": metadata}, None
+
+
+def parse_ingest_body(body: bytes, content_type: str) -> List[Tuple[int, Any, Optional[str]]]:
+    """Split a request body into ``(index, raw entry, parse error)`` items."""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        items: List[Tuple[int, Any, Optional[str]]] = []
+        for index, line in enumerate(body.splitlines()):
+            if not line.strip():
+                continue
+            try:
+                items.append((index, json.loads(line), None))
+            except ValueError as e:
+                items.append((index, None, f"invalid JSON: {e}"))
+        return items
+    try:
+        document = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+    if isinstance(document, dict):
+        document = [document]
+    if not isinstance(document, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of log entries or NDJSON")
+    return [(index, raw, None) for index, raw in enumerate(document)]
+
+
+async def close_connections(code: int = 1001) -> None:
+    """Close every log WebSocket client (1001 = going away)."""
+    for connection in list(active_connections):
+        try:
+            await connection.close(code=code)
+        except Exception as e:
+            logger.debug(f"Error closing connection: {e}")
+    active_connections.clear()
 
 
 @router.websocket("/ws")
@@ -95,31 +313,126 @@ async def logs_websocket(websocket: WebSocket) -> None:
             active_connections.remove(websocket)
 
 
-@router.get("/history")
-async def get_logs_history(limit: int = 100) -> List[Dict[str, Any]]:
-    """Get historical logs."""
-    return logs_history[-limit:]
+@router.post("/ingest", status_code=202)
+async def ingest_logs(request: Request) -> Any:
+    """Ingest a batch of log entries (JSON array or NDJSON).
 
+    Valid entries are accepted even if others in the batch are rejected. A
+    full ingest buffer answers ``503`` with ``Retry-After`` and accepts
+    nothing, so the client can resend the whole batch.
+    """
+    length = request.headers.get("content-length")
+    if length is not None:
+        try:
+            declared = int(length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+        if declared > INGEST_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Batch larger than {INGEST_MAX_BYTES} bytes")
+    body = await request.body()
+    if len(body) > INGEST_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Batch larger than {INGEST_MAX_BYTES} bytes")
 
-@router.post("/query")
-async def query_logs(
-    level: str = None,
-    search: str = None,
-    limit: int = 100
+    received_at = datetime.utcnow().isoformat()
+    accepted: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    rejected = 0
+    for index, raw, error in parse_ingest_body(body, request.headers.get("content-type", "")):
+        entry = None
+        if error is None:
+            entry, error = validate_entry(raw, received_at)
+        if entry is not None:
+            accepted.append(entry)
+            continue
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"index": index, "error": error})
+
+    if accepted and not ingest_buffer.offer(accepted):
+        LOG_INGEST_ENTRIES.labels(result="throttled").inc(len(accepted) + rejected)
+        return JSONResponse(
+            status_code=503,
+            headers={"Retry-After": "1"},
+            content={"detail": "Log ingest buffer is full", "accepted": 0, "rejected": len(accepted) + rejected},
+        )
+
+    LOG_INGEST_ENTRIES.labels(result="accepted").inc(len(accepted))
+    LOG_INGEST_ENTRIES.labels(result="rejected").inc(rejected)
+    return {"accepted": len(accepted), "rejected": rejected, "errors": errors}
+
+
+def parse_time(value: Optional[str], name: str) -> Optional[float]:
+    if value is None:
+        return None
+    moment = entry_time({"timestamp": value})
+    if moment == 0.0:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO 8601 timestamp")
+    return moment
+
+
+def recent_logs(
+    limit: int,
+    level: Optional[str] = None,
+    search: Optional[str] = None,
+    since: Optional[float] = None,
+    before: Optional[float] = None,
 ) -> List[Dict[str, Any]]:
-    """Query logs with filters."""
+    """Newest ``limit`` matching entries held in memory, oldest first."""
     filtered_logs = logs_history
-    
+
     if level:
-        filtered_logs = [log for log in filtered_logs if log["level"] == level.upper()]
-    
+        filtered_logs = [log for log in filtered_logs if log["level"] == level]
+
     if search:
         filtered_logs = [
             log for log in filtered_logs
             if search.lower() in log["message"].lower()
         ]
-    
-    return filtered_logs[-limit:]
+
+    if since is not None or before is not None:
+        filtered_logs = [
+            log for log in filtered_logs
+            if (since is None or entry_time(log) >= since) and (before is None or entry_time(log) < before)
+        ]
+
+    return filtered_logs[-limit:] if limit > 0 else []
+
+
+async def read_logs(limit: int, **filters: Any) -> List[Dict[str, Any]]:
+    """Serve from memory when it has enough matches, else page into the log store."""
+    matches = recent_logs(limit, **filters)
+    store = get_log_store()
+    if len(matches) >= limit or store is None:
+        return matches
+    return await asyncio.to_thread(store.read, limit, **filters)
+
+
+@router.get("/history")
+async def get_logs_history(limit: int = 100, before: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get historical logs.
+
+    Pass the ``timestamp`` of the oldest entry received as ``before`` to page
+    further back.
+    """
+    return await read_logs(limit, before=parse_time(before, "before"))
+
+
+@router.post("/query")
+async def query_logs(
+    level: str = None,
+    search: str = None,
+    limit: int = 100,
+    since: Optional[str] = None,
+    before: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Query logs with filters."""
+    return await read_logs(
+        limit,
+        level=level.upper() if level else None,
+        search=search,
+        since=parse_time(since, "since"),
+        before=parse_time(before, "before"),
+    )
 
 
 # Background task to generate sample logs for demo
@@ -5,6 +5,7 @@
 Network topology API router.
 """
 
+import json
 import logging
 import random
 from typing import Any, Dict, List
@@ -12,12 +13,45 @@ from uuid import UUID, uuid4
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from zqautonxg import events
+
 logger = logging.getLogger("zqautonxg.api.network")
 router = APIRouter(prefix="/network", tags=["network"])
 
-# Active WebSocket connections for topology updates
+# Active WebSocket connections for topology updates (this worker only)
 topology_connections: List[WebSocket] = []
 
+# Event bus channel carrying topology changes between workers
+TOPOLOGY_CHANNEL = "topology"
+
+
+async def broadcast_topology(update: Dict[str, Any]) -> None:
+    """Publish a topology change to the WebSocket clients of every worker."""
+    await events.bus.publish(TOPOLOGY_CHANNEL, update)
+
+
+async def deliver_topology(updates: List[Dict[str, Any]]) -> None:
+    """Event bus fan-in: send a batch of topology changes to local clients."""
+    if not topology_connections:
+        return
+    
+    messages = [json.dumps(update) for update in updates]
+    disconnected = []
+    for connection in topology_connections:
+        try:
+            for message in messages:
+                await connection.send_text(message)
+        except Exception as e:
+            logger.error(f"Error broadcasting topology update: {e}")
+            disconnected.append(connection)
+    
+    for connection in disconnected:
+        if connection in topology_connections:
+            topology_connections.remove(connection)
+
+
+events.bus.subscribe(TOPOLOGY_CHANNEL, deliver_topology)
+
 
 @router.get("/topology")
 async def get_network_topology() -> Dict[str, Any]:
@@ -71,6 +105,16 @@ async def get_network_topology() -> Dict[str, Any]:
     }
 
 
+async def close_connections(code: int = 1001) -> None:
+    """Close every topology WebSocket client (1001 = going away)."""
+    for connection in list(topology_connections):
+        try:
+            await connection.close(code=code)
+        except Exception as e:
+            logger.debug(f"Error closing topology connection: {e}")
+    topology_connections.clear()
+
+
 @router.websocket("/ws")
 async def network_topology_websocket(websocket: WebSocket) -> None:
     """WebSocket endpoint for real-time network topology updates."""
@@ -80,7 +124,6 @@ async def network_topology_websocket(websocket: WebSocket) -> None:
     logger.info(f"New topology WebSocket connection. Total: {len(topology_connections)}")
     
     # Send initial topology
-    import json
     topology = await get_network_topology()
     await websocket.send_text(json.dumps(topology))
     
@@ -104,12 +147,14 @@ async def deploy_bridge(name: str, region: str) -> Dict[str, str]:
     bridge_id = str(uuid4())
     logger.info(f"Deploying bridge {name} in {region}")
     
-    return {
+    bridge = {
         "bridge_id": bridge_id,
         "name": name,
         "region": region,
         "status": "deploying"
     }
+    await broadcast_topology({"type": "bridge_deployed", **bridge})
+    return bridge
 
 
 @router.get("/nodes/{node_id}/metrics")
@@ -6,12 +6,18 @@ Nodes API router.
 """
 
 import logging
-from typing import Any, Dict
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Mapping, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import ValidationError
 
 from zqautonxg.models.node import (
+    BulkConfigUpdate,
+    BulkToggle,
     ConnectorConfig,
     NodeConfig,
     NodeStats,
@@ -22,18 +28,228 @@ from zqautonxg.models.node import (
 logger = logging.getLogger("zqautonxg.api.nodes")
 router = APIRouter(prefix="/nodes", tags=["nodes"])
 
+# Largest number of nodes a single bulk request may change
+BULK_MAX_NODES = int(os.getenv("NODE_BULK_MAX", 10_000))
+MAX_REPORTED_MISSING = 100
+
+
+class NodeRegistry(Mapping[UUID, NodeConfig]):
+    """Node configurations indexed by type and enabled state.
+
+    Each type keeps an ordered id set per state, so filtered listings visit
+    only matching nodes and counts come from set sizes: the summary costs
+    O(types), not O(nodes). Changes must go through the registry to keep the
+    indexes consistent; bulk changes are checked in full before any node is
+    modified, so a batch is applied entirely or not at all.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: Dict[UUID, NodeConfig] = {}
+        self.index: Dict[str, Dict[bool, Dict[UUID, None]]] = {}
+
+    def __getitem__(self, node_id: UUID) -> NodeConfig:
+        return self.nodes[node_id]
+
+    def __iter__(self) -> Iterator[UUID]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def put(self, node: NodeConfig) -> None:
+        old = self.nodes.get(node.id)
+        if old is not None:
+            self._unindex(old)
+        self.nodes[node.id] = node
+        self.index.setdefault(node.type, {True: {}, False: {}})[node.enabled][node.id] = None
+
+    def remove(self, node_id: UUID) -> NodeConfig:
+        node = self.nodes.pop(node_id)
+        self._unindex(node)
+        return node
+
+    def _unindex(self, node: NodeConfig) -> None:
+        states = self.index[node.type]
+        del states[node.enabled][node.id]
+        if not states[True] and not states[False]:
+            del self.index[node.type]
+
+    def clear(self) -> None:
+        self.nodes.clear()
+        self.index.clear()
+
+    def set_enabled(self, node_id: UUID, enabled: Optional[bool] = None) -> NodeConfig:
+        """Enable or disable a node; ``None`` flips it."""
+        node = self.nodes[node_id]
+        value = not node.enabled if enabled is None else enabled
+        if value != node.enabled:
+            states = self.index[node.type]
+            del states[node.enabled][node_id]
+            node.enabled = value
+            states[value][node_id] = None
+        node.updated_at = datetime.utcnow()
+        return node
+
+    def configure(self, node_id: UUID, config: Dict[str, Any], merge: bool = False) -> NodeConfig:
+        """Replace (or merge into) a node's configuration, creating the node if needed."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = NodeConfig(id=node_id, type=config.get("type", "generic"), config=config)
+            self.put(node)
+            return node
+        node.config = {**node.config, **config} if merge else config
+        node.updated_at = datetime.utcnow()
+        return node
+
+    def missing(self, node_ids: List[UUID]) -> List[UUID]:
+        return [node_id for node_id in node_ids if node_id not in self.nodes]
+
+    def toggle_many(self, node_ids: List[UUID], enabled: Optional[bool] = None) -> List[NodeConfig]:
+        """Apply ``set_enabled`` to every node, once each; all ids must exist."""
+        missing = self.missing(node_ids)
+        if missing:
+            raise KeyError(missing)
+        return [self.set_enabled(node_id, enabled) for node_id in dict.fromkeys(node_ids)]
+
+    def configure_many(self, configs: Dict[UUID, Dict[str, Any]], merge: bool = False) -> int:
+        """Apply ``configure`` to every node; returns how many nodes were created.
+
+        Every resulting node is built and validated before any is stored, so
+        a ``ValidationError`` leaves the registry unchanged.
+        """
+        now = datetime.utcnow()
+        built = []
+        for node_id, config in configs.items():
+            node = self.nodes.get(node_id)
+            if node is None:
+                built.append(NodeConfig(id=node_id, type=config.get("type", "generic"), config=config))
+            else:
+                built.append(NodeConfig(
+                    **{**node.model_dump(), "config": {**node.config, **config} if merge else config, "updated_at": now}
+                ))
+        created = len(self.missing(list(configs)))
+        for node in built:
+            self.put(node)
+        return created
+
+    def select(
+        self, node_type: Optional[str] = None, enabled: Optional[bool] = None
+    ) -> Iterator[NodeConfig]:
+        """Nodes matching the filters, grouped by type and state when filtered."""
+        if node_type is None and enabled is None:
+            yield from self.nodes.values()
+            return
+        types = [node_type] if node_type is not None else list(self.index)
+        for name in types:
+            states = self.index.get(name)
+            if states is None:
+                continue
+            for state in ([enabled] if enabled is not None else [True, False]):
+                for node_id in states[state]:
+                    yield self.nodes[node_id]
+
+    def count(self, node_type: Optional[str] = None, enabled: Optional[bool] = None) -> int:
+        if node_type is None and enabled is None:
+            return len(self.nodes)
+        types = [node_type] if node_type is not None else list(self.index)
+        return sum(
+            len(self.index[name][state])
+            for name in types if name in self.index
+            for state in ([enabled] if enabled is not None else [True, False])
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        by_type = {
+            name: {"enabled": len(states[True]), "disabled": len(states[False])}
+            for name, states in self.index.items()
+        }
+        enabled = sum(counts["enabled"] for counts in by_type.values())
+        return {
+            "total": len(self.nodes),
+            "enabled": enabled,
+            "disabled": len(self.nodes) - enabled,
+            "by_type": by_type,
+        }
+
+
 # In-memory storage
-nodes_db: Dict[UUID, NodeConfig] = {}
+nodes_db = NodeRegistry()
 node_stats_db: Dict[UUID, NodeStats] = {}
 
 
+def _check_bulk_size(count: int) -> None:
+    if count > BULK_MAX_NODES:
+        raise HTTPException(
+            status_code=413, detail=f"Bulk requests may change at most {BULK_MAX_NODES} nodes"
+        )
+
+
 @router.get("/status")
-async def get_all_node_statuses() -> Dict[str, str]:
-    """Get status of all nodes."""
-    return {
-        str(node_id): "enabled" if node.enabled else "disabled"
-        for node_id, node in nodes_db.items()
-    }
+async def get_all_node_statuses(
+    response: Response,
+    type: Optional[str] = None,
+    enabled: Optional[bool] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, str]:
+    """Get status of nodes, optionally filtered by type and state.
+
+    Returns every matching node unless ``offset``/``limit`` select a page;
+    ``X-Total-Count`` holds the number of matching nodes.
+    """
+    response.headers["X-Total-Count"] = str(nodes_db.count(type, enabled))
+    start = max(offset, 0)
+    page = islice(nodes_db.select(type, enabled), start, None if limit is None else start + max(limit, 0))
+    return {str(node.id): "enabled" if node.enabled else "disabled" for node in page}
+
+
+@router.get("/summary")
+async def get_node_summary() -> Dict[str, Any]:
+    """Node counts in total, per state and per type."""
+    return nodes_db.summary()
+
+
+@router.post("/bulk/toggle")
+async def bulk_toggle_nodes(body: BulkToggle) -> Dict[str, int]:
+    """Enable, disable or flip many nodes in one request.
+
+    Nothing is changed if any of the nodes does not exist.
+    """
+    _check_bulk_size(len(body.node_ids))
+    try:
+        changed = nodes_db.toggle_many(body.node_ids, body.enabled)
+    except KeyError as e:
+        missing = e.args[0]
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "message": f"{len(missing)} node(s) not found",
+                "missing": [str(node_id) for node_id in missing[:MAX_REPORTED_MISSING]],
+            },
+        )
+    enabled = sum(1 for node in changed if node.enabled)
+    logger.info(f"Bulk toggled {len(changed)} node(s)")
+    return {"updated": len(changed), "enabled": enabled, "disabled": len(changed) - enabled}
+
+
+@router.put("/bulk/config")
+async def bulk_update_node_config(body: BulkConfigUpdate) -> Dict[str, int]:
+    """Update the configuration of many nodes in one request.
+
+    Nodes that do not exist yet are created, as with ``PUT /{node_id}/config``.
+    Nothing is changed if any resulting node is invalid.
+    """
+    if body.node_ids and body.config is None:
+        raise HTTPException(status_code=422, detail="config is required with node_ids")
+    configs: Dict[UUID, Dict[str, Any]] = dict.fromkeys(body.node_ids, body.config or {})
+    configs.update(body.updates)
+    _check_bulk_size(len(configs))
+    try:
+        created = nodes_db.configure_many(configs, body.merge)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+    logger.info(f"Bulk updated config for {len(configs)} node(s)")
+    return {"updated": len(configs) - created, "created": created}
 
 
 @router.post("/toggle/{node_id}")
@@ -42,8 +258,7 @@ async def toggle_node(node_id: UUID) -> Dict[str, bool]:
     if node_id not in nodes_db:
         raise HTTPException(status_code=404, detail="Node not found")
     
-    node = nodes_db[node_id]
-    node.enabled = not node.enabled
+    node = nodes_db.set_enabled(node_id)
     
     logger.info(f"Toggled node {node_id} to {'enabled' if node.enabled else 'disabled'}")
     return {"enabled": node.enabled}
@@ -60,15 +275,8 @@ async def get_node_config(node_id: UUID) -> NodeConfig:
 @router.put("/{node_id}/config")
 async def update_node_config(node_id: UUID, config: Dict[str, Any]) -> NodeConfig:
     """Update node configuration."""
-    if node_id not in nodes_db:
-        # Create new node if it doesn't exist
-        node = NodeConfig(id=node_id, type=config.get("type", "generic"), config=config)
-        nodes_db[node_id] = node
-    else:
-        node = nodes_db[node_id]
-        node.config = config
-        from datetime import datetime
-        node.updated_at = datetime.utcnow()
+    # Creates the node if it doesn't exist
+    node = nodes_db.configure(node_id, config)
     
     logger.info(f"Updated config for node {node_id}")
     return node
@@ -5,11 +5,18 @@
 Workflows API router.
 """
 
+import asyncio
+import json
 import logging
-from typing import Dict, List
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
 from zqautonxg.models.workflow import (
     Workflow,
@@ -17,14 +24,142 @@ from zqautonxg.models.workflow import (
     WorkflowExecution,
     WorkflowUpdate,
 )
+from zqautonxg.observability.tracing import otlp_payload
+from zqautonxg.runtime import progress
+from zqautonxg.runtime.analytics import analytics
+from zqautonxg.runtime.executor import ExecutionTrace, run_workflow
+from zqautonxg.runtime.queue import ExecutionQueue, Job, QueueWorker
+from zqautonxg.runtime.versions import VersionHistory, WorkflowVersion
+from zqautonxg.storage import StorageError, get_database
 
 logger = logging.getLogger("zqautonxg.api.workflows")
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
-# In-memory storage (replace with database in production)
+# In-memory storage (replace with database in production). ``workflows_db``
+# holds the head version of each workflow; stored workflows are replaced on
+# change, never mutated, since running executions may still use them.
 workflows_db: Dict[UUID, Workflow] = {}
+workflow_versions: Dict[UUID, VersionHistory] = {}
 executions_db: Dict[UUID, List[WorkflowExecution]] = {}
 
+# Per-node spans of recent executions, oldest evicted first
+execution_traces: "OrderedDict[UUID, ExecutionTrace]" = OrderedDict()
+MAX_EXECUTION_TRACES = 1000
+
+# Comment line sent on idle event streams so proxies keep them open
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Executions running in this process, awaited on graceful shutdown
+inflight_executions: Set[UUID] = set()
+
+# "inline" runs executions inside the request; "queue" hands them to the
+# shared execution queue so every instance's worker can pick them up
+EXECUTION_MODE = os.getenv("EXECUTION_MODE", "inline")
+QUEUE_CONCURRENCY = int(os.getenv("QUEUE_CONCURRENCY", 8))
+
+execution_queue: Optional[ExecutionQueue] = None
+queue_worker: Optional[QueueWorker] = None
+
+
+async def start_queue_worker() -> None:
+    """Open the execution queue and start claiming jobs (queue mode only)."""
+    global execution_queue, queue_worker
+    if EXECUTION_MODE != "queue":
+        return
+    database = get_database()
+    if database is None:
+        raise StorageError("EXECUTION_MODE=queue requires STORAGE_URL to be set")
+    execution_queue = ExecutionQueue(database)
+    queue_worker = QueueWorker(execution_queue, run_queued_execution, concurrency=QUEUE_CONCURRENCY)
+    await queue_worker.start()
+
+
+async def stop_queue_worker(timeout: float) -> None:
+    """Stop claiming jobs and give running ones ``timeout`` seconds to finish."""
+    global queue_worker
+    if queue_worker is not None:
+        await queue_worker.stop(timeout)
+        queue_worker = None
+
+
+async def drain_executions(timeout: float) -> int:
+    """Wait up to ``timeout`` seconds for in-flight executions to finish.
+
+    Returns the number of executions still running when the timeout expired.
+    """
+    deadline = time.monotonic() + timeout
+    while inflight_executions and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    return len(inflight_executions)
+
+
+def _record_trace(execution: WorkflowExecution, trace: ExecutionTrace) -> None:
+    execution_traces[execution.id] = trace
+    while len(execution_traces) > MAX_EXECUTION_TRACES:
+        execution_traces.popitem(last=False)
+    logger.info(
+        f"Execution {execution.id} finished with status {execution.status} "
+        f"in {execution.duration_ms}ms"
+    )
+
+
+async def run_queued_execution(job: Job) -> Dict[str, Any]:
+    """Queue worker handler: run the workflow snapshot carried by ``job``."""
+    workflow = Workflow.model_validate(job.payload["workflow"])
+    execution = WorkflowExecution.model_validate(job.payload["execution"])
+    execution.status = "running"
+    inflight_executions.add(execution.id)
+    logger.info(f"Claimed execution {execution.id} (attempt {job.attempts})")
+    try:
+        trace = await run_workflow(workflow, execution)
+    finally:
+        inflight_executions.discard(execution.id)
+    _record_trace(execution, trace)
+    return {
+        "status": execution.status,
+        "result": execution.model_dump(mode="json"),
+        "error": execution.error,
+    }
+
+
+def _sync_from_queue(queue: ExecutionQueue, executions: List[WorkflowExecution]) -> None:
+    """Bring unfinished executions up to date with their queue jobs."""
+    for index, execution in enumerate(executions):
+        if execution.status not in ("pending", "running"):
+            continue
+        job = queue.get(str(execution.id))
+        if job is None:
+            continue
+        if job["status"] == "leased":
+            execution.status = "running"
+        elif job["result"]:
+            executions[index] = WorkflowExecution.model_validate(job["result"])
+        elif job["status"] == "failed":
+            execution.status = "failed"
+            execution.error = job["error"]
+
+
+def _history(workflow_id: UUID) -> VersionHistory:
+    history = workflow_versions.get(workflow_id)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    return history
+
+
+def _version(history: VersionHistory, number: int) -> WorkflowVersion:
+    version = history.get(number)
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"Version {number} not found")
+    return version
+
+
+def _publish(history: VersionHistory, version: WorkflowVersion) -> Workflow:
+    """Make ``version`` the stored head of its workflow."""
+    workflow = workflows_db[history.workflow_id]
+    if workflow.version != version.number:
+        workflow = workflows_db[history.workflow_id] = history.workflow(version)
+    return workflow
+
 
 @router.post("", response_model=Workflow, status_code=201)
 async def create_workflow(workflow: WorkflowCreate) -> Workflow:
@@ -35,6 +170,11 @@ async def create_workflow(workflow: WorkflowCreate) -> Workflow:
         nodes=workflow.nodes,
         edges=workflow.edges,
     )
+    try:
+        history = VersionHistory(new_workflow)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    workflow_versions[new_workflow.id] = history
     workflows_db[new_workflow.id] = new_workflow
     logger.info(f"Created workflow {new_workflow.id}: {new_workflow.name}")
     return new_workflow
@@ -56,21 +196,16 @@ async def list_workflows() -> List[Workflow]:
 
 @router.put("/{workflow_id}", response_model=Workflow)
 async def update_workflow(workflow_id: UUID, update: WorkflowUpdate) -> Workflow:
-    """Update an existing workflow."""
-    if workflow_id not in workflows_db:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow = workflows_db[workflow_id]
-    update_data = update.model_dump(exclude_unset=True)
-    
-    for field, value in update_data.items():
-        setattr(workflow, field, value)
+    """Update an existing workflow, recording a new version if anything changed."""
+    history = _history(workflow_id)
+    changes = {field: getattr(update, field) for field in update.model_fields_set}
+    try:
+        version = history.commit(**changes)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     
-    from datetime import datetime
-    workflow.updated_at = datetime.utcnow()
-    
-    logger.info(f"Updated workflow {workflow_id}")
-    return workflow
+    logger.info(f"Updated workflow {workflow_id} (version {version.number})")
+    return _publish(history, version)
 
 
 @router.delete("/{workflow_id}", status_code=204)
@@ -80,44 +215,75 @@ async def delete_workflow(workflow_id: UUID) -> None:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
     del workflows_db[workflow_id]
+    workflow_versions.pop(workflow_id, None)
     if workflow_id in executions_db:
-        del executions_db[workflow_id]
+        for execution in executions_db.pop(workflow_id):
+            execution_traces.pop(execution.id, None)
+    analytics.forget(str(workflow_id))
     
     logger.info(f"Deleted workflow {workflow_id}")
 
 
 @router.post("/execute", response_model=WorkflowExecution, status_code=202)
-async def execute_workflow(workflow_id: UUID) -> WorkflowExecution:
-    """Execute a workflow in test mode."""
+async def execute_workflow(workflow_id: UUID, version: Optional[int] = None) -> WorkflowExecution:
+    """Execute a workflow in test mode.
+
+    Runs the current version unless ``version`` names a retained earlier
+    one; the execution records the version it ran. With
+    ``EXECUTION_MODE=queue`` the execution is enqueued and returned as
+    ``pending``; poll the workflow history for its outcome. Inline mode
+    answers only once the run has finished, so a client that wants live
+    progress must find the execution id in the workflow history (or use
+    queue mode).
+    """
     if workflow_id not in workflows_db:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    execution = WorkflowExecution(workflow_id=workflow_id, status="running")
+    workflow = workflows_db[workflow_id]
+    if version is not None and version != workflow.version:
+        history = workflow_versions[workflow_id]
+        workflow = history.workflow(_version(history, version))
+    
+    queue = execution_queue if EXECUTION_MODE == "queue" else None
+    execution = WorkflowExecution(
+        workflow_id=workflow_id,
+        workflow_version=workflow.version,
+        status="pending" if queue is not None else "running",
+    )
     
     if workflow_id not in executions_db:
         executions_db[workflow_id] = []
     executions_db[workflow_id].append(execution)
     
+    if queue is not None:
+        payload = {
+            "workflow": workflow.model_dump(mode="json"),
+            "execution": execution.model_dump(mode="json"),
+        }
+        await queue.database.run(queue.enqueue, str(execution.id), str(workflow_id), payload)
+        if queue_worker is not None:
+            queue_worker.notify()
+        logger.info(f"Queued execution {execution.id} for workflow {workflow_id}")
+        return execution
+    
+    inflight_executions.add(execution.id)
+    
     logger.info(f"Started execution {execution.id} for workflow {workflow_id}")
     
-    # Simulate execution (in production, this would be async)
-    from datetime import datetime
-    execution.status = "success"
-    execution.completed_at = datetime.utcnow()
-    execution.duration_ms = 1250
-    execution.result = {"status": "completed", "nodes_executed": len(workflows_db[workflow_id].nodes)}
+    try:
+        trace = await run_workflow(workflow, execution)
+    finally:
+        inflight_executions.discard(execution.id)
     
+    _record_trace(execution, trace)
     return execution
 
 
 @router.post("/activate")
 async def activate_workflow(workflow_id: UUID) -> Dict[str, str]:
     """Activate a workflow for production."""
-    if workflow_id not in workflows_db:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    workflow = workflows_db[workflow_id]
-    workflow.status = "published"
+    history = _history(workflow_id)
+    _publish(history, history.commit(status="published"))
     
     logger.info(f"Activated workflow {workflow_id}")
     return {"status": "activated", "workflow_id": str(workflow_id)}
@@ -129,4 +295,128 @@ async def get_workflow_history(workflow_id: UUID) -> List[WorkflowExecution]:
     if workflow_id not in workflows_db:
         raise HTTPException(status_code=404, detail="Workflow not found")
     
-    return executions_db.get(workflow_id, [])
+    executions = executions_db.get(workflow_id, [])
+    if execution_queue is not None and executions:
+        await execution_queue.database.run(_sync_from_queue, execution_queue, executions)
+    return executions
+
+
+@router.get("/{workflow_id}/versions")
+async def list_workflow_versions(workflow_id: UUID) -> List[Dict[str, Any]]:
+    """List the retained versions of a workflow, oldest first."""
+    return [version.summary() for version in _history(workflow_id).versions.values()]
+
+
+@router.get("/{workflow_id}/versions/{number}", response_model=Workflow)
+async def get_workflow_version(workflow_id: UUID, number: int) -> Workflow:
+    """Get a workflow as it was at version ``number``."""
+    history = _history(workflow_id)
+    version = _version(history, number)
+    if version is history.head:
+        return workflows_db[workflow_id]
+    return history.workflow(version)
+
+
+@router.get("/{workflow_id}/versions/{number}/diff")
+async def diff_workflow_versions(
+    workflow_id: UUID, number: int, base: Optional[int] = None
+) -> Dict[str, Any]:
+    """Changes from version ``base`` (default: the one before) to version ``number``."""
+    history = _history(workflow_id)
+    new = _version(history, number)
+    old = _version(history, number - 1 if base is None else base)
+    return jsonable_encoder(history.diff(old, new))
+
+
+@router.post("/{workflow_id}/versions/{number}/restore", response_model=Workflow)
+async def restore_workflow_version(workflow_id: UUID, number: int) -> Workflow:
+    """Roll back: record a new version identical to version ``number``."""
+    history = _history(workflow_id)
+    _version(history, number)
+    version = history.restore(number)
+    logger.info(f"Restored workflow {workflow_id} to version {number} (version {version.number})")
+    return _publish(history, version)
+
+
+@router.get("/{workflow_id}/executions/{execution_id}/trace")
+async def get_execution_trace(
+    workflow_id: UUID, execution_id: UUID, format: str = "json"
+) -> Dict[str, Any]:
+    """Get per-node spans and the critical path of an execution.
+
+    ``format=otlp`` returns the spans as an OTLP/JSON export request.
+    """
+    trace = execution_traces.get(execution_id)
+    if trace is None or trace.workflow_id != workflow_id:
+        raise HTTPException(status_code=404, detail="Execution trace not found")
+    if format == "otlp":
+        return otlp_payload(trace.spans)
+    return trace.to_dict()
+
+
+def _format_event(event_id: int, event: str, data: Dict[str, Any]) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/{workflow_id}/executions/{execution_id}/events")
+async def stream_execution_events(
+    workflow_id: UUID,
+    execution_id: UUID,
+    last_event_id: Optional[int] = Header(None),
+) -> StreamingResponse:
+    """Stream execution progress as Server-Sent Events.
+
+    Emits ``execution_started``, ``node_started``, ``node_finished`` and
+    ``execution_finished`` and closes after the last one, or early if the
+    execution's buffer is evicted. Reconnecting clients resume after the
+    ``Last-Event-ID`` they send.
+    """
+    events = progress.get_events(str(execution_id))
+    if events is None:
+        executions = executions_db.get(workflow_id, [])
+        if execution_queue is not None and executions:
+            await execution_queue.database.run(_sync_from_queue, execution_queue, executions)
+        execution = next((e for e in executions if e.id == execution_id), None)
+        if execution is None:
+            raise HTTPException(status_code=404, detail="Execution not found")
+        if execution.status not in ("pending", "running"):
+            # Finished and its events evicted (or never seen here): report the outcome
+            final = {
+                "id": (last_event_id or 0) + 1,
+                "event": progress.FINAL_EVENT,
+                "execution_id": str(execution_id),
+                "workflow_id": str(workflow_id),
+                "status": execution.status,
+                "duration_ms": execution.duration_ms,
+                "error": execution.error,
+            }
+            return StreamingResponse(
+                iter([_format_event(final["id"], progress.FINAL_EVENT, final)]),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+        # Queued but not started yet: wait for its first event
+        events = progress.get_events(str(execution_id), create=True)
+    elif events.events and events.events[0][2]["workflow_id"] != str(workflow_id):
+        raise HTTPException(status_code=404, detail="Execution not found")
+
+    async def stream():
+        last = last_event_id or 0
+        while True:
+            changed = events.changed()
+            for event_id, event, data in events.since(last):
+                last = event_id
+                yield _format_event(event_id, event, data)
+            if (events.finished or events.closed) and last >= events.last_id:
+                # Evicted buffers get no more events; a reconnect reports the outcome
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,94 +5,106 @@
 import asyncio
 import logging
 import os
+import sys
 import time
-from typing import Any
+from contextlib import asynccontextmanager
+from importlib import import_module
+from typing import Any, Optional
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, Counter, generate_latest
 from starlette.responses import Response
 
-from contextlib import asynccontextmanager
-
-# Import API routers
-from zqautonxg.api.v1 import logs, network, nodes, workflows
-
 # ZQAutoNXG Configuration
 APP_NAME = os.getenv("APP_NAME", "ZQAutoNXG")
 APP_VERSION = "6.0.0"
 APP_BRAND = "Powered by ZQ AI LOGIC™"
 APP_DESCRIPTION = "Next-Generation eXtended Automation Platform"
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", 30))
+
+# API routers and the admission, event, web, observability and storage
+# subsystems are imported when the application is built rather than on import
+API_V1_ROUTERS = ("workflows", "nodes", "logs", "network", "analytics")
 
-# Initialize logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("zqautonxg")
 
 
+def configure_logging() -> None:
+    """Configure root logging for a running server (no-op if already set up)."""
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
+    from zqautonxg import events
+    from zqautonxg.observability import eventloop, tracing
+    from zqautonxg.observability import health as health_checks
+    from zqautonxg.runtime import compute
+    from zqautonxg.storage import get_database, open_log_store
+
     # Startup
-    asyncio.create_task(logs.generate_sample_logs())
+    configure_logging()
+    open_log_store()
+    await events.bus.start()
+    logs = import_module("zqautonxg.api.v1.logs")
+    network = import_module("zqautonxg.api.v1.network")
+    workflows = import_module("zqautonxg.api.v1.workflows")
+    await workflows.start_queue_worker()
+    node_registry = import_module("zqautonxg.runtime.nodes")
+    warm_pools = [
+        asyncio.create_task(compute.pools[kind].warm())
+        for kind in ("process", "thread")
+        if any(t.executor == kind for t in node_registry.node_types.values())
+    ]
+    sample_logs = asyncio.create_task(logs.generate_sample_logs())
+    health_checks.monitor.add("event_bus", health_checks.event_bus_probe(events.bus))
+    # Saturation and backlog are reported, but must not pull workers out of rotation
+    health_checks.monitor.add("compute", health_checks.compute_probe(compute.pools), critical=False)
+    database = get_database()
+    if database is not None:
+        health_checks.monitor.add("storage", health_checks.storage_probe(database))
+    if workflows.execution_queue is not None:
+        health_checks.monitor.add(
+            "execution_queue", health_checks.queue_probe(workflows.execution_queue), critical=False
+        )
+    # Readiness reads event-loop lag from the loop monitor, so start it first
+    if eventloop.MONITOR_ENABLED:
+        await eventloop.monitor.start(on_stall=logs.broadcast_stall)
+    await health_checks.monitor.start()
     logger.info("ZQAutoNXG platform started successfully")
     yield
-    # Shutdown
+    # Shutdown: stop taking traffic, drain in-flight executions, then
+    # disconnect streaming clients
     logger.info("ZQAutoNXG platform shutting down")
+    health_checks.monitor.drain()
+    sample_logs.cancel()
+    await workflows.stop_queue_worker(GRACEFUL_TIMEOUT)
+    remaining = await workflows.drain_executions(GRACEFUL_TIMEOUT)
+    if remaining:
+        logger.warning(f"{remaining} execution(s) still running at shutdown")
+    await logs.ingest_buffer.stop()
+    await logs.close_connections()
+    await logs.close_log_store()
+    await network.close_connections()
+    for task in warm_pools:
+        task.cancel()
+    compute.shutdown(wait=False)
+    rate_limit_store = getattr(app.state, "rate_limit_store", None)
+    if rate_limit_store is not None:
+        await rate_limit_store.close()
+    await health_checks.monitor.stop()
+    await eventloop.monitor.stop()
+    await tracing.flush()
+    await events.bus.stop()
 
 
-# Create FastAPI application
-app = FastAPI(
-    title=APP_NAME,
-    version=APP_VERSION,
-    description=f"{APP_DESCRIPTION} - {APP_BRAND}",
-    contact={
-        "name": "ZQ AI LOGIC™ Support",
-        "email": "zubin.qayam@outlook.com",
-    },
-    license_info={
-        "name": "Apache License 2.0",
-        "url": "http://www.apache.org/licenses/LICENSE-2.0",
-    },
-    lifespan=lifespan,
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8080").split(","),
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add GZip middleware for response compression
-# Compressing responses > 1000 bytes significantly reduces network bandwidth usage
-# and improves client response times, especially for the /metrics endpoint
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-
-# Include API routers
-app.include_router(workflows.router, prefix="/api/v1")
-app.include_router(nodes.router, prefix="/api/v1")
-app.include_router(logs.router, prefix="/api/v1")
-app.include_router(network.router, prefix="/api/v1")
-
-# Serve frontend static files if available
-frontend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend")
-if os.path.exists(frontend_path):
-    # Serve index.html at /ui
-    @app.get("/ui")
-    async def serve_ui():
-        """Serve the web interface."""
-        index_path = os.path.join(frontend_path, "index.html")
-        if os.path.exists(index_path):
-            return FileResponse(index_path)
-        return {"message": "Frontend not available"}
-    
-    logger.info(f"Frontend available at /ui")
+# Platform endpoints (/, /health, /metrics, ...) mounted at the root
+router = APIRouter()
 
 
 # Prometheus metrics
@@ -129,7 +141,7 @@ HEALTH_RESPONSE_TEMPLATE: dict[str, Any] = {
     "uptime": "operational"
 }
 
-@app.get("/")
+@router.get("/")
 async def root():
     """Root endpoint with ZQAutoNXG information"""
     ROOT_REQUEST_METRIC.inc()
@@ -139,7 +151,7 @@ async def root():
     response["timestamp"] = time.time()
     return response
 
-@app.get("/health")
+@router.get("/health")
 async def health():
     """Health check endpoint"""
     HEALTH_CHECKS.inc()
@@ -148,15 +160,33 @@ async def health():
     response["timestamp"] = time.time()
     return response
 
-@app.get("/metrics")
+@router.get("/health/live")
+async def health_live():
+    """Liveness probe: the process is running and its health monitor is alive."""
+    from zqautonxg.observability import health as health_checks
+
+    status_code, body = health_checks.monitor.liveness()
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+@router.get("/health/ready")
+async def health_ready():
+    """Readiness probe: dependencies passed their last background check."""
+    from zqautonxg.observability import health as health_checks
+
+    status_code, body = health_checks.monitor.readiness()
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+@router.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
     data = generate_latest()
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
 
-@app.get("/status")
+@router.get("/status")
 async def status():
     """Detailed status information"""
+    from zqautonxg.observability import health as health_checks
+
     return {
         "platform": APP_NAME,
         "version": APP_VERSION,
@@ -170,6 +200,7 @@ async def status():
             "meta_learner": "ready",
             "rca_engine": "ready"
         },
+        "health": health_checks.monitor.results,
         "integrations": {
             "zq_ai_logic": "configured",
             "prometheus": "active",
@@ -177,7 +208,7 @@ async def status():
         }
     }
 
-@app.get("/version")
+@router.get("/version")
 async def version():
     """Version information"""
     return {
@@ -191,11 +222,111 @@ async def version():
     }
 
 
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        app,
-        host=os.getenv("HOST", "0.0.0.0"),
-        port=int(os.getenv("PORT", 8000)),
-        log_level="info"
+
+def create_app() -> FastAPI:
+    """Build the ZQAutoNXG FastAPI application."""
+    from zqautonxg import admission, web
+    from zqautonxg.observability import profiling
+
+    app = FastAPI(
+        title=APP_NAME,
+        version=APP_VERSION,
+        description=f"{APP_DESCRIPTION} - {APP_BRAND}",
+        contact={
+            "name": "ZQ AI LOGIC™ Support",
+            "email": "zubin.qayam@outlook.com",
+        },
+        license_info={
+            "name": "Apache License 2.0",
+            "url": "http://www.apache.org/licenses/LICENSE-2.0",
+        },
+        lifespan=lifespan,
+    )
+
+    # Innermost, so replays reproduce the endpoint's own response
+    app.add_middleware(admission.IdempotencyMiddleware, **admission.idempotency_options())
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8080").split(","),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
     )
+
+    # Compress responses with the best encoding the client accepts
+    # (zstd/br/gzip); streams and small or binary bodies are left alone
+    app.add_middleware(web.CompressionMiddleware)
+
+    # Per-request profiling (opt-in via X-Profile header, admin only)
+    app.add_middleware(profiling.RequestProfilerMiddleware)
+
+    # Rate limiting runs outermost so rejected requests cost almost nothing
+    rate_limits = admission.rate_limit_options()
+    if rate_limits is not None:
+        app.add_middleware(admission.RateLimitMiddleware, **rate_limits)
+        app.state.rate_limit_store = rate_limits["store"]
+
+    # Include API routers; admin profiling endpoints sit next to /metrics
+    app.include_router(router)
+    app.include_router(profiling.router)
+    for name in API_V1_ROUTERS:
+        module = import_module(f"zqautonxg.api.v1.{name}")
+        app.include_router(module.router, prefix="/api/v1")
+
+    # Serve the frontend from memory, precompressed once here
+    frontend_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend")
+    if os.path.isdir(frontend_path):
+        assets = web.StaticAssets(frontend_path)
+        app.state.static_assets = assets
+
+        @app.get("/ui")
+        async def serve_ui(request: Request):
+            """Serve the web interface."""
+            index = assets.get("index.html")
+            if index is None:
+                return {"message": "Frontend not available"}
+            return index.response(request)
+
+        @app.get("/ui/{path:path}")
+        async def serve_ui_asset(path: str, request: Request):
+            """Serve a web interface asset."""
+            asset = assets.get(path or "index.html")
+            if asset is None:
+                raise HTTPException(status_code=404, detail="Asset not found")
+            return asset.response(request)
+
+        logger.info(f"Frontend available at /ui")
+
+    return app
+
+
+_app: Optional[FastAPI] = None
+
+
+def get_app() -> FastAPI:
+    """Return the process-wide application, building it on first use."""
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name: str) -> Any:
+    # ``zqautonxg.app:app`` is resolved lazily so that importing this module
+    # (e.g. for the console entry point) does not build the application.
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Console entry point (``zqautonxg``): run the production server."""
+    from zqautonxg import server
+
+    return server.main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
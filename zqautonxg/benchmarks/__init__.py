@@ -0,0 +1,11 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Performance benchmarks for ZQAutoNXG platform.
+
+Each benchmark is runnable as a module and prints machine-readable JSON:
+
+* ``python -m zqautonxg.benchmarks`` - API, execution and WebSocket suite
+* ``python -m zqautonxg.benchmarks.startup`` - cold-start timings
+"""
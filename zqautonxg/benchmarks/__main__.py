@@ -0,0 +1,8 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+import sys
+
+from zqautonxg.benchmarks.suite import main
+
+sys.exit(main())
@@ -0,0 +1,147 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Cold-start benchmark.
+
+Spawns fresh interpreters and measures, per run:
+
+* ``package_import_ms`` - ``import zqautonxg``
+* ``app_import_ms`` - ``import zqautonxg.app`` (no application built yet)
+* ``app_build_ms`` - ``create_app()``, including router imports
+* ``first_request_ms`` - from the start of the package import until the
+  first ``GET /health`` response is received in-process
+* ``process_ms`` - wall time of the whole child process
+
+Usage::
+
+    python -m zqautonxg.benchmarks.startup --runs 5 --max-first-request-ms 1500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Executed in a fresh interpreter so nothing is warm in sys.modules.
+_PROBE = r"""
+import json
+import sys
+import time
+
+t0 = time.perf_counter()
+import zqautonxg
+t1 = time.perf_counter()
+leaked = sorted(m for m in ("fastapi", "pydantic", "zqautonxg.app") if m in sys.modules)
+import zqautonxg.app as app_module
+t2 = time.perf_counter()
+app = app_module.create_app()
+t3 = time.perf_counter()
+
+import asyncio
+import httpx
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/health")
+        response.raise_for_status()
+
+asyncio.run(first_request())
+t4 = time.perf_counter()
+
+sys.stdout.write("\n" + json.dumps({
+    "package_import_ms": (t1 - t0) * 1000,
+    "app_import_ms": (t2 - t1) * 1000,
+    "app_build_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t0) * 1000,
+    "package_import_leaks": leaked,
+}))
+"""
+
+METRICS = (
+    "package_import_ms",
+    "app_import_ms",
+    "app_build_ms",
+    "first_request_ms",
+    "process_ms",
+)
+
+
+def measure_once() -> Dict[str, Any]:
+    """Run the probe in a fresh interpreter and return its measurements."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+
+    # The report is the last line; anything before it was printed on import.
+    *printed, report = proc.stdout.split("\n")
+    result = json.loads(report)
+    result["process_ms"] = process_ms
+    result["import_output"] = "\n".join(printed)
+    return result
+
+
+def run(runs: int = 5) -> Dict[str, Any]:
+    """Run the startup benchmark ``runs`` times and summarise the results."""
+    samples: List[Dict[str, Any]] = [measure_once() for _ in range(runs)]
+
+    summary: Dict[str, Any] = {"benchmark": "startup", "runs": runs}
+    for metric in METRICS:
+        values = [sample[metric] for sample in samples]
+        summary[metric] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    summary["import_side_effects"] = {
+        "output": any(sample["import_output"] for sample in samples),
+        "eager_modules": samples[0]["package_import_leaks"],
+    }
+    return summary
+
+
+def check_budgets(summary: Dict[str, Any], budgets: Dict[str, Optional[float]]) -> List[str]:
+    """Return a description of every median that exceeds its budget."""
+    failures = []
+    for metric, budget in budgets.items():
+        if budget is not None and summary[metric]["median"] > budget:
+            failures.append(
+                f"{metric}: median {summary[metric]['median']:.1f}ms > budget {budget:.1f}ms"
+            )
+    if summary["import_side_effects"]["output"]:
+        failures.append("import zqautonxg wrote to stdout")
+    if summary["import_side_effects"]["eager_modules"]:
+        failures.append(
+            "import zqautonxg eagerly imported "
+            + ", ".join(summary["import_side_effects"]["eager_modules"])
+        )
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZQAutoNXG cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    for metric in METRICS:
+        parser.add_argument(f"--max-{metric.replace('_', '-')}", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    summary = run(args.runs)
+    failures = check_budgets(
+        summary, {metric: getattr(args, f"max_{metric}") for metric in METRICS}
+    )
+    summary["failures"] = failures
+    print(json.dumps(summary, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
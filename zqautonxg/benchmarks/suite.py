@@ -0,0 +1,427 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+API, execution engine and WebSocket fan-out benchmark suite.
+
+Runs against the application in-process (``--target asgi``, via
+``httpx.ASGITransport``) or against a local uvicorn server started in a
+background thread of the same process (``--target uvicorn``). Both targets
+share module state with the benchmark, so large fixtures such as log history
+can be seeded directly.
+
+Scenarios:
+
+* ``health`` - ``GET /health`` throughput
+* ``workflow_crud`` - create/get/update/delete cycle throughput
+* ``execute.<n>`` - ``POST /workflows/execute`` latency for n-node graphs
+* ``logs_query`` - ``POST /logs/query`` latency over a large history
+* ``broadcast.<n>`` - ``broadcast_log`` latency until n WebSocket clients
+  have received the entry
+
+Usage::
+
+    python -m zqautonxg.benchmarks --target asgi --output results.json
+    python -m zqautonxg.benchmarks --baseline results.json --tolerance 0.2
+
+Results are JSON. Comparing against a baseline exits non-zero when a metric
+regresses by more than the tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from zqautonxg import __version__
+
+# Scenario sizes for a full run and for a quick smoke run
+FULL_PROFILE: Dict[str, Any] = {
+    "requests": 2000,
+    "concurrency": 32,
+    "crud_cycles": 300,
+    "graph_sizes": [10, 1000, 10000],
+    "executions": 20,
+    "log_history": 100_000,
+    "queries": 50,
+    "ws_clients": [1, 10, 100],
+    "broadcasts": 20,
+}
+QUICK_PROFILE: Dict[str, Any] = {
+    "requests": 100,
+    "concurrency": 8,
+    "crud_cycles": 20,
+    "graph_sizes": [10, 1000],
+    "executions": 3,
+    "log_history": 5000,
+    "queries": 5,
+    "ws_clients": [1, 10],
+    "broadcasts": 3,
+}
+
+
+def metric(value: float, unit: str, better: str) -> Dict[str, Any]:
+    """A single benchmark result; ``better`` is ``"higher"`` or ``"lower"``."""
+    return {"value": value, "unit": unit, "better": better}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_metrics(prefix: str, samples_ms: List[float]) -> Dict[str, Dict[str, Any]]:
+    return {
+        f"{prefix}.p50_ms": metric(statistics.median(samples_ms), "ms", "lower"),
+        f"{prefix}.p99_ms": metric(percentile(samples_ms, 99), "ms", "lower"),
+    }
+
+
+async def _timed_concurrently(
+    count: int, concurrency: int, operation: Callable[[], Awaitable[None]]
+) -> Tuple[float, List[float]]:
+    """Run ``operation`` ``count`` times with bounded concurrency.
+
+    Returns the elapsed wall time in seconds and per-call latencies in ms.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(count)))
+    return time.perf_counter() - started, latencies
+
+
+def make_graph(size: int) -> Dict[str, Any]:
+    """A linear pipeline of ``size`` nodes."""
+    nodes = [
+        {
+            "id": f"node-{i}",
+            "type": "scheduler",
+            "position": {"x": float(i), "y": 0.0},
+            "data": {"label": f"Node {i}"},
+        }
+        for i in range(size)
+    ]
+    edges = [
+        {"id": f"edge-{i}", "source": f"node-{i}", "target": f"node-{i + 1}"}
+        for i in range(size - 1)
+    ]
+    return {"name": f"bench-{size}", "nodes": nodes, "edges": edges}
+
+
+async def bench_health(client: httpx.AsyncClient, profile: Dict[str, Any]) -> Dict[str, Any]:
+    async def call() -> None:
+        (await client.get("/health")).raise_for_status()
+
+    elapsed, latencies = await _timed_concurrently(
+        profile["requests"], profile["concurrency"], call
+    )
+    results = {"health.rps": metric(profile["requests"] / elapsed, "req/s", "higher")}
+    results.update(latency_metrics("health", latencies))
+    return results
+
+
+async def bench_workflow_crud(client: httpx.AsyncClient, profile: Dict[str, Any]) -> Dict[str, Any]:
+    async def cycle() -> None:
+        created = await client.post("/api/v1/workflows", json={"name": "bench-crud"})
+        created.raise_for_status()
+        workflow_id = created.json()["id"]
+        (await client.get(f"/api/v1/workflows/{workflow_id}")).raise_for_status()
+        (await client.put(f"/api/v1/workflows/{workflow_id}", json={"name": "bench-crud-2"})).raise_for_status()
+        (await client.delete(f"/api/v1/workflows/{workflow_id}")).raise_for_status()
+
+    elapsed, latencies = await _timed_concurrently(
+        profile["crud_cycles"], profile["concurrency"], cycle
+    )
+    results = {
+        "workflow_crud.ops_per_s": metric(4 * profile["crud_cycles"] / elapsed, "ops/s", "higher")
+    }
+    results.update(latency_metrics("workflow_crud.cycle", latencies))
+    return results
+
+
+async def bench_execute(client: httpx.AsyncClient, profile: Dict[str, Any]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for size in profile["graph_sizes"]:
+        created = await client.post("/api/v1/workflows", json=make_graph(size))
+        created.raise_for_status()
+        workflow_id = created.json()["id"]
+
+        latencies = []
+        for _ in range(profile["executions"]):
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/workflows/execute", params={"workflow_id": workflow_id}
+            )
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+        results.update(latency_metrics(f"execute.{size}", latencies))
+
+        (await client.delete(f"/api/v1/workflows/{workflow_id}")).raise_for_status()
+    return results
+
+
+async def bench_logs_query(client: httpx.AsyncClient, profile: Dict[str, Any]) -> Dict[str, Any]:
+    from zqautonxg.api.v1 import logs
+
+    levels = ["DEBUG", "INFO", "WARN", "ERROR"]
+    saved = list(logs.logs_history)
+    logs.logs_history[:] = [
+        logs.LogEntry(
+            level=levels[i % 4],
+            message=f"Node processing completed item {i}",
+            metadata={"node_id": f"node-{i % 10}"},
+        ).to_dict()
+        for i in range(profile["log_history"])
+    ]
+    try:
+        latencies = []
+        for i in range(profile["queries"]):
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/logs/query",
+                params={"level": "error", "search": f"item {i}", "limit": 100},
+            )
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        logs.logs_history[:] = saved
+    return latency_metrics("logs_query", latencies)
+
+
+class _RecordingConnection:
+    """In-process stand-in for a WebSocket client."""
+
+    def __init__(self) -> None:
+        self.received = 0
+
+    async def send_text(self, message: str) -> None:
+        self.received += 1
+
+
+async def bench_broadcast_inprocess(profile: Dict[str, Any]) -> Dict[str, Any]:
+    from zqautonxg.api.v1 import logs
+
+    results: Dict[str, Any] = {}
+    saved = list(logs.active_connections)
+    try:
+        for clients in profile["ws_clients"]:
+            logs.active_connections[:] = [_RecordingConnection() for _ in range(clients)]
+            latencies = []
+            for i in range(profile["broadcasts"]):
+                started = time.perf_counter()
+                await logs.broadcast_log(logs.LogEntry(level="INFO", message=f"bench-{i}"))
+                latencies.append((time.perf_counter() - started) * 1000)
+            results.update(latency_metrics(f"broadcast.{clients}", latencies))
+    finally:
+        logs.active_connections[:] = saved
+    return results
+
+
+async def bench_broadcast_uvicorn(server: "LocalServer", profile: Dict[str, Any]) -> Dict[str, Any]:
+    import websockets
+
+    from zqautonxg.api.v1 import logs
+
+    results: Dict[str, Any] = {}
+    url = f"ws://127.0.0.1:{server.port}/api/v1/logs/ws"
+    for clients in profile["ws_clients"]:
+        connections = [await websockets.connect(url) for _ in range(clients)]
+        try:
+            latencies = []
+            for i in range(profile["broadcasts"]):
+                marker = f"bench-{clients}-{i}"
+
+                async def receive(connection: Any) -> None:
+                    while marker not in await connection.recv():
+                        pass
+
+                started = time.perf_counter()
+                server.call_soon(logs.broadcast_log(logs.LogEntry(level="INFO", message=marker)))
+                await asyncio.gather(*(receive(c) for c in connections))
+                latencies.append((time.perf_counter() - started) * 1000)
+            results.update(latency_metrics(f"broadcast.{clients}", latencies))
+        finally:
+            await asyncio.gather(*(c.close() for c in connections))
+    return results
+
+
+class LocalServer:
+    """uvicorn serving the app on an ephemeral port in a background thread."""
+
+    def __init__(self) -> None:
+        import uvicorn
+
+        from zqautonxg.app import create_app
+
+        class _Server(uvicorn.Server):
+            async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+                self.loop = asyncio.get_running_loop()
+                await super().startup(sockets=sockets)
+
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        # Server.run() picks the same event loop (uvloop when installed) as
+        # production workers do
+        self.server = _Server(
+            uvicorn.Config(create_app(), log_level="warning", lifespan="off")
+        )
+        self.thread = threading.Thread(
+            target=self.server.run, kwargs={"sockets": [self.sock]}, daemon=True
+        )
+
+    def call_soon(self, coro: Awaitable[Any]) -> None:
+        """Schedule a coroutine on the server's event loop."""
+        asyncio.run_coroutine_threadsafe(coro, self.server.loop)
+
+    def __enter__(self) -> "LocalServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+        self.sock.close()
+
+
+async def _run_scenarios(
+    client: httpx.AsyncClient,
+    profile: Dict[str, Any],
+    scenarios: List[str],
+    server: Optional[LocalServer],
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    if "health" in scenarios:
+        results.update(await bench_health(client, profile))
+    if "workflow_crud" in scenarios:
+        results.update(await bench_workflow_crud(client, profile))
+    if "execute" in scenarios:
+        results.update(await bench_execute(client, profile))
+    if "logs_query" in scenarios:
+        results.update(await bench_logs_query(client, profile))
+    if "broadcast" in scenarios:
+        if server is None:
+            results.update(await bench_broadcast_inprocess(profile))
+        else:
+            results.update(await bench_broadcast_uvicorn(server, profile))
+    return results
+
+
+SCENARIOS = ["health", "workflow_crud", "execute", "logs_query", "broadcast"]
+
+
+def run(
+    target: str = "asgi",
+    profile: Optional[Dict[str, Any]] = None,
+    scenarios: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run the suite and return a JSON-serialisable report."""
+    profile = profile or FULL_PROFILE
+    scenarios = scenarios or SCENARIOS
+
+    async def in_process() -> Dict[str, Any]:
+        from zqautonxg.app import create_app
+
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await _run_scenarios(client, profile, scenarios, None)
+
+    async def over_uvicorn(server: LocalServer) -> Dict[str, Any]:
+        limits = httpx.Limits(max_connections=profile["concurrency"])
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}", limits=limits) as client:
+            return await _run_scenarios(client, profile, scenarios, server)
+
+    if target == "asgi":
+        metrics = asyncio.run(in_process())
+    elif target == "uvicorn":
+        with LocalServer() as server:
+            metrics = asyncio.run(over_uvicorn(server))
+    else:
+        raise ValueError(f"Unknown benchmark target: {target}")
+
+    return {
+        "suite": "zqautonxg",
+        "version": __version__,
+        "target": target,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "profile": profile,
+        "metrics": metrics,
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2
+) -> List[Dict[str, Any]]:
+    """Return every metric that regressed beyond ``tolerance`` vs. ``baseline``."""
+    regressions = []
+    for name, current in report["metrics"].items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None or previous["value"] == 0:
+            continue
+        change = (current["value"] - previous["value"]) / previous["value"]
+        if current["better"] == "higher":
+            regressed = change < -tolerance
+        else:
+            regressed = change > tolerance
+        if regressed:
+            regressions.append({
+                "metric": name,
+                "baseline": previous["value"],
+                "current": current["value"],
+                "change": change,
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ZQAutoNXG benchmark suite")
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for smoke runs")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, dest="scenarios")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a previously saved report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run(args.target, QUICK_PROFILE if args.quick else FULL_PROFILE, args.scenarios)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Cross-worker event bus for ZQAutoNXG platform.
+
+``EVENT_BUS=memory`` (default) delivers events within one process;
+``EVENT_BUS=redis`` shares them between workers and instances through Redis
+pub/sub at ``REDIS_URL``.
+"""
+
+import os
+
+from .bus import EventBus, EventHandler, InProcessEventBus
+from .redis_bus import RedisEventBus
+
+
+def create_bus(backend: str = "memory", url: str = "redis://localhost:6379/0") -> EventBus:
+    """Create an event bus for ``backend`` (``memory`` or ``redis``)."""
+    if backend == "memory":
+        return InProcessEventBus()
+    if backend == "redis":
+        return RedisEventBus(
+            url,
+            batch_size=int(os.getenv("EVENT_BUS_BATCH_SIZE", 500)),
+            flush_interval=float(os.getenv("EVENT_BUS_FLUSH_MS", 5)) / 1000,
+        )
+    raise ValueError(f"Unknown event bus backend: {backend}")
+
+
+# Process-wide bus shared by the log and topology streams
+bus = create_bus(
+    os.getenv("EVENT_BUS", "memory"),
+    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+)
+
+__all__ = [
+    "EventBus",
+    "EventHandler",
+    "InProcessEventBus",
+    "RedisEventBus",
+    "bus",
+    "create_bus",
+]
@@ -0,0 +1,91 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Event bus abstraction.
+
+Producers ``publish`` messages to a channel; each worker registers handlers
+with ``subscribe`` and receives messages in batches (lists), so a single
+fan-in per worker can feed its WebSocket clients however many events arrive.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from prometheus_client import Counter
+
+logger = logging.getLogger("zqautonxg.events")
+
+EventHandler = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+EVENTS_PUBLISHED = Counter(
+    "zqautonxg_event_bus_published_total", "Events published to the event bus", ["channel"]
+)
+EVENTS_DELIVERED = Counter(
+    "zqautonxg_event_bus_delivered_total", "Events delivered to local handlers", ["channel"]
+)
+
+
+class EventBus(ABC):
+    """Base class for event bus backends."""
+
+    def __init__(self) -> None:
+        self.handlers: Dict[str, List[EventHandler]] = {}
+        # Labelled counter children per channel, to skip the label lookup per event
+        self._published: Dict[str, Any] = {}
+        self._delivered: Dict[str, Any] = {}
+
+    def count_published(self, channel: str, count: int = 1) -> None:
+        counter = self._published.get(channel)
+        if counter is None:
+            counter = self._published[channel] = EVENTS_PUBLISHED.labels(channel=channel)
+        counter.inc(count)
+
+    def subscribe(self, channel: str, handler: EventHandler) -> None:
+        """Deliver batches published on ``channel`` to ``handler``."""
+        self.handlers.setdefault(channel, []).append(handler)
+
+    @abstractmethod
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Publish one message on ``channel``."""
+
+    async def publish_many(self, channel: str, messages: List[Dict[str, Any]]) -> None:
+        """Publish a batch; subscribers receive it as one (or few) deliveries."""
+        for message in messages:
+            await self.publish(channel, message)
+
+    def health(self) -> Tuple[bool, Dict[str, Any]]:
+        """Whether events are flowing, from state already held (no backend calls)."""
+        return True, {"backend": "memory"}
+
+    async def start(self) -> None:
+        """Connect to the backend; called from the application lifespan."""
+
+    async def stop(self) -> None:
+        """Flush pending publishes and disconnect."""
+
+    async def dispatch(self, channel: str, messages: List[Dict[str, Any]]) -> None:
+        """Hand a batch to this worker's handlers for ``channel``."""
+        counter = self._delivered.get(channel)
+        if counter is None:
+            counter = self._delivered[channel] = EVENTS_DELIVERED.labels(channel=channel)
+        counter.inc(len(messages))
+        for handler in self.handlers.get(channel, ()):
+            try:
+                await handler(messages)
+            except Exception as e:
+                logger.error(f"Event handler for {channel} failed: {e}")
+
+
+class InProcessEventBus(EventBus):
+    """Deliver events to handlers in the publishing process only."""
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self.count_published(channel)
+        await self.dispatch(channel, [message])
+
+    async def publish_many(self, channel: str, messages: List[Dict[str, Any]]) -> None:
+        if messages:
+            self.count_published(channel, len(messages))
+            await self.dispatch(channel, messages)
@@ -0,0 +1,266 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Redis pub/sub event bus backend.
+
+Publishes are buffered per channel and flushed every ``flush_interval``
+seconds (or as soon as ``batch_size`` events are waiting) as one ``PUBLISH``
+of a JSON array per channel, pipelined on a single connection. Each worker
+holds one ``SUBSCRIBE`` connection for all channels and dispatches every
+received batch to its local handlers, including batches it published itself;
+channels subscribed after ``start`` are added to the live connection.
+
+Speaks RESP2 directly over asyncio streams, so no Redis client library is
+required.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from .bus import EventBus, EventHandler
+
+logger = logging.getLogger("zqautonxg.events.redis")
+
+CHANNEL_PREFIX = "zqautonxg:"
+RECONNECT_DELAY = 1.0
+MAX_PENDING = 100_000
+
+Reply = Union[None, int, bytes, str, List[Any]]
+
+
+class RedisError(Exception):
+    """Error reply from the Redis server."""
+
+
+class RedisConnection:
+    """Minimal RESP2 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, url: str) -> "RedisConnection":
+        parts = urlsplit(url)
+        reader, writer = await asyncio.open_connection(parts.hostname or "localhost", parts.port or 6379)
+        connection = cls(reader, writer)
+        if parts.password:
+            auth = [unquote(parts.password)]
+            if parts.username:
+                auth.insert(0, unquote(parts.username))
+            await connection.execute("AUTH", *auth)
+        db = parts.path.lstrip("/")
+        if db and db != "0":
+            await connection.execute("SELECT", db)
+        return connection
+
+    @staticmethod
+    def encode(*args: Union[str, bytes]) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg.encode() if isinstance(arg, str) else arg
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def write(self, *args: Union[str, bytes]) -> None:
+        self.writer.write(self.encode(*args))
+
+    async def read_reply(self) -> Reply:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self.read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected RESP reply: {line!r}")
+
+    async def execute(self, *args: Union[str, bytes]) -> Reply:
+        self.write(*args)
+        await self.writer.drain()
+        return await self.read_reply()
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (OSError, ConnectionError):
+            pass
+
+
+class RedisEventBus(EventBus):
+    """Share events between workers through Redis pub/sub."""
+
+    def __init__(self, url: str, batch_size: int = 500, flush_interval: float = 0.005) -> None:
+        super().__init__()
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.pending: Dict[str, List[Dict[str, Any]]] = {}
+        self.pending_count = 0
+        self.running = False
+        self.connected = False
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._publisher: Optional[RedisConnection] = None
+        self._subscriber: Optional[RedisConnection] = None
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self.count_published(channel)
+        if not self.running:
+            # Not connected (e.g. no lifespan): behave like the in-process bus
+            await self.dispatch(channel, [message])
+            return
+        if self.pending_count >= MAX_PENDING:
+            logger.warning(f"Event bus backlog full; dropping event on {channel}")
+            return
+        self.pending.setdefault(channel, []).append(message)
+        self.pending_count += 1
+        self._has_pending.set()
+        if self.pending_count >= self.batch_size:
+            self._batch_full.set()
+
+    async def publish_many(self, channel: str, messages: List[Dict[str, Any]]) -> None:
+        if not self.running:
+            self.count_published(channel, len(messages))
+            await self.dispatch(channel, messages)
+            return
+        room = MAX_PENDING - self.pending_count
+        if room < len(messages):
+            logger.warning(f"Event bus backlog full; dropping {len(messages) - max(room, 0)} event(s) on {channel}")
+            messages = messages[:max(room, 0)]
+        if not messages:
+            return
+        self.count_published(channel, len(messages))
+        self.pending.setdefault(channel, []).extend(messages)
+        self.pending_count += len(messages)
+        self._has_pending.set()
+        if self.pending_count >= self.batch_size:
+            self._batch_full.set()
+
+    def subscribe(self, channel: str, handler: EventHandler) -> None:
+        new_channel = channel not in self.handlers
+        super().subscribe(channel, handler)
+        if new_channel and self._subscriber is not None:
+            # The subscribe loop only subscribes to the channels known when it connects
+            self._subscriber.write("SUBSCRIBE", CHANNEL_PREFIX + channel)
+
+    def health(self) -> Tuple[bool, Dict[str, Any]]:
+        healthy = self.running and self.connected and self.pending_count < MAX_PENDING * 0.9
+        return healthy, {
+            "backend": "redis",
+            "connected": self.connected,
+            "pending": self.pending_count,
+        }
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._subscribe_loop()),
+        ]
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        # Give the flusher one last chance to send what is buffered
+        if self.pending_count and self._publisher is not None:
+            try:
+                await self._send(self._take_pending())
+            except Exception as e:
+                logger.error(f"Event bus flush on shutdown failed: {e}")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for connection in (self._publisher, self._subscriber):
+            if connection is not None:
+                await connection.close()
+        self._publisher = self._subscriber = None
+        self.connected = False
+
+    def _take_pending(self) -> Dict[str, List[Dict[str, Any]]]:
+        batches, self.pending = self.pending, {}
+        self.pending_count = 0
+        self._has_pending.clear()
+        self._batch_full.clear()
+        return batches
+
+    async def _send(self, batches: Dict[str, List[Dict[str, Any]]]) -> None:
+        # Encode everything before writing so a bad event cannot leave half a pipeline
+        payloads = [
+            (CHANNEL_PREFIX + channel, json.dumps(messages, default=str))
+            for channel, messages in batches.items()
+        ]
+        if self._publisher is None:
+            self._publisher = await RedisConnection.open(self.url)
+        for channel, payload in payloads:
+            self._publisher.write("PUBLISH", channel, payload)
+        await self._publisher.writer.drain()
+        for _ in batches:
+            await self._publisher.read_reply()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if self.pending_count < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            batches = self._take_pending()
+            try:
+                await self._send(batches)
+            except Exception as e:
+                dropped = sum(len(messages) for messages in batches.values())
+                logger.error(f"Event bus publish failed, dropped {dropped} event(s): {e}")
+                if self._publisher is not None:
+                    await self._publisher.close()
+                    self._publisher = None
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _subscribe_loop(self) -> None:
+        while True:
+            try:
+                self._subscriber = await RedisConnection.open(self.url)
+                channels = [CHANNEL_PREFIX + channel for channel in self.handlers]
+                if channels:
+                    self._subscriber.write("SUBSCRIBE", *channels)
+                    await self._subscriber.writer.drain()
+                self.connected = True
+                logger.info(f"Event bus subscribed to {len(channels)} channel(s)")
+                while True:
+                    reply = await self._subscriber.read_reply()
+                    if isinstance(reply, list) and reply and reply[0] == b"message":
+                        channel = reply[1].decode()[len(CHANNEL_PREFIX):]
+                        await self.dispatch(channel, json.loads(reply[2]))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ConnectionError, RedisError, ValueError) as e:
+                self.connected = False
+                logger.error(f"Event bus subscription lost: {e}; reconnecting")
+                if self._subscriber is not None:
+                    await self._subscriber.close()
+                    self._subscriber = None
+                await asyncio.sleep(RECONNECT_DELAY)
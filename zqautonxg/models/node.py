@@ -6,7 +6,7 @@ Node configuration models for ZQAutoNXG platform.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
@@ -21,6 +21,27 @@ class NodeConfig(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    model_config = {"defer_build": True}
+
+
+class BulkToggle(BaseModel):
+    """Enable, disable or flip many nodes at once."""
+    node_ids: List[UUID]
+    enabled: Optional[bool] = None  # None flips each node
+
+
+class BulkConfigUpdate(BaseModel):
+    """Configuration changes for many nodes at once.
+
+    ``config`` is applied to every node in ``node_ids``; ``updates`` carries
+    per-node configurations. With ``merge`` the given keys are merged into
+    each node's existing configuration instead of replacing it.
+    """
+    node_ids: List[UUID] = Field(default_factory=list)
+    config: Optional[Dict[str, Any]] = None
+    updates: Dict[UUID, Dict[str, Any]] = Field(default_factory=dict)
+    merge: bool = False
+
 
 class SchedulerConfig(BaseModel):
     """Scheduler node configuration."""
@@ -31,6 +52,8 @@ class SchedulerConfig(BaseModel):
     history_retention_days: int = Field(default=30, ge=1, le=365)
     priority_queue: bool = False
 
+    model_config = {"defer_build": True}
+
 
 class ConnectorConfig(BaseModel):
     """Connector node configuration."""
@@ -42,6 +65,8 @@ class ConnectorConfig(BaseModel):
     timeout_ms: int = Field(default=30000, ge=1000, le=300000)
     retry_on_failure: bool = True
 
+    model_config = {"defer_build": True}
+
 
 class SearchNodeConfig(BaseModel):
     """Web search node configuration."""
@@ -52,6 +77,8 @@ class SearchNodeConfig(BaseModel):
     proxy_rotation: bool = False
     user_agent: str = "desktop"  # desktop, mobile
 
+    model_config = {"defer_build": True}
+
 
 class NodeStats(BaseModel):
     """Node statistics."""
@@ -62,6 +89,8 @@ class NodeStats(BaseModel):
     average_duration_ms: float = 0.0
     last_execution: Optional[datetime] = None
 
+    model_config = {"defer_build": True}
+
 
 class RequestHistory(BaseModel):
     """HTTP request history record."""
@@ -78,6 +107,7 @@ class RequestHistory(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174002",
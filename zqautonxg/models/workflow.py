@@ -19,6 +19,8 @@ class WorkflowNode(BaseModel):
     position: Dict[str, float]
     data: Dict[str, Any]
 
+    model_config = {"defer_build": True}
+
 
 class WorkflowEdge(BaseModel):
     """Connection between workflow nodes."""
@@ -27,6 +29,8 @@ class WorkflowEdge(BaseModel):
     target: str
     type: Optional[str] = "default"
 
+    model_config = {"defer_build": True}
+
 
 class WorkflowCreate(BaseModel):
     """Model for creating a new workflow."""
@@ -56,8 +60,10 @@ class Workflow(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: Optional[UUID] = None
+    version: int = 1
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174000",
@@ -72,7 +78,8 @@ class Workflow(BaseModel):
                         "data": {"label": "Schedule Job"}
                     }
                 ],
-                "edges": []
+                "edges": [],
+                "version": 1
             }
         }
     }
@@ -82,6 +89,7 @@ class WorkflowExecution(BaseModel):
     """Workflow execution record."""
     id: UUID = Field(default_factory=uuid4)
     workflow_id: UUID
+    workflow_version: Optional[int] = None  # version of the workflow that ran
     status: str = "pending"  # pending, running, success, failed
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
@@ -90,10 +98,12 @@ class WorkflowExecution(BaseModel):
     error: Optional[str] = None
 
     model_config = {
+        "defer_build": True,
         "json_schema_extra": {
             "example": {
                 "id": "123e4567-e89b-12d3-a456-426614174001",
                 "workflow_id": "123e4567-e89b-12d3-a456-426614174000",
+                "workflow_version": 3,
                 "status": "success",
                 "duration_ms": 1250
             }
@@ -0,0 +1,6 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Runtime observability for ZQAutoNXG platform.
+"""
@@ -0,0 +1,197 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Event-loop lag monitor and slow-callback watchdog.
+
+Every route, WebSocket and background task of a worker shares one asyncio
+loop, so a handler that computes or blocks without awaiting stalls all of
+them. Two pieces watch for that:
+
+* A sampler task on the loop sleeps ``LOOP_MONITOR_INTERVAL_MS`` and records
+  how late it woke up in the ``zqautonxg_event_loop_lag_seconds`` histogram.
+  Each wake-up is also a heartbeat.
+* A watchdog thread checks the heartbeat. Once the loop has missed it by
+  more than ``LOOP_STALL_THRESHOLD_MS`` it captures the loop thread's Python
+  stack while the culprit is still running, counts the stall and logs it,
+  at most once every ``LOOP_STALL_REPORT_INTERVAL`` seconds.
+
+Reports are also handed back to the loop when it resumes (``on_stall``), so
+the application can publish them to the log stream. Unlike asyncio debug
+mode, nothing here wraps or times individual callbacks: the steady-state
+cost is one timer per interval on the loop and one wake-up per half
+threshold in the thread.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger("zqautonxg.observability.eventloop")
+
+MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+SAMPLE_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", 100)) / 1000
+STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD_MS", 250)) / 1000
+REPORT_INTERVAL = float(os.getenv("LOOP_STALL_REPORT_INTERVAL", 30))
+STACK_LIMIT = 30
+MAX_REPORTS = 20
+MAX_SAMPLES = 512  # recent lag samples kept for recent_lag()
+
+LOOP_LAG = Histogram(
+    "zqautonxg_event_loop_lag_seconds",
+    "How late the event loop ran a timer scheduled by the lag sampler",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+LOOP_STALLS = Counter("zqautonxg_event_loop_stalls_total", "Times the event loop was blocked past the stall threshold")
+LOOP_STALL_REPORTS = Counter(
+    "zqautonxg_event_loop_stall_reports_total", "Stall reports by outcome", ["result"]
+)
+
+StallHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class LoopMonitor:
+    """Sample loop lag and report callbacks that hold the loop too long."""
+
+    def __init__(
+        self,
+        interval: float = SAMPLE_INTERVAL,
+        threshold: float = STALL_THRESHOLD,
+        report_interval: float = REPORT_INTERVAL,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.report_interval = report_interval
+        self.reports: Deque[Dict[str, Any]] = deque(maxlen=MAX_REPORTS)
+        self.stalls = 0
+        self.suppressed = 0
+        self.last_beat = 0.0  # monotonic time the sampler last woke up
+        self.samples: Deque[Tuple[float, float]] = deque(maxlen=MAX_SAMPLES)  # (monotonic time, lag)
+        self._stalled_beat: Optional[float] = None  # heartbeat the current stall started after
+        self._next_report = 0.0
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._on_stall: Optional[StallHandler] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self, on_stall: Optional[StallHandler] = None) -> None:
+        """Start sampling the running loop and watching it from a thread."""
+        if self._task is not None:
+            return
+        self._on_stall = on_stall
+        self._loop_thread = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="zqautonxg-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    # On the loop
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            LOOP_LAG.observe(lag)
+            self.last_beat = time.monotonic()
+            self.samples.append((self.last_beat, lag))
+            while self._pending:
+                await self._deliver(self._pending.popleft(), lag)
+
+    async def _deliver(self, report: Dict[str, Any], lag: float) -> None:
+        # The first beat after a stall knows how long it lasted in total
+        report["blocked_ms"] = round(max(report["blocked_ms"], lag * 1000), 3)
+        self.reports.append(report)
+        if self._on_stall is not None:
+            try:
+                await self._on_stall(report)
+            except Exception as e:
+                logger.error(f"Stall report handler failed: {e}")
+
+    # On the watchdog thread
+
+    def _watch(self) -> None:
+        poll = max(self.threshold / 2, 0.001)
+        while not self._stop_event.wait(poll):
+            beat = self.last_beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked <= self.threshold or beat == self._stalled_beat:
+                continue
+            # One stall per missed heartbeat, however long it lasts
+            self._stalled_beat = beat
+            self.stalls += 1
+            LOOP_STALLS.inc()
+            self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        now = time.monotonic()
+        if now < self._next_report:
+            self.suppressed += 1
+            LOOP_STALL_REPORTS.labels(result="suppressed").inc()
+            return
+        self._next_report = now + self.report_interval
+        frame = sys._current_frames().get(self._loop_thread) if self._loop_thread else None
+        if frame is None:
+            return
+        frames = traceback.extract_stack(frame, limit=STACK_LIMIT)
+        innermost = frames[-1]
+        report = {
+            "timestamp": time.time(),
+            "blocked_ms": round(blocked * 1000, 3),
+            "threshold_ms": self.threshold * 1000,
+            "location": f"{innermost.filename}:{innermost.lineno} in {innermost.name}",
+            "stack": "".join(traceback.format_list(frames)),
+            "suppressed": self.suppressed,
+        }
+        self.suppressed = 0
+        LOOP_STALL_REPORTS.labels(result="reported").inc()
+        logger.warning(
+            f"Event loop blocked for over {report['blocked_ms']:.0f}ms at {report['location']}"
+            f" ({report['suppressed']} earlier stall(s) not reported)\n{report['stack']}"
+        )
+        self._pending.append(report)
+
+    def recent_lag(self, window: float) -> float:
+        """Highest lag sampled in the last ``window`` seconds."""
+        since = time.monotonic() - window
+        return max((lag for at, lag in reversed(self.samples) if at >= since), default=0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "suppressed": self.suppressed,
+            "reports": list(self.reports),
+        }
+
+
+# Process-wide monitor; started by the application lifespan
+monitor = LoopMonitor()
@@ -0,0 +1,214 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Liveness and readiness.
+
+Dependency probes (storage, event bus, compute pool saturation, execution
+queue depth) run in a background task every ``HEALTH_PROBE_INTERVAL``
+seconds, each bounded by ``HEALTH_PROBE_TIMEOUT``. Event-loop lag is not
+sampled here: each round reads the highest lag the ``eventloop`` monitor
+saw since the previous round. The endpoints only return the response
+prepared after the last round, so a load balancer or orchestrator polling
+them costs O(1) and never reaches a dependency, however often it polls.
+
+* ``/health/live`` fails only if the probe task itself died.
+* ``/health/ready`` fails while starting, while draining on shutdown, when a
+  critical probe failed in the last round, or when the last round is older
+  than three intervals.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from zqautonxg.observability import eventloop
+
+logger = logging.getLogger("zqautonxg.observability.health")
+
+PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", 5))
+PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+MAX_LOOP_LAG = float(os.getenv("HEALTH_MAX_LOOP_LAG_MS", 500)) / 1000
+# Tasks waiting for a compute pool slot, per worker, before the pool counts as saturated
+MAX_POOL_BACKLOG = float(os.getenv("HEALTH_MAX_POOL_BACKLOG", 4))
+MAX_QUEUE_DEPTH = int(os.getenv("HEALTH_MAX_QUEUE_DEPTH", 10_000))
+
+HEALTH_PROBE_UP = Gauge("zqautonxg_health_probe_up", "Whether a health probe passed its last check", ["probe"])
+READY = Gauge("zqautonxg_ready", "Whether this worker reports ready")
+
+# A probe returns (healthy, details) or raises
+Probe = Callable[[], Awaitable[Tuple[bool, Dict[str, Any]]]]
+
+LIVE = (200, b'{"status":"alive"}')
+DEAD = (503, b'{"status":"dead","detail":"health monitor stopped unexpectedly"}')
+STARTING = (503, b'{"status":"starting"}')
+
+
+class HealthMonitor:
+    """Run probes periodically and keep the health responses ready to send."""
+
+    def __init__(
+        self,
+        interval: float = PROBE_INTERVAL,
+        timeout: float = PROBE_TIMEOUT,
+        max_loop_lag: float = MAX_LOOP_LAG,
+        loop_monitor: Optional[eventloop.LoopMonitor] = None,
+    ) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.max_loop_lag = max_loop_lag
+        self._loop_monitor = loop_monitor
+        self.probes: Dict[str, Tuple[Probe, bool]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.draining = False
+        self.checked_at = 0.0  # monotonic time of the last round
+        self._ready = STARTING
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def add(self, name: str, probe: Probe, critical: bool = True) -> None:
+        """Register a probe; only critical probes affect readiness."""
+        self.probes[name] = (probe, critical)
+
+    async def _check(self, name: str, probe: Probe, critical: bool) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            healthy, details = await asyncio.wait_for(probe(), self.timeout)
+        except asyncio.TimeoutError:
+            healthy, details = False, {"error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            healthy, details = False, {"error": str(e)}
+        HEALTH_PROBE_UP.labels(probe=name).set(1 if healthy else 0)
+        return {
+            "status": "ok" if healthy else "fail",
+            "critical": critical,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            **details,
+        }
+
+    async def run_once(self) -> None:
+        """Run every probe now and prepare the responses."""
+        names = list(self.probes)
+        checks = await asyncio.gather(*(self._check(name, *self.probes[name]) for name in names))
+        results = dict(zip(names, checks))
+        loop_monitor = self._loop_monitor or eventloop.monitor
+        if loop_monitor.running:
+            lag = loop_monitor.recent_lag(self.interval)
+            lag_ok = lag <= self.max_loop_lag
+            HEALTH_PROBE_UP.labels(probe="event_loop").set(1 if lag_ok else 0)
+            results["event_loop"] = {
+                "status": "ok" if lag_ok else "fail",
+                "critical": True,
+                "lag_ms": round(lag * 1000, 3),
+                "threshold_ms": self.max_loop_lag * 1000,
+            }
+        self.results = results
+        self.checked_at = time.monotonic()
+        self._prepare()
+
+    def _prepare(self) -> None:
+        failed = [name for name, r in self.results.items() if r["critical"] and r["status"] != "ok"]
+        if self.draining:
+            status = "draining"
+        elif not self.results:
+            self._ready = STARTING
+            READY.set(0)
+            return
+        else:
+            status = "not_ready" if failed else "ready"
+        body = json.dumps({"status": status, "failed": failed, "checks": self.results}).encode()
+        self._ready = (200 if status == "ready" else 503, body)
+        READY.set(1 if status == "ready" else 0)
+
+    def liveness(self) -> Tuple[int, bytes]:
+        task = self._task
+        if task is not None and task.done() and not task.cancelled() and task.exception() is not None:
+            return DEAD
+        return LIVE
+
+    def readiness(self) -> Tuple[int, bytes]:
+        status, body = self._ready
+        if status == 200 and time.monotonic() - self.checked_at > 3 * self.interval + self.timeout:
+            return 503, b'{"status":"stale","detail":"health probes have not completed recently"}'
+        return status, body
+
+    def drain(self) -> None:
+        """Report not ready from now on, so load balancers stop routing here."""
+        self.draining = True
+        self._prepare()
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self.draining = False
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def storage_probe(database: Any) -> Probe:
+    """The shared database answers a trivial query."""
+
+    async def probe() -> Tuple[bool, Dict[str, Any]]:
+        await database.run(database.fetchone, "SELECT 1")
+        return True, {}
+
+    return probe
+
+
+def event_bus_probe(bus: Any) -> Probe:
+    """The event bus reports itself connected (no extra backend traffic)."""
+
+    async def probe() -> Tuple[bool, Dict[str, Any]]:
+        return bus.health()
+
+    return probe
+
+
+def compute_probe(pools: Dict[str, Any], max_backlog: float = MAX_POOL_BACKLOG) -> Probe:
+    """No compute pool has more than ``max_backlog`` waiting tasks per worker.
+
+    Register it as non-critical: a saturated pool is a reason to shed work,
+    not to take the worker out of rotation.
+    """
+
+    async def probe() -> Tuple[bool, Dict[str, Any]]:
+        details = {
+            kind: {"workers": pool.workers, "busy": pool.busy, "waiting": pool.waiting}
+            for kind, pool in pools.items()
+        }
+        healthy = all(pool.waiting <= pool.workers * max_backlog for pool in pools.values())
+        return healthy, {"pools": details}
+
+    return probe
+
+
+def queue_probe(queue: Any, max_depth: int = MAX_QUEUE_DEPTH) -> Probe:
+    """The shared execution queue holds at most ``max_depth`` waiting jobs.
+
+    The depth is cluster-wide, so every instance sees the same backlog at the
+    same moment; register it as non-critical so a backlog never makes the
+    whole fleet unready at once.
+    """
+
+    async def probe() -> Tuple[bool, Dict[str, Any]]:
+        depth = await queue.database.run(queue.depth)
+        return depth.get("queued", 0) <= max_depth, {"depth": depth}
+
+    return probe
+
+
+# Process-wide monitor; probes are registered by the application lifespan
+monitor = HealthMonitor()
@@ -0,0 +1,358 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+On-demand profiling endpoints.
+
+All endpoints require the ``X-Admin-Token`` header to match the
+``ADMIN_TOKEN`` environment variable and are disabled when it is unset.
+
+* ``GET /debug/profile/cpu`` - time-boxed profile of the event loop thread,
+  either statistical (collapsed stacks, ready for flamegraph tools) or
+  deterministic (``pstats`` binary dump or text report)
+* ``POST /debug/profile/memory/snapshots`` - take a tracemalloc snapshot
+* ``GET /debug/profile/memory/diff`` - compare two snapshots
+* ``DELETE /debug/profile/memory`` - stop tracing and drop snapshots
+* ``X-Profile: 1`` on any request profiles just that request; the response
+  carries ``X-Profile-Id`` and the report is served from
+  ``GET /debug/profile/requests/{profile_id}``
+* ``GET /debug/profile/loop`` - event-loop stall counts and the most recent
+  stall reports with the blocking stack
+"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from zqautonxg.observability import eventloop
+
+logger = logging.getLogger("zqautonxg.observability.profiling")
+
+MAX_CPU_PROFILE_SECONDS = 60.0
+MAX_REQUEST_PROFILES = 20
+MAX_MEMORY_SNAPSHOTS = 5
+
+
+def _admin_token() -> Optional[str]:
+    return os.getenv("ADMIN_TOKEN") or None
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Check ``token`` against ``ADMIN_TOKEN`` in constant time."""
+    expected = _admin_token()
+    return bool(expected and token and secrets.compare_digest(token, expected))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency guarding admin-only endpoints."""
+    if _admin_token() is None:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/debug/profile",
+    tags=["profiling"],
+    dependencies=[Depends(require_admin)],
+)
+
+# cProfile allows one active profiler per thread, and everything here
+# profiles the event loop thread, so CPU and per-request profiles take turns.
+_profiler_busy = False
+request_profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+memory_snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler(threading.Thread):
+    """Sample another thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="zqautonxg-stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format used by flamegraph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def _stats_text(profiler: cProfile.Profile, limit: int) -> str:
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def _stats_dump(profiler: cProfile.Profile) -> bytes:
+    """Serialise stats in the format read by ``pstats.Stats(filename)``."""
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+def _claim_profiler() -> bool:
+    global _profiler_busy
+    if _profiler_busy:
+        return False
+    _profiler_busy = True
+    return True
+
+
+def _release_profiler() -> None:
+    global _profiler_busy
+    _profiler_busy = False
+
+
+@router.get("/cpu")
+async def cpu_profile(
+    seconds: float = 5.0,
+    interval: float = 0.005,
+    format: str = "collapsed",
+    limit: int = 50,
+) -> Response:
+    """Profile the event loop for ``seconds``.
+
+    ``format=collapsed`` samples stacks every ``interval`` seconds with
+    negligible overhead; ``pstats`` and ``text`` use cProfile, which traces
+    every call made on the loop during the window.
+    """
+    if format not in ("collapsed", "pstats", "text"):
+        raise HTTPException(status_code=400, detail="format must be collapsed, pstats or text")
+    if not 0 < seconds <= MAX_CPU_PROFILE_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_CPU_PROFILE_SECONDS:g}]")
+    if not _claim_profiler():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    logger.info(f"CPU profile started ({format}, {seconds}s)")
+    try:
+        if format == "collapsed":
+            sampler = StackSampler(threading.get_ident(), max(interval, 0.001))
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+                await asyncio.to_thread(sampler.join)
+            return PlainTextResponse(
+                sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)}
+            )
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+        if format == "text":
+            return PlainTextResponse(_stats_text(profiler, limit))
+        return Response(
+            _stats_dump(profiler),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="cpu.pstats"'},
+        )
+    finally:
+        _release_profiler()
+
+
+def _top_stats(stats: List[Any], limit: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "location": str(stat.traceback),
+            "size_bytes": stat.size,
+            "count": stat.count,
+            **({"size_diff_bytes": stat.size_diff, "count_diff": stat.count_diff}
+               if hasattr(stat, "size_diff") else {}),
+        }
+        for stat in stats[:limit]
+    ]
+
+
+@router.post("/memory/snapshots")
+async def take_memory_snapshot(frames: int = 1, limit: int = 25) -> Dict[str, Any]:
+    """Take a tracemalloc snapshot, starting tracing if needed.
+
+    Allocations are only attributed from the moment tracing starts, so the
+    first call usually serves as the baseline for a later diff.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(max(1, frames))
+        logger.info(f"tracemalloc started ({frames} frame(s))")
+
+    snapshot = await asyncio.to_thread(tracemalloc.take_snapshot)
+    snapshot_id = uuid4().hex[:12]
+    memory_snapshots[snapshot_id] = snapshot
+    while len(memory_snapshots) > MAX_MEMORY_SNAPSHOTS:
+        memory_snapshots.popitem(last=False)
+
+    current, peak = tracemalloc.get_traced_memory()
+    top = await asyncio.to_thread(snapshot.statistics, "lineno")
+    return {
+        "snapshot_id": snapshot_id,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "snapshots": list(memory_snapshots),
+        "top": _top_stats(top, limit),
+    }
+
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(
+    base: Optional[str] = None,
+    target: Optional[str] = None,
+    group_by: str = "lineno",
+    limit: int = 25,
+) -> Dict[str, Any]:
+    """Compare two snapshots (default: oldest vs. newest)."""
+    if group_by not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=400, detail="group_by must be lineno, filename or traceback")
+    if len(memory_snapshots) < 2 and (base is None or target is None):
+        raise HTTPException(status_code=400, detail="Take at least two snapshots first")
+
+    ids = list(memory_snapshots)
+    base = base or ids[0]
+    target = target or ids[-1]
+    for snapshot_id in (base, target):
+        if snapshot_id not in memory_snapshots:
+            raise HTTPException(status_code=404, detail=f"Snapshot {snapshot_id} not found")
+
+    diff = await asyncio.to_thread(
+        memory_snapshots[target].compare_to, memory_snapshots[base], group_by
+    )
+    return {
+        "base": base,
+        "target": target,
+        "size_diff_bytes": sum(stat.size_diff for stat in diff),
+        "top": _top_stats(diff, limit),
+    }
+
+
+@router.delete("/memory", status_code=204)
+async def stop_memory_tracing() -> None:
+    """Stop tracemalloc and discard stored snapshots."""
+    memory_snapshots.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+        logger.info("tracemalloc stopped")
+
+
+@router.get("/requests")
+async def list_request_profiles() -> List[Dict[str, Any]]:
+    """List stored per-request profiles, oldest first."""
+    return [
+        {key: value for key, value in profile.items() if key != "stats"}
+        for profile in request_profiles.values()
+    ]
+
+
+@router.get("/requests/{profile_id}")
+async def get_request_profile(profile_id: str, format: str = "text", limit: int = 50) -> Response:
+    """Return a per-request profile as a text report or ``pstats`` dump."""
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "pstats":
+        return Response(
+            _stats_dump(profile["stats"]),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.pstats"'},
+        )
+    return PlainTextResponse(_stats_text(profile["stats"], limit))
+
+
+@router.get("/loop")
+async def get_loop_stalls() -> Dict[str, Any]:
+    """Event-loop stall counters and the most recent stall reports, oldest first."""
+    return eventloop.monitor.snapshot()
+
+
+class RequestProfilerMiddleware:
+    """Profile single requests that opt in with ``X-Profile: 1``.
+
+    The profiler traces the event loop thread while the request is in
+    flight, so concurrent requests on the same worker show up as well.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if headers.get("x-profile") not in ("1", "true") or not is_admin(headers.get("x-admin-token")):
+            await self.app(scope, receive, send)
+            return
+
+        if not _claim_profiler():
+            async def send_busy(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("X-Profile-Skipped", "profiler busy")
+                await send(message)
+
+            await self.app(scope, receive, send_busy)
+            return
+
+        profile_id = uuid4().hex[:12]
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            _release_profiler()
+            request_profiles[profile_id] = {
+                "profile_id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "duration_ms": (time.perf_counter() - started) * 1000,
+                "timestamp": time.time(),
+                "stats": profiler,
+            }
+            while len(request_profiles) > MAX_REQUEST_PROFILES:
+                request_profiles.popitem(last=False)
@@ -0,0 +1,273 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Execution tracing.
+
+Every node run in a workflow execution is recorded as a span under a root
+``workflow.execute`` span. Spans are exported in the OpenTelemetry OTLP/JSON
+encoding to a file (``TRACE_EXPORT_FILE``, one export request per line) and/or
+an OTLP/HTTP collector (``OTEL_EXPORTER_OTLP_ENDPOINT``).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+from zqautonxg import __title__, __version__
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger("zqautonxg.observability.tracing")
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "zqautonxg")
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """A timed operation within an execution trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "status",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        start_ns: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = attributes or {}
+        self.status = STATUS_UNSET
+        self.error: Optional[str] = None
+
+    def end(self, error: Optional[str] = None) -> None:
+        self.end_ns = time.time_ns()
+        self.status = STATUS_ERROR if error else STATUS_OK
+        self.error = error
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": {STATUS_OK: "ok", STATUS_ERROR: "error"}.get(self.status, "unset"),
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.error:
+            span["status"]["message"] = self.error
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_payload(spans: Iterable[Span]) -> Dict[str, Any]:
+    """Encode spans as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({
+                        "service.name": SERVICE_NAME,
+                        "service.version": __version__,
+                    })
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __title__.lower(), "version": __version__},
+                        "spans": [span.to_otlp() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def critical_path(spans: List[Span], predecessors: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Find the chain of dependent nodes that determined execution latency.
+
+    Each node is weighted by its queue wait plus run time; the heaviest path
+    through the dependency graph is the critical path.
+    """
+    node_spans = {
+        span.attributes["zq.node.id"]: span for span in spans if "zq.node.id" in span.attributes
+    }
+    if not node_spans:
+        return {"nodes": [], "duration_ms": 0.0, "segments": [], "dominant_node": None}
+
+    # Nodes finish after all of their inputs, so end time is a topological order
+    order = sorted(node_spans, key=lambda node_id: node_spans[node_id].end_ns or 0)
+    weight = {
+        node_id: span.duration_ms + span.attributes.get("zq.node.queue_wait_ms", 0.0)
+        for node_id, span in node_spans.items()
+    }
+    total: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for node_id in order:
+        best, best_total = None, 0.0
+        for pred in predecessors.get(node_id, ()):
+            if pred in total and total[pred] > best_total:
+                best, best_total = pred, total[pred]
+        total[node_id] = best_total + weight[node_id]
+        via[node_id] = best
+
+    node_id: Optional[str] = max(total, key=total.__getitem__)
+    path: List[str] = []
+    while node_id is not None:
+        path.append(node_id)
+        node_id = via[node_id]
+    path.reverse()
+
+    duration = total[path[-1]]
+    segments = [
+        {
+            "node_id": node_id,
+            "node_type": node_spans[node_id].attributes.get("zq.node.type"),
+            "duration_ms": weight[node_id],
+            "share": weight[node_id] / duration if duration else 0.0,
+        }
+        for node_id in path
+    ]
+    return {
+        "nodes": path,
+        "duration_ms": duration,
+        "segments": segments,
+        "dominant_node": max(segments, key=lambda s: s["duration_ms"])["node_id"],
+    }
+
+
+class SpanExporter(ABC):
+    """Base class for span exporters."""
+
+    @abstractmethod
+    async def export(self, spans: List[Span]) -> None:
+        """Send one batch of finished spans."""
+
+
+class FileSpanExporter(SpanExporter):
+    """Append one OTLP/JSON export request per line to a file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def _write(self, line: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    async def export(self, spans: List[Span]) -> None:
+        await asyncio.to_thread(self._write, json.dumps(otlp_payload(spans)))
+
+
+class OTLPHttpSpanExporter(SpanExporter):
+    """POST OTLP/JSON to ``{endpoint}/v1/traces``."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        timeout: float = 5.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+        self.transport = transport
+
+    async def export(self, spans: List[Span]) -> None:
+        import httpx  # only needed when exporting, keep it off the app import path
+
+        async with httpx.AsyncClient(timeout=self.timeout, transport=self.transport) as client:
+            response = await client.post(self.url, json=otlp_payload(spans))
+            response.raise_for_status()
+
+
+exporters: List[SpanExporter] = []
+if os.getenv("TRACE_EXPORT_FILE"):
+    exporters.append(FileSpanExporter(os.environ["TRACE_EXPORT_FILE"]))
+if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+    exporters.append(OTLPHttpSpanExporter(os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"]))
+
+_pending_exports: Set["asyncio.Task[None]"] = set()
+
+
+async def _export(spans: List[Span]) -> None:
+    for exporter in list(exporters):
+        try:
+            await exporter.export(spans)
+        except Exception as e:
+            logger.error(f"Span export via {type(exporter).__name__} failed: {e}")
+
+
+def export_spans(spans: List[Span]) -> None:
+    """Export spans in the background; failures are logged, never raised."""
+    if not exporters:
+        return
+    task = asyncio.create_task(_export(spans))
+    _pending_exports.add(task)
+    task.add_done_callback(_pending_exports.discard)
+
+
+async def flush(timeout: float = 5.0) -> None:
+    """Wait for background exports to finish."""
+    if _pending_exports:
+        await asyncio.wait(list(_pending_exports), timeout=timeout)
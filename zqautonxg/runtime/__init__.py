@@ -0,0 +1,10 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Workflow execution runtime for ZQAutoNXG platform.
+"""
+
+# Built-in node types that run sub-graphs build on the executor, which must
+# not import them itself; loading the package registers them
+from zqautonxg.runtime import fanout  # noqa: F401
@@ -0,0 +1,238 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Incremental execution analytics.
+
+Every ``execution_finished`` progress event is folded into per-workflow
+rollups bucketed per minute and per hour: execution counts by status,
+duration totals and a duration sketch. Windowed queries merge the buckets
+in range, so their cost grows with the number of buckets, never with the
+number of executions.
+
+The sketch keeps logarithmically spaced duration bins with a relative
+error of ``RELATIVE_ACCURACY`` (2%); sketches merge by adding bin counts,
+so percentiles over any set of buckets are as accurate as over one.
+
+Rollups are fed from the event bus, so with ``EVENT_BUS=redis`` every
+worker sees executions finished on any instance.
+"""
+
+import math
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from zqautonxg import events
+from zqautonxg.runtime.progress import EXECUTION_CHANNEL, FINAL_EVENT
+
+MINUTE = 60
+HOUR = 3600
+MINUTE_RETENTION = float(os.getenv("ANALYTICS_MINUTE_RETENTION_HOURS", 24)) * HOUR
+HOUR_RETENTION = float(os.getenv("ANALYTICS_HOUR_RETENTION_DAYS", 30)) * 24 * HOUR
+
+RELATIVE_ACCURACY = 0.02
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+MIN_DURATION_MS = 1.0  # durations below this share one bin
+
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+
+class DurationSketch:
+    """Mergeable duration histogram with bounded relative error."""
+
+    __slots__ = ("bins", "low", "count")
+
+    def __init__(self) -> None:
+        self.bins: Dict[int, int] = {}
+        self.low = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= MIN_DURATION_MS:
+            self.low += 1
+            return
+        index = math.ceil(math.log(value) / LOG_GAMMA)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "DurationSketch") -> None:
+        self.count += other.count
+        self.low += other.low
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.low
+        if rank < seen:
+            return MIN_DURATION_MS
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                # Midpoint of the bin (GAMMA^(i-1), GAMMA^i] in relative terms
+                return 2 * GAMMA ** index / (GAMMA + 1)
+        return 2 * GAMMA ** max(self.bins) / (GAMMA + 1)
+
+
+class Rollup:
+    """Executions of one workflow within one time bucket."""
+
+    __slots__ = ("count", "by_status", "timed", "total_ms", "min_ms", "max_ms", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.by_status: Dict[str, int] = {}
+        self.timed = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+        self.sketch = DurationSketch()
+
+    def add(self, status: str, duration_ms: Optional[float]) -> None:
+        self.count += 1
+        self.by_status[status] = self.by_status.get(status, 0) + 1
+        if duration_ms is not None:
+            self.timed += 1
+            self.total_ms += duration_ms
+            self.min_ms = min(self.min_ms, duration_ms)
+            self.max_ms = max(self.max_ms, duration_ms)
+            self.sketch.add(duration_ms)
+
+    def merge(self, other: "Rollup") -> None:
+        self.count += other.count
+        for status, count in other.by_status.items():
+            self.by_status[status] = self.by_status.get(status, 0) + count
+        self.timed += other.timed
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration: Dict[str, Optional[float]] = {
+            "min": None, "max": None, "mean": None, **{name: None for name in QUANTILES}
+        }
+        if self.timed:
+            duration["min"] = self.min_ms
+            duration["max"] = self.max_ms
+            duration["mean"] = round(self.total_ms / self.timed, 3)
+            for name, q in QUANTILES.items():
+                value = self.sketch.quantile(q)
+                # Clamp estimates into the observed range
+                duration[name] = round(min(max(value, self.min_ms), self.max_ms), 3)
+        return {
+            "executions": self.count,
+            "by_status": dict(self.by_status),
+            "success_rate": round(self.by_status.get("success", 0) / self.count, 4) if self.count else None,
+            "duration_ms": duration,
+        }
+
+
+class WorkflowRollups:
+    """Minute and hour buckets of one workflow, keyed by bucket start."""
+
+    __slots__ = ("minutes", "hours")
+
+    def __init__(self) -> None:
+        self.minutes: Dict[int, Rollup] = {}
+        self.hours: Dict[int, Rollup] = {}
+
+    def add(self, at: float, status: str, duration_ms: Optional[float]) -> None:
+        for buckets, width in ((self.minutes, MINUTE), (self.hours, HOUR)):
+            start = int(at // width) * width
+            rollup = buckets.get(start)
+            if rollup is None:
+                rollup = buckets[start] = Rollup()
+            rollup.add(status, duration_ms)
+
+    def prune(self, now: float) -> None:
+        for buckets, retention in ((self.minutes, MINUTE_RETENTION), (self.hours, HOUR_RETENTION)):
+            # Buckets are created in (almost) time order, so old ones come first
+            while buckets:
+                start = next(iter(buckets))
+                if start >= now - retention:
+                    break
+                del buckets[start]
+
+
+class ExecutionAnalytics:
+    """Rollups of finished executions for every workflow."""
+
+    def __init__(self) -> None:
+        self.workflows: Dict[str, WorkflowRollups] = {}
+
+    def record(self, workflow_id: str, status: str, duration_ms: Optional[float], at: float) -> None:
+        rollups = self.workflows.get(workflow_id)
+        if rollups is None:
+            rollups = self.workflows[workflow_id] = WorkflowRollups()
+        rollups.add(at, status, duration_ms)
+        rollups.prune(at)
+
+    def forget(self, workflow_id: str) -> None:
+        self.workflows.pop(workflow_id, None)
+
+    def resolution(self, since: float, now: float) -> int:
+        """Bucket width that covers ``since``: minutes while retained, else hours."""
+        return MINUTE if since >= now - MINUTE_RETENTION else HOUR
+
+    def query(
+        self,
+        workflow_ids: Optional[Iterable[str]],
+        since: float,
+        until: float,
+        width: int,
+        series: bool = False,
+    ) -> Dict[str, Any]:
+        """Merge the ``width`` buckets starting in ``[since, until)``.
+
+        ``since`` is rounded down to a bucket boundary. Without
+        ``workflow_ids``, every workflow with executions in range is included.
+        """
+        ids: List[str] = list(workflow_ids) if workflow_ids is not None else list(self.workflows)
+        total = Rollup()
+        result: Dict[str, Any] = {}
+        starts = range(int(since // width) * width, int(until), width)
+        for workflow_id in ids:
+            rollups = self.workflows.get(workflow_id)
+            merged = Rollup()
+            points = []
+            if rollups is not None:
+                buckets = rollups.minutes if width == MINUTE else rollups.hours
+                if len(buckets) < len(starts):
+                    keys = sorted(k for k in buckets if starts.start <= k < starts.stop)
+                else:
+                    keys = [k for k in starts if k in buckets]
+                for start in keys:
+                    rollup = buckets[start]
+                    merged.merge(rollup)
+                    if series:
+                        points.append({"start": start, **rollup.to_dict()})
+            if workflow_ids is None and not merged.count:
+                continue
+            total.merge(merged)
+            summary = merged.to_dict()
+            if series:
+                summary["series"] = points
+            result[workflow_id] = summary
+        return {"total": total.to_dict(), "workflows": result}
+
+
+analytics = ExecutionAnalytics()
+
+
+async def deliver_executions(messages: List[Dict[str, Any]]) -> None:
+    """Event bus fan-in: fold finished executions into the rollups."""
+    for message in messages:
+        if message.get("event") == FINAL_EVENT:
+            analytics.record(
+                message["workflow_id"],
+                message.get("status") or "unknown",
+                message.get("duration_ms"),
+                message.get("timestamp") or 0.0,
+            )
+
+
+events.bus.subscribe(EXECUTION_CHANNEL, deliver_executions)
@@ -0,0 +1,326 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Columnar tables for passing record sets between nodes.
+
+A ``Table`` stores each column as one contiguous, typed buffer instead of a
+list of per-row dicts. Buffers follow the Arrow layout (fixed-width values;
+strings as int64 offsets plus UTF-8 data), so they convert to NumPy or
+pyarrow without copying when those libraries are installed.
+
+Tables are immutable. Inside a process they are passed between nodes by
+reference and ``select``/``slice`` return views over the same buffers. For
+process-pool nodes, tables are written once to a memory-mapped file
+(``SharedTable``) that the worker maps instead of unpickling row objects;
+tables returned by the worker come back the same way.
+
+Supported column types are ``int64``, ``float64``, ``bool`` and ``string``;
+null values are not supported.
+"""
+
+import mmap
+import os
+import secrets
+import tempfile
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DTYPES = {"int64": "q", "float64": "d", "bool": "B", "string": "B"}
+ALIGNMENT = 8
+
+# Memory-mapped files live in RAM-backed /dev/shm where available
+SHARED_DIR = os.getenv("COLUMNAR_SHARED_DIR") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+
+
+def infer_dtype(values: Sequence[Any]) -> str:
+    for value in values:
+        if isinstance(value, bool):
+            return "bool"
+        if isinstance(value, int):
+            return "int64"
+        if isinstance(value, float):
+            return "float64"
+        if isinstance(value, str):
+            return "string"
+        raise TypeError(f"Unsupported column value {value!r}")
+    return "string"
+
+
+class Column:
+    """A typed, immutable column buffer."""
+
+    __slots__ = ("dtype", "data", "offsets")
+
+    def __init__(self, dtype: str, data: memoryview, offsets: Optional[memoryview] = None) -> None:
+        if dtype not in DTYPES:
+            raise TypeError(f"Unsupported column type {dtype!r}")
+        if (dtype == "string") != (offsets is not None):
+            raise ValueError("String columns need offsets; other columns must not have them")
+        self.dtype = dtype
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any], dtype: Optional[str] = None) -> "Column":
+        dtype = dtype or infer_dtype(values)
+        if dtype == "string":
+            encoded = [value.encode() for value in values]
+            offsets = array("q", [0])
+            position = 0
+            for item in encoded:
+                position += len(item)
+                offsets.append(position)
+            return cls(dtype, memoryview(b"".join(encoded)), memoryview(offsets))
+        try:
+            return cls(dtype, memoryview(array(DTYPES[dtype], values)))
+        except TypeError as e:
+            raise TypeError(f"Column values do not fit {dtype}: {e}") from e
+
+    def __len__(self) -> int:
+        if self.offsets is not None:
+            return len(self.offsets) - 1
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+        if self.offsets is not None:
+            return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode()
+        value = self.data[index]
+        return bool(value) if self.dtype == "bool" else value
+
+    @property
+    def nbytes(self) -> int:
+        if self.offsets is not None:
+            return self.offsets.nbytes + self.offsets[-1] - self.offsets[0]
+        return self.data.nbytes
+
+    def to_list(self) -> List[Any]:
+        if self.offsets is not None:
+            return [self[i] for i in range(len(self))]
+        values = self.data.tolist()
+        return [bool(v) for v in values] if self.dtype == "bool" else values
+
+    def slice(self, start: int, stop: int) -> "Column":
+        """Rows ``start:stop`` as a view over the same buffers."""
+        if self.offsets is not None:
+            return Column(self.dtype, self.data, self.offsets[start:stop + 1])
+        return Column(self.dtype, self.data[start:stop])
+
+    def buffers(self) -> Tuple[memoryview, Optional[memoryview]]:
+        """The (data, offsets) buffers; string data is trimmed to this column's rows."""
+        if self.offsets is not None:
+            return self.data[self.offsets[0]:self.offsets[-1]], self.offsets
+        return self.data, None
+
+    def to_numpy(self) -> Any:
+        """Zero-copy NumPy array (requires numpy; string columns are copied)."""
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("Column.to_numpy() requires numpy to be installed") from e
+        if self.dtype == "string":
+            return np.array(self.to_list(), dtype=object)
+        return np.frombuffer(self.data, dtype={"int64": np.int64, "float64": np.float64, "bool": np.bool_}[self.dtype])
+
+    def to_arrow(self) -> Any:
+        """Zero-copy pyarrow array (requires pyarrow; bool columns are bit-packed)."""
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("Column.to_arrow() requires pyarrow to be installed") from e
+        if self.dtype == "bool":
+            return pa.array(self.to_list(), type=pa.bool_())
+        if self.dtype == "string":
+            offsets = array("q", (o - self.offsets[0] for o in self.offsets)) if self.offsets[0] else self.offsets
+            data, _ = self.buffers()
+            return pa.Array.from_buffers(pa.large_string(), len(self), [None, pa.py_buffer(offsets), pa.py_buffer(data)])
+        arrow_type = {"int64": pa.int64(), "float64": pa.float64()}[self.dtype]
+        return pa.Array.from_buffers(arrow_type, len(self), [None, pa.py_buffer(self.data)])
+
+
+class Table:
+    """An immutable set of equal-length named columns."""
+
+    def __init__(self, columns: Mapping[str, Column]) -> None:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self.columns: Dict[str, Column] = dict(columns)
+        self.num_rows = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_pydict(cls, data: Mapping[str, Sequence[Any]], schema: Optional[Mapping[str, str]] = None) -> "Table":
+        schema = schema or {}
+        return cls({name: Column.from_values(values, schema.get(name)) for name, values in data.items()})
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], schema: Optional[Mapping[str, str]] = None) -> "Table":
+        records = list(records)
+        names = list(schema) if schema else list(records[0]) if records else []
+        return cls.from_pydict({name: [record[name] for record in records] for name in names}, schema)
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Table) and self.schema == other.schema and self.to_pydict() == other.to_pydict()
+
+    def __repr__(self) -> str:
+        return f"Table(num_rows={self.num_rows}, schema={self.schema})"
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.columns)
+
+    @property
+    def schema(self) -> Dict[str, str]:
+        return {name: column.dtype for name, column in self.columns.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns.values())
+
+    def select(self, names: Sequence[str]) -> "Table":
+        return Table({name: self.columns[name] for name in names})
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "Table":
+        start, stop, _ = slice(start, stop).indices(self.num_rows)
+        return Table({name: column.slice(start, stop) for name, column in self.columns.items()})
+
+    def to_pydict(self) -> Dict[str, List[Any]]:
+        return {name: column.to_list() for name, column in self.columns.items()}
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        columns = self.to_pydict()
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+    def share(self, directory: Optional[str] = None) -> "SharedTable":
+        """Write the table to a memory-mapped file other processes can map."""
+        path = os.path.join(directory or SHARED_DIR, f"zqautonxg-{os.getpid()}-{secrets.token_hex(8)}.cols")
+        layout = []
+        position = 0
+        with open(path, "wb") as f:
+            for name, column in self.columns.items():
+                entry: List[Any] = [name, column.dtype]
+                for buffer in column.buffers():
+                    if buffer is None:
+                        entry.extend([0, 0])
+                        continue
+                    padding = -position % ALIGNMENT
+                    f.write(b"\0" * padding)
+                    position += padding
+                    f.write(buffer)
+                    entry.extend([position, buffer.nbytes])
+                    position += buffer.nbytes
+                layout.append(tuple(entry))
+        return SharedTable(path, layout)
+
+    def __reduce__(self) -> Any:
+        # Pickle each column as raw buffers rather than per-row objects
+        state = []
+        for name, column in self.columns.items():
+            data, offsets = column.buffers()
+            state.append((name, column.dtype, data.tobytes(), offsets.tobytes() if offsets is not None else None))
+        return _unpickle_table, (state,)
+
+
+def _unpickle_table(state: List[Tuple[str, str, bytes, Optional[bytes]]]) -> Table:
+    columns = {}
+    for name, dtype, data, offsets in state:
+        data_view = memoryview(data).cast(DTYPES[dtype])
+        offsets_view = memoryview(offsets).cast("q") if offsets is not None else None
+        if offsets_view is not None and offsets_view[0]:
+            offsets_view = memoryview(array("q", (o - offsets_view[0] for o in offsets_view)))
+        columns[name] = Column(dtype, data_view, offsets_view)
+    return Table(columns)
+
+
+def concat_tables(tables: Sequence[Table]) -> Table:
+    """Rows of ``tables`` in order, as one table built from their column buffers."""
+    if not tables:
+        return Table({})
+    schema = tables[0].schema
+    for table in tables[1:]:
+        if table.schema != schema:
+            raise ValueError(f"Cannot concatenate tables with schemas {schema} and {table.schema}")
+    columns = {}
+    for name, dtype in schema.items():
+        parts = [table.columns[name] for table in tables]
+        data = bytearray()
+        offsets: Optional[array] = array("q", [0]) if dtype == "string" else None
+        for column in parts:
+            buffer, column_offsets = column.buffers()
+            if offsets is not None and column_offsets is not None:
+                shift = len(data) - column_offsets[0]
+                offsets.extend(offset + shift for offset in column_offsets[1:])
+            data += buffer
+        data_view = memoryview(data).cast(DTYPES[dtype])
+        columns[name] = Column(dtype, data_view, memoryview(offsets) if offsets is not None else None)
+    return Table(columns)
+
+
+class SharedTable:
+    """Picklable handle to a table in a memory-mapped file."""
+
+    def __init__(self, path: str, layout: List[Tuple[Any, ...]]) -> None:
+        self.path = path
+        self.layout = layout
+
+    def open(self) -> Table:
+        """Map the file read-only; the returned table's buffers are views on it."""
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            mapped = memoryview(mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)) if size else memoryview(b"")
+        columns = {}
+        for name, dtype, data_at, data_len, offsets_at, offsets_len in self.layout:
+            data = mapped[data_at:data_at + data_len].cast(DTYPES[dtype])
+            offsets = None
+            if dtype == "string":
+                offsets = mapped[offsets_at:offsets_at + offsets_len].cast("q")
+                if offsets[0]:
+                    offsets = memoryview(array("q", (o - offsets[0] for o in offsets)))
+            columns[name] = Column(dtype, data, offsets)
+        return Table(columns)
+
+    def unlink(self) -> None:
+        """Remove the file; existing mappings stay valid until released."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def share_tables(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Replace top-level ``Table`` values with ``SharedTable`` handles."""
+    return {key: value.share() if isinstance(value, Table) else value for key, value in values.items()}
+
+
+def open_tables(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map top-level ``SharedTable`` handles back to tables."""
+    return {key: value.open() if isinstance(value, SharedTable) else value for key, value in values.items()}
+
+
+def release_tables(values: Mapping[str, Any]) -> None:
+    for value in values.values():
+        if isinstance(value, SharedTable):
+            value.unlink()
+
+
+def call_with_shared_tables(handler: Any, node: Any, inputs: Dict[str, Any]) -> Any:
+    """Process-pool entry point: map input tables, run ``handler``, share its output table."""
+    result = handler(node, open_tables(inputs))
+    return result.share() if isinstance(result, Table) else result
+
+
+def jsonable(value: Any) -> Any:
+    """``value`` with tables converted to column dicts for JSON responses."""
+    if isinstance(value, Table):
+        return value.to_pydict()
+    if isinstance(value, dict):
+        return {key: jsonable(item) for key, item in value.items()}
+    return value
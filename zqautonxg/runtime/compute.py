@@ -0,0 +1,142 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Compute pools for CPU-bound node types.
+
+Node types registered with ``executor="process"`` run in a long-lived
+process pool so heavy work never blocks the event loop; ``executor="thread"``
+uses a thread pool for work that releases the GIL (hashing, compression,
+numeric libraries, blocking I/O). Workers are created on first use and reused
+for the life of the app.
+
+Each pool admits at most one task per worker; further submissions wait in an
+asyncio queue, which is what the queue-depth gauge reports. Handlers for the
+process pool must be importable module-level functions, and their arguments
+and results must be picklable.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger("zqautonxg.runtime.compute")
+
+CPU_COUNT = os.cpu_count() or 1
+PROCESS_WORKERS = int(os.getenv("COMPUTE_PROCESS_WORKERS") or CPU_COUNT)
+THREAD_WORKERS = int(os.getenv("COMPUTE_THREAD_WORKERS") or min(32, CPU_COUNT + 4))
+
+POOL_WORKERS = Gauge("zqautonxg_compute_pool_workers", "Configured compute pool workers", ["pool"])
+POOL_BUSY = Gauge("zqautonxg_compute_pool_busy_workers", "Compute pool workers running a task", ["pool"])
+POOL_QUEUE_DEPTH = Gauge("zqautonxg_compute_pool_queue_depth", "Tasks waiting for a compute pool worker", ["pool"])
+POOL_UTILIZATION = Gauge("zqautonxg_compute_pool_utilization", "Busy / configured compute pool workers", ["pool"])
+POOL_TASKS = Counter("zqautonxg_compute_pool_tasks_total", "Tasks run on a compute pool", ["pool", "outcome"])
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+class ComputePool:
+    """An executor plus admission control and metrics."""
+
+    def __init__(self, kind: str, workers: int) -> None:
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown compute pool {kind!r}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.executor: Optional[Executor] = None
+        self.busy = 0
+        self.waiting = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        POOL_WORKERS.labels(pool=kind).set(self.workers)
+
+    def _executor(self) -> Executor:
+        if self.executor is None:
+            if self.kind == "process":
+                # Imported here to keep multiprocessing out of app startup
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # spawn: never fork a process that is running an event loop
+                self.executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="zq-compute")
+            logger.info(f"Started {self.kind} compute pool with {self.workers} worker(s)")
+        return self.executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _update_gauges(self) -> None:
+        POOL_BUSY.labels(pool=self.kind).set(self.busy)
+        POOL_QUEUE_DEPTH.labels(pool=self.kind).set(self.waiting)
+        POOL_UTILIZATION.labels(pool=self.kind).set(self.busy / self.workers)
+
+    async def submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on a pool worker and return its result."""
+        slots = self._semaphore()
+        self.waiting += 1
+        self._update_gauges()
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.busy += 1
+        self._update_gauges()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor(), func, *args)
+        except BrokenExecutor:
+            # A worker died (e.g. OOM-killed); replace the pool for later tasks
+            POOL_TASKS.labels(pool=self.kind, outcome="broken").inc()
+            logger.error(f"{self.kind} compute pool broke; restarting it")
+            self.shutdown(wait=False)
+            raise
+        except Exception:
+            POOL_TASKS.labels(pool=self.kind, outcome="error").inc()
+            raise
+        finally:
+            self.busy -= 1
+            slots.release()
+            self._update_gauges()
+        POOL_TASKS.labels(pool=self.kind, outcome="ok").inc()
+        return result
+
+    async def warm(self) -> None:
+        """Start every worker now instead of on the first tasks."""
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm) for _ in range(self.workers)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+            self.executor = None
+
+
+pools: Dict[str, ComputePool] = {
+    "process": ComputePool("process", PROCESS_WORKERS),
+    "thread": ComputePool("thread", THREAD_WORKERS),
+}
+
+
+async def submit(kind: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func(*args)`` on the ``process`` or ``thread`` pool."""
+    return await pools[kind].submit(func, *args)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop all compute pools."""
+    for pool in pools.values():
+        pool.shutdown(wait=wait)
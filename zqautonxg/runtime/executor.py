@@ -0,0 +1,343 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Workflow graph executor.
+
+Runs the nodes of a workflow in dependency order. A node starts as soon as
+all of its upstream nodes have finished, with at most
+``MAX_NODE_CONCURRENCY`` nodes running at once. Every node run is recorded as
+a span with its queue wait, attempts and input/output sizes. Nodes that opt
+in to memoization reuse cached outputs (see ``runtime.memo``). When a node
+fails, or the run itself is cancelled, nodes still running are cancelled.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution, WorkflowNode
+from zqautonxg.observability.tracing import Span, critical_path, export_spans
+from zqautonxg.runtime.columnar import Table, jsonable
+from zqautonxg.runtime.memo import MISS, cache_key, cache_ttl, node_cache
+from zqautonxg.runtime.nodes import get_node_type
+from zqautonxg.runtime.progress import ProgressPublisher, current_publisher
+
+logger = logging.getLogger("zqautonxg.runtime.executor")
+
+MAX_NODE_CONCURRENCY = int(os.getenv("MAX_NODE_CONCURRENCY", 32))
+
+
+class GraphError(ValueError):
+    """Raised when a workflow graph cannot be executed."""
+
+
+class NodeExecutionError(RuntimeError):
+    """Raised when a node fails after exhausting its retries."""
+
+    def __init__(self, node_id: str, error: BaseException) -> None:
+        super().__init__(f"Node {node_id} failed: {type(error).__name__}: {error}")
+        self.node_id = node_id
+        self.error = error
+
+
+def build_graph(workflow: Workflow) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Return (predecessors, successors) by node id, rejecting invalid graphs."""
+    predecessors: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+    successors: Dict[str, List[str]] = {node.id: [] for node in workflow.nodes}
+    if len(predecessors) != len(workflow.nodes):
+        raise GraphError("Workflow contains duplicate node ids")
+
+    for edge in workflow.edges:
+        if edge.source not in successors or edge.target not in predecessors:
+            raise GraphError(f"Edge {edge.id} references an unknown node")
+        successors[edge.source].append(edge.target)
+        predecessors[edge.target].append(edge.source)
+
+    # Kahn's algorithm: every node must be reachable in topological order
+    indegree = {node_id: len(preds) for node_id, preds in predecessors.items()}
+    ready = [node_id for node_id, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        node_id = ready.pop()
+        visited += 1
+        for succ in successors[node_id]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                ready.append(succ)
+    if visited != len(predecessors):
+        raise GraphError("Workflow graph contains a cycle")
+
+    return predecessors, successors
+
+
+def payload_size(value: Any) -> Optional[int]:
+    """Bytes of Table data in a node payload, or ``None`` if it holds no Table.
+
+    Only tables know their size without walking them; other payloads are
+    not measured, so spans carry no byte counts for them.
+    """
+    if isinstance(value, Table):
+        return value.nbytes
+    if isinstance(value, dict):
+        sizes = [item.nbytes for item in value.values() if isinstance(item, Table)]
+        if sizes:
+            return sum(sizes)
+    return None
+
+
+class ExecutionTrace:
+    """Spans recorded for one execution plus its critical path."""
+
+    def __init__(
+        self,
+        execution: WorkflowExecution,
+        spans: List[Span],
+        predecessors: Dict[str, List[str]],
+    ) -> None:
+        self.execution_id = execution.id
+        self.workflow_id = execution.workflow_id
+        self.spans = spans
+        self.critical_path = critical_path(spans, predecessors)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "execution_id": str(self.execution_id),
+            "workflow_id": str(self.workflow_id),
+            "trace_id": self.spans[0].trace_id if self.spans else None,
+            "spans": [span.to_dict() for span in self.spans],
+            "critical_path": self.critical_path,
+        }
+
+
+class WorkflowRun:
+    """State of a single in-progress execution."""
+
+    def __init__(
+        self,
+        workflow: Workflow,
+        execution: WorkflowExecution,
+        max_concurrency: int,
+        progress: Optional[ProgressPublisher] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> None:
+        self.workflow = workflow
+        self.execution = execution
+        self.progress = progress or ProgressPublisher(str(execution.id), str(workflow.id))
+        self.nodes = {node.id: node for node in workflow.nodes}
+        self.predecessors, self.successors = build_graph(workflow)
+        self.remaining = {node_id: len(preds) for node_id, preds in self.predecessors.items()}
+        # Inputs of the root nodes, for runs nested in another node
+        self.inputs = inputs or {}
+        self.outputs: Dict[str, Any] = {}
+        # Runs nested in another node may share their parent's node slots
+        self.semaphore = semaphore or asyncio.Semaphore(max(1, max_concurrency))
+        self.root = Span(
+            "workflow.execute",
+            execution.id.hex,
+            attributes={
+                "zq.workflow.id": str(workflow.id),
+                "zq.execution.id": str(execution.id),
+                "zq.node.count": len(workflow.nodes),
+            },
+        )
+        self.spans: List[Span] = [self.root]
+        self.failure: Optional[NodeExecutionError] = None
+        self.cached: List[str] = []
+        self.active = 0
+        self.tasks: Set["asyncio.Task[None]"] = set()
+        self.finished = asyncio.Event()
+
+    def _start(self, node_id: str, ready_ns: int) -> None:
+        self.active += 1
+        task = asyncio.create_task(self._run_from(node_id, ready_ns))
+        self.tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: "asyncio.Task[None]") -> None:
+        # A callback rather than a finally: tasks cancelled before they
+        # started never run their coroutine
+        self.tasks.discard(task)
+        self.active -= 1
+        if self.active == 0:
+            self.finished.set()
+
+    def _cancel_tasks(self) -> None:
+        current = asyncio.current_task()
+        for task in self.tasks:
+            if task is not current:
+                task.cancel()
+
+    async def _run_from(self, node_id: Optional[str], ready_ns: int) -> None:
+        """Run ``node_id``, then keep running a newly ready successor inline.
+
+        Continuing in the same task avoids a task per node on long chains.
+        """
+        while node_id is not None and self.failure is None:
+            try:
+                await self._run_node(self.nodes[node_id], ready_ns)
+            except NodeExecutionError as e:
+                self.failure = self.failure or e
+                self._cancel_tasks()  # the execution has failed; stop the other branches
+                break
+            if self.failure is not None:
+                break
+
+            ready_ns = time.time_ns()
+            ready = []
+            for succ in self.successors[node_id]:
+                self.remaining[succ] -= 1
+                if self.remaining[succ] == 0:
+                    ready.append(succ)
+            node_id = ready[0] if ready else None
+            for succ in ready[1:]:
+                self._start(succ, ready_ns)
+
+    async def _run_node(self, node: WorkflowNode, ready_ns: int) -> None:
+        async with self.semaphore:
+            node_type = get_node_type(node.type)
+            preds = self.predecessors[node.id]
+            inputs = {pred: self.outputs[pred] for pred in preds} if preds else dict(self.inputs)
+            span = Span(
+                f"node.{node.type}",
+                self.root.trace_id,
+                parent_span_id=self.root.span_id,
+                attributes={
+                    "zq.node.id": node.id,
+                    "zq.node.type": node.type,
+                    "zq.node.executor": node_type.executor,
+                    "zq.node.queue_wait_ms": (time.time_ns() - ready_ns) / 1e6,
+                },
+            )
+            bytes_in = payload_size(inputs)
+            if bytes_in is not None:
+                span.attributes["zq.node.bytes_in"] = bytes_in
+            self.spans.append(span)
+            await self.progress.emit("node_started", node_id=node.id, node_type=node.type)
+
+            ttl = cache_ttl(node.data)
+            key = cache_key(node.type, node.data, inputs) if ttl is not None else None
+            output = await node_cache.get(key) if key is not None else MISS
+            if output is not MISS:
+                self.cached.append(node.id)
+                span.attributes["zq.node.cache"] = "hit"
+                attempts = 0
+            else:
+                retries = int(node.data.get("retries", node_type.retries))
+                attempts = 0
+                while True:
+                    attempts += 1
+                    try:
+                        output = await node_type.run(node, inputs)
+                        break
+                    except asyncio.CancelledError:
+                        span.end(error="Cancelled")
+                        raise
+                    except Exception as e:
+                        if attempts > retries:
+                            span.attributes["zq.node.attempts"] = attempts
+                            span.end(error=f"{type(e).__name__}: {e}")
+                            await self.progress.emit(
+                                "node_finished", node_id=node.id, status="failed",
+                                attempts=attempts, duration_ms=span.duration_ms, error=span.error,
+                            )
+                            raise NodeExecutionError(node.id, e) from e
+                        logger.warning(f"Node {node.id} attempt {attempts} failed: {e}; retrying")
+                if key is not None and ttl is not None:
+                    await node_cache.put(key, output, ttl)
+                    span.attributes["zq.node.cache"] = "miss"
+
+            self.outputs[node.id] = output
+            span.attributes["zq.node.attempts"] = attempts
+            bytes_out = payload_size(output)
+            if bytes_out is not None:
+                span.attributes["zq.node.bytes_out"] = bytes_out
+            span.end()
+            await self.progress.emit(
+                "node_finished", node_id=node.id, status="success", attempts=attempts,
+                cached=span.attributes.get("zq.node.cache") == "hit", duration_ms=span.duration_ms,
+            )
+
+    async def run(self) -> None:
+        roots = [node_id for node_id, count in self.remaining.items() if count == 0]
+        if roots:
+            # Node tasks inherit the publisher, so nodes can report their own progress
+            token = current_publisher.set(self.progress)
+            try:
+                ready_ns = time.time_ns()
+                for node_id in roots:
+                    self._start(node_id, ready_ns)
+            finally:
+                current_publisher.reset(token)
+            try:
+                await self.finished.wait()
+            finally:
+                if self.tasks:
+                    # Cancelled from outside (e.g. a map node whose other chunk
+                    # failed): stop node work before returning
+                    tasks = list(self.tasks)
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def run_workflow(
+    workflow: Workflow,
+    execution: WorkflowExecution,
+    max_concurrency: int = MAX_NODE_CONCURRENCY,
+) -> ExecutionTrace:
+    """Execute ``workflow``, updating ``execution`` in place."""
+    execution.status = "running"
+    started = time.perf_counter()
+    progress = ProgressPublisher(str(execution.id), str(workflow.id))
+    await progress.emit("execution_started", node_count=len(workflow.nodes))
+    predecessors: Dict[str, List[str]] = {}
+    try:
+        run = WorkflowRun(workflow, execution, max_concurrency, progress)
+    except GraphError as e:
+        root = Span("workflow.execute", execution.id.hex, attributes={"zq.workflow.id": str(workflow.id)})
+        root.end(error=str(e))
+        spans = [root]
+        failure: Optional[Exception] = e
+        executed = 0
+        cached: List[str] = []
+        sinks: Dict[str, Any] = {}
+    else:
+        await run.run()
+        run.root.end(error=str(run.failure) if run.failure else None)
+        spans = run.spans
+        failure = run.failure
+        predecessors = run.predecessors
+        executed = len(run.outputs)
+        cached = run.cached
+        sinks = {
+            node_id: jsonable(run.outputs[node_id])
+            for node_id, succs in run.successors.items()
+            if not succs and node_id in run.outputs
+        }
+
+    execution.completed_at = datetime.utcnow()
+    execution.duration_ms = round((time.perf_counter() - started) * 1000)
+    execution.status = "failed" if failure else "success"
+    execution.error = str(failure) if failure else None
+    execution.result = {
+        "status": "failed" if failure else "completed",
+        "nodes_executed": executed,
+        "cached_nodes": cached,
+        "outputs": sinks,
+    }
+
+    await progress.emit(
+        "execution_finished",
+        status=execution.status,
+        duration_ms=execution.duration_ms,
+        error=execution.error,
+        nodes_executed=executed,
+        cached_nodes=cached,
+    )
+    export_spans(spans)
+    return ExecutionTrace(execution, spans, predecessors)
@@ -0,0 +1,279 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Map (fan-out) node type.
+
+A ``map`` node splits a collection into chunks, runs a child node or an
+inline sub-workflow on each chunk and reduces the chunk outputs with a
+combiner, so bulk inputs need one node instead of one node per item::
+
+    {"type": "map", "data": {
+        "source": "fetch", "path": "records",  # collection in an upstream output
+        "chunk_size": 1000, "concurrency": 4, "chunk_retries": 2,
+        "node": {"type": "transform", "data": {...}},
+        "combiner": "concat"
+    }}
+
+The collection is ``data.items``, else the upstream output named by
+``source`` (required with several upstream nodes), optionally narrowed by
+the dotted ``path``. Lists are sliced and ``columnar.Table`` inputs are
+sliced without copying. Children receive ``{"items": chunk}`` as inputs;
+with ``workflow: {"nodes": [...], "edges": [...]}`` every root node of the
+sub-workflow does, and the chunk's output is that of its sink node (a dict
+by node id if there are several).
+
+At most ``concurrency`` chunks (capped by ``MAP_MAX_CONCURRENCY``) run at
+once, each by a worker that slices its next chunk only when it starts it,
+so memory holds the in-flight chunks rather than all of them; workers also
+wait while ``concurrency`` finished outputs are queued behind a slow
+earlier chunk. Sub-workflow
+nodes share the same bound: at most ``concurrency`` of them run at once
+across all chunks. A failed chunk is retried on its own up to
+``chunk_retries`` times; a chunk that still fails fails the node
+(``retries`` on the map node itself reruns the whole collection, as for
+any node). Each finished chunk emits a ``chunk_finished`` progress event
+(with its output if ``stream_outputs`` is set), and outputs are folded into
+the combiner in chunk order as soon as their turn comes.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from zqautonxg.models.workflow import Workflow, WorkflowExecution, WorkflowNode
+from zqautonxg.runtime.columnar import Table, concat_tables, jsonable
+from zqautonxg.runtime.executor import WorkflowRun, build_graph
+from zqautonxg.runtime.nodes import get_node_type, register_node_type
+from zqautonxg.runtime.progress import ProgressPublisher, current_publisher
+
+logger = logging.getLogger("zqautonxg.runtime.fanout")
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("MAP_CHUNK_SIZE", 1000))
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = int(os.getenv("MAP_MAX_CONCURRENCY", 16))
+
+
+class ChunkError(RuntimeError):
+    """Raised when a chunk fails after exhausting its retries."""
+
+    def __init__(self, index: int, attempts: int, error: BaseException) -> None:
+        super().__init__(f"chunk {index} failed after {attempts} attempt(s): {type(error).__name__}: {error}")
+        self.index = index
+        self.error = error
+
+
+class Combiner:
+    """Folds chunk outputs, in chunk order, into the node output."""
+
+    def __init__(
+        self,
+        name: str,
+        initial: Callable[[], Any],
+        add: Callable[[Any, Any], Any],
+        finish: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.name = name
+        self.initial = initial
+        self.add = add
+        self.finish = finish or (lambda value: value)
+
+
+combiners: Dict[str, Combiner] = {}
+
+
+def register_combiner(
+    name: str,
+    initial: Callable[[], Any],
+    add: Callable[[Any, Any], Any],
+    finish: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Register a combiner usable as ``combiner: name`` on map nodes."""
+    combiners[name] = Combiner(name, initial, add, finish)
+
+
+def _concat(parts: List[Any], output: Any) -> List[Any]:
+    if isinstance(output, list):
+        parts.extend(output)
+    else:
+        parts.append(output)
+    return parts
+
+
+def _finish_concat(parts: List[Any]) -> Any:
+    if parts and all(isinstance(part, Table) for part in parts):
+        return concat_tables(parts)
+    return parts
+
+
+def _collect(parts: List[Any], output: Any) -> List[Any]:
+    parts.append(output)
+    return parts
+
+
+def _merge(merged: Dict[str, Any], output: Dict[str, Any]) -> Dict[str, Any]:
+    merged.update(output)
+    return merged
+
+
+# Lists are flattened, tables concatenated, anything else collected
+register_combiner("concat", list, _concat, _finish_concat)
+register_combiner("collect", list, _collect)
+register_combiner("sum", lambda: 0, lambda total, output: total + output)
+register_combiner("merge", dict, _merge)
+
+
+class _QuietPublisher(ProgressPublisher):
+    """Sub-workflow runs report per chunk, not per node."""
+
+    __slots__ = ()
+
+    async def emit(self, event: str, **data: Any) -> None:
+        return None
+
+
+def _resolve(data: Dict[str, Any], inputs: Dict[str, Any]) -> Any:
+    if "items" in data:
+        collection = data["items"]
+    else:
+        source = data.get("source")
+        if source is None:
+            if len(inputs) != 1:
+                raise ValueError("map nodes need 'items', or 'source' with several upstream nodes")
+            source = next(iter(inputs))
+        if source not in inputs:
+            raise ValueError(f"map source {source!r} is not an upstream node")
+        collection = inputs[source]
+    for key in filter(None, str(data.get("path") or "").split(".")):
+        collection = collection[key]
+    if isinstance(collection, tuple):
+        collection = list(collection)
+    if not isinstance(collection, (list, Table)):
+        raise TypeError(f"map input must be a list or table, not {type(collection).__name__}")
+    return collection
+
+
+class MapRun:
+    """One execution of a map node."""
+
+    def __init__(self, node: WorkflowNode, inputs: Dict[str, Any]) -> None:
+        data = node.data
+        self.node = node
+        self.items = _resolve(data, inputs)
+        self.chunk_size = int(data.get("chunk_size", DEFAULT_CHUNK_SIZE))
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.total = -(-len(self.items) // self.chunk_size)
+        self.concurrency = max(1, min(int(data.get("concurrency", DEFAULT_CONCURRENCY)), MAX_CONCURRENCY))
+        name = data.get("combiner", "concat")
+        if name not in combiners:
+            raise ValueError(f"Unknown combiner {name!r}; expected one of {sorted(combiners)}")
+        self.combiner = combiners[name]
+        self.stream_outputs = bool(data.get("stream_outputs", False))
+
+        self.child: Optional[WorkflowNode] = None
+        self.workflow: Optional[Workflow] = None
+        if ("node" in data) == ("workflow" in data):
+            raise ValueError("map nodes need exactly one of 'node' or 'workflow'")
+        if "node" in data:
+            spec = data["node"]
+            self.child = WorkflowNode(
+                id=f"{node.id}.child", type=spec["type"], position={}, data=spec.get("data", {})
+            )
+            default_retries = get_node_type(self.child.type).retries
+        else:
+            self.workflow = Workflow.model_validate({"name": f"{node.id} (map)", **data["workflow"]})
+            build_graph(self.workflow)  # reject a broken sub-workflow before any chunk runs
+            default_retries = 0
+        self.retries = int(data.get("chunk_retries", default_retries))
+
+        self.progress = current_publisher.get()
+        self.slots = asyncio.Semaphore(self.concurrency)  # sub-workflow nodes running across chunks
+        self.next_chunk = 0
+        self.done: Dict[int, Any] = {}  # finished outputs waiting for their turn to be folded
+        self.folded_turn = asyncio.Condition()
+        self.folded = 0
+        self.accumulator = self.combiner.initial()
+
+    def _chunk(self, index: int) -> Any:
+        start = index * self.chunk_size
+        if isinstance(self.items, Table):
+            return self.items.slice(start, start + self.chunk_size)
+        return self.items[start:start + self.chunk_size]
+
+    async def _run_chunk(self, chunk: Any) -> Any:
+        if self.child is not None:
+            return await get_node_type(self.child.type).run(self.child, {"items": chunk})
+        assert self.workflow is not None
+        execution = WorkflowExecution(workflow_id=self.workflow.id)
+        run = WorkflowRun(
+            self.workflow, execution, max_concurrency=self.concurrency,
+            progress=_QuietPublisher(str(execution.id), str(self.workflow.id)),
+            inputs={"items": chunk}, semaphore=self.slots,
+        )
+        await run.run()
+        if run.failure is not None:
+            raise run.failure
+        sinks = {node_id: run.outputs[node_id] for node_id, succs in run.successors.items() if not succs}
+        return next(iter(sinks.values())) if len(sinks) == 1 else sinks
+
+    async def _worker(self) -> None:
+        while self.next_chunk < self.total:
+            if len(self.done) >= self.concurrency:
+                # Don't run ahead of a slow chunk that holds back folding
+                async with self.folded_turn:
+                    await self.folded_turn.wait_for(lambda: len(self.done) < self.concurrency)
+                continue
+            index = self.next_chunk
+            self.next_chunk += 1
+            chunk = self._chunk(index)
+            started = time.perf_counter()
+            attempts = 0
+            while True:
+                attempts += 1
+                try:
+                    output = await self._run_chunk(chunk)
+                    break
+                except Exception as e:
+                    if attempts > self.retries:
+                        raise ChunkError(index, attempts, e) from e
+                    logger.warning(f"Map node {self.node.id} chunk {index} attempt {attempts} failed: {e}; retrying")
+            del chunk
+            self.done[index] = output
+            if self.folded in self.done:
+                while self.folded in self.done:
+                    self.accumulator = self.combiner.add(self.accumulator, self.done.pop(self.folded))
+                    self.folded += 1
+                async with self.folded_turn:
+                    self.folded_turn.notify_all()
+            if self.progress is not None:
+                event: Dict[str, Any] = {
+                    "node_id": self.node.id,
+                    "chunk": index,
+                    "chunks": self.total,
+                    "items": min(self.chunk_size, len(self.items) - index * self.chunk_size),
+                    "attempts": attempts,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+                if self.stream_outputs:
+                    event["output"] = jsonable(output)
+                await self.progress.emit("chunk_finished", **event)
+
+    async def run(self) -> Any:
+        workers = [asyncio.create_task(self._worker()) for _ in range(min(self.concurrency, self.total))]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return self.combiner.finish(self.accumulator)
+
+
+@register_node_type("map")
+async def map_node(node: WorkflowNode, inputs: Dict[str, Any]) -> Any:
+    """Split a collection into chunks, process them in parallel and combine the outputs."""
+    return await MapRun(node, inputs).run()
@@ -0,0 +1,227 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Content-addressed cache of node outputs.
+
+Nodes opt in with ``"cache": true`` in their ``data`` (and optionally
+``"cache_ttl"`` in seconds). The cache key is a SHA-256 over the node type,
+its ``data`` and its inputs, so a node re-run with the same configuration on
+the same upstream outputs is skipped and its previous output reused, across
+executions and workflows. The node's own id is not part of the key.
+
+Entries expire after their TTL and the in-memory cache evicts least recently
+used entries beyond ``max_entries`` / ``max_bytes``. With ``NODE_CACHE_DIR``
+set, entries are also written there (pickled) and survive restarts; only
+point it at a directory this service owns. Disk reads, writes and scans run
+in a worker thread so they never block the event loop.
+
+Cached outputs are shared, like outputs passed to downstream nodes, so node
+handlers must not mutate their inputs.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from zqautonxg.runtime.columnar import Table
+
+logger = logging.getLogger("zqautonxg.runtime.memo")
+
+DEFAULT_TTL = float(os.getenv("NODE_CACHE_TTL", 3600))
+MAX_ENTRIES = int(os.getenv("NODE_CACHE_MAX_ENTRIES", 10_000))
+MAX_BYTES = int(os.getenv("NODE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Control keys that do not change what a node computes
+IGNORED_DATA_KEYS = frozenset({"cache", "cache_ttl", "retries"})
+
+NODE_CACHE_REQUESTS = Counter("zqautonxg_node_cache_requests_total", "Node output cache lookups", ["result"])
+NODE_CACHE_ENTRIES = Gauge("zqautonxg_node_cache_entries", "Node outputs held in memory")
+NODE_CACHE_BYTES = Gauge("zqautonxg_node_cache_bytes", "Approximate size of cached node outputs")
+
+MISS = object()
+PRUNE_EVERY = 1000
+
+
+def _hash_table(table: Table) -> str:
+    digest = hashlib.sha256()
+    for name, column in table.columns.items():
+        digest.update(f"{name}:{column.dtype}:{len(column)}".encode())
+        for buffer in column.buffers():
+            if buffer is not None:
+                digest.update(buffer)
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, Table):
+        return {"__table__": _hash_table(value)}
+    raise TypeError(f"Cannot hash {type(value).__name__}")
+
+
+def cache_key(node_type: str, data: Dict[str, Any], inputs: Dict[str, Any]) -> Optional[str]:
+    """Stable key for a node run, or ``None`` if its payload cannot be hashed."""
+    config = {k: v for k, v in data.items() if k not in IGNORED_DATA_KEYS}
+    try:
+        encoded = json.dumps(
+            [node_type, config, inputs], sort_keys=True, separators=(",", ":"), default=_canonical
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def cache_ttl(data: Dict[str, Any]) -> Optional[float]:
+    """TTL requested by a node's ``data``, or ``None`` if it did not opt in."""
+    if not data.get("cache"):
+        return None
+    return float(data.get("cache_ttl", DEFAULT_TTL))
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, Table):
+        return value.nbytes
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class NodeCache:
+    """LRU cache of node outputs with per-entry expiry."""
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        max_bytes: int = MAX_BYTES,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self.bytes = 0
+        self._puts = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", f"{key}.pkl")
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self.entries.pop(key)
+        self.bytes -= size
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self._remove(key)
+        self.entries[key] = (value, expires_at, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+        NODE_CACHE_ENTRIES.set(len(self.entries))
+        NODE_CACHE_BYTES.set(self.bytes)
+
+    async def get(self, key: str) -> Any:
+        """Cached output for ``key``, or ``MISS``."""
+        now = time.time()
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self.entries.move_to_end(key)
+                NODE_CACHE_REQUESTS.labels(result="hit").inc()
+                return entry[0]
+            self._remove(key)
+        if self.directory:
+            value, expires_at = await asyncio.to_thread(self._load, key)
+            if value is not MISS and expires_at > time.time():
+                self._store(key, value, expires_at)
+                NODE_CACHE_REQUESTS.labels(result="hit").inc()
+                return value
+        NODE_CACHE_REQUESTS.labels(result="miss").inc()
+        return MISS
+
+    async def put(self, key: str, value: Any, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        self._store(key, value, expires_at)
+        if self.directory:
+            await asyncio.to_thread(self._save, key, value, expires_at)
+            self._puts += 1
+            if self._puts % PRUNE_EVERY == 0:
+                await self.prune()
+
+    def _load(self, key: str) -> Tuple[Any, float]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return MISS, 0.0
+        except Exception as e:
+            logger.warning(f"Dropping unreadable node cache entry {key}: {e}")
+            expires_at, value = 0.0, MISS
+        if expires_at <= time.time():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return MISS, 0.0
+        return value, expires_at
+
+    def _save(self, key: str, value: Any, expires_at: float) -> None:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except Exception as e:
+            logger.warning(f"Could not persist node cache entry {key}: {e}")
+
+    def _prune_directory(self) -> int:
+        removed = 0
+        for name in os.listdir(self.directory or ""):
+            if name.endswith(".pkl") and self._load(name[:-4])[0] is MISS:
+                removed += 1
+        return removed
+
+    def _clear_directory(self) -> None:
+        for name in os.listdir(self.directory or ""):
+            if name.endswith(".pkl"):
+                os.unlink(os.path.join(self.directory or "", name))
+
+    async def prune(self) -> int:
+        """Delete expired entries from memory and disk; returns how many were removed."""
+        now = time.time()
+        removed = 0
+        for key in [k for k, (_, expires_at, _) in self.entries.items() if expires_at <= now]:
+            self._remove(key)
+            removed += 1
+        NODE_CACHE_ENTRIES.set(len(self.entries))
+        NODE_CACHE_BYTES.set(self.bytes)
+        if self.directory:
+            removed += await asyncio.to_thread(self._prune_directory)
+        return removed
+
+    async def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+        NODE_CACHE_ENTRIES.set(0)
+        NODE_CACHE_BYTES.set(0)
+        if self.directory:
+            await asyncio.to_thread(self._clear_directory)
+
+
+# Process-wide cache used by the executor
+node_cache = NodeCache(directory=os.getenv("NODE_CACHE_DIR") or None)
@@ -0,0 +1,95 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Node type registry.
+
+A node type maps ``WorkflowNode.type`` to the coroutine that runs it. Handlers
+receive the node and the outputs of its upstream nodes keyed by node id, and
+return the node's output. Unknown types fall back to ``passthrough``.
+
+CPU-bound node types register a plain function with ``executor="process"``
+(or ``"thread"`` for GIL-releasing work) and are run on the compute pools
+instead of the event loop. Node outputs may be ``columnar.Table`` record sets,
+which are passed to downstream nodes by reference.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from zqautonxg.models.workflow import WorkflowNode
+from zqautonxg.runtime import columnar, compute
+
+NodeHandler = Callable[[WorkflowNode, Dict[str, Any]], Awaitable[Any]]
+SyncNodeHandler = Callable[[WorkflowNode, Dict[str, Any]], Any]
+
+EXECUTORS = ("async", "process", "thread")
+
+
+class NodeType:
+    """A registered node type."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Union[NodeHandler, SyncNodeHandler],
+        retries: int = 0,
+        executor: str = "async",
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"Node type {name}: executor must be one of {EXECUTORS}")
+        self.name = name
+        self.handler = handler
+        self.retries = retries
+        self.executor = executor
+
+    async def run(self, node: WorkflowNode, inputs: Dict[str, Any]) -> Any:
+        if self.executor == "async":
+            return await self.handler(node, inputs)
+        if self.executor == "thread":
+            return await compute.submit("thread", self.handler, node, inputs)
+        # Tables cross the process boundary as memory-mapped files
+        shared = columnar.share_tables(inputs)
+        try:
+            result = await compute.submit("process", columnar.call_with_shared_tables, self.handler, node, shared)
+        finally:
+            columnar.release_tables(shared)
+        if isinstance(result, columnar.SharedTable):
+            table = result.open()
+            result.unlink()
+            return table
+        return result
+
+
+node_types: Dict[str, NodeType] = {}
+
+
+def register_node_type(
+    name: str,
+    handler: Optional[Union[NodeHandler, SyncNodeHandler]] = None,
+    *,
+    retries: int = 0,
+    executor: str = "async",
+) -> Any:
+    """Register ``handler`` for node ``name``; usable as a decorator.
+
+    ``executor="process"`` and ``"thread"`` take a synchronous handler.
+    """
+
+    def register(func: Any) -> Any:
+        node_types[name] = NodeType(name, func, retries=retries, executor=executor)
+        return func
+
+    if handler is not None:
+        return register(handler)
+    return register
+
+
+def get_node_type(name: str) -> NodeType:
+    """Return the node type registered as ``name`` or ``passthrough``."""
+    return node_types.get(name) or node_types["passthrough"]
+
+
+@register_node_type("passthrough")
+async def passthrough(node: WorkflowNode, inputs: Dict[str, Any]) -> Any:
+    """Emit the node's configured data unchanged."""
+    return node.data
@@ -0,0 +1,131 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Execution progress events.
+
+The executor publishes ``execution_started``, ``node_started``,
+``node_finished`` and ``execution_finished`` events on the event bus (map
+nodes add ``chunk_finished``), so every worker (and, with the Redis bus,
+every instance) keeps a bounded buffer of recent events per execution.
+
+Each run of an execution (a queued job reclaimed after its lease expired
+runs again) numbers its events from 1 under its own run id; buffers drop
+redelivered ``(run, seq)`` pairs and give every event they keep the next
+buffer sequence number, which serves as its SSE event id for
+``Last-Event-ID`` resume. Workers receive events in publish order, so those
+ids agree between workers. A buffer evicted to make room for newer
+executions is closed, which ends the streams still reading it.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from zqautonxg import events
+
+EXECUTION_CHANNEL = "executions"
+MAX_EVENTS_PER_EXECUTION = 1000
+MAX_EXECUTION_STREAMS = 1000
+
+FINAL_EVENT = "execution_finished"
+
+
+class ExecutionEvents:
+    """Buffered events of one execution plus a wake-up for listeners."""
+
+    def __init__(self, max_events: int = MAX_EVENTS_PER_EXECUTION) -> None:
+        self.events: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=max_events)
+        self.last_id = 0
+        self.finished = False
+        self.closed = False
+        self.runs: Dict[str, int] = {}  # last sequence number seen per run
+        self._changed: Optional[asyncio.Event] = None
+
+    def append(self, run: str, seq: int, event: str, data: Dict[str, Any]) -> None:
+        if seq <= self.runs.get(run, 0):
+            return  # duplicate delivery
+        self.runs[run] = seq
+        self.last_id += 1
+        self.events.append((self.last_id, event, {**data, "id": self.last_id}))
+        if event == FINAL_EVENT:
+            self.finished = True
+        elif event == "execution_started":
+            self.finished = False  # a reclaimed job runs again
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def close(self) -> None:
+        """Stop buffering (evicted); listeners wake up and see ``closed``."""
+        self.closed = True
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    def changed(self) -> asyncio.Event:
+        """An event set by the next ``append``; created only when someone listens."""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def since(self, last_event_id: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        if last_event_id >= self.last_id:
+            return []
+        return [item for item in self.events if item[0] > last_event_id]
+
+
+execution_events: "OrderedDict[str, ExecutionEvents]" = OrderedDict()
+
+
+def get_events(execution_id: str, create: bool = False) -> Optional[ExecutionEvents]:
+    """Event buffer of ``execution_id``, optionally created while waiting for it to start."""
+    stream = execution_events.get(execution_id)
+    if stream is None and create:
+        stream = execution_events[execution_id] = ExecutionEvents()
+        while len(execution_events) > MAX_EXECUTION_STREAMS:
+            _, evicted = execution_events.popitem(last=False)
+            evicted.close()
+    return stream
+
+
+class ProgressPublisher:
+    """Numbers and publishes the events of one execution."""
+
+    __slots__ = ("execution_id", "workflow_id", "run", "seq")
+
+    def __init__(self, execution_id: str, workflow_id: str) -> None:
+        self.execution_id = execution_id
+        self.workflow_id = workflow_id
+        self.run = uuid.uuid4().hex
+        self.seq = 0
+
+    async def emit(self, event: str, **data: Any) -> None:
+        self.seq += 1
+        await events.bus.publish(EXECUTION_CHANNEL, {
+            "id": self.seq,
+            "run": self.run,
+            "event": event,
+            "execution_id": self.execution_id,
+            "workflow_id": self.workflow_id,
+            "timestamp": time.time(),
+            **data,
+        })
+
+
+# Publisher of the execution whose nodes run in the current context
+current_publisher: "ContextVar[Optional[ProgressPublisher]]" = ContextVar("current_publisher", default=None)
+
+
+async def deliver_progress(messages: List[Dict[str, Any]]) -> None:
+    """Event bus fan-in: buffer a batch of progress events for local listeners."""
+    for message in messages:
+        get_events(message["execution_id"], create=True).append(
+            message.get("run", ""), message["id"], message["event"], message
+        )
+
+
+events.bus.subscribe(EXECUTION_CHANNEL, deliver_progress)
@@ -0,0 +1,352 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Lease-based execution queue.
+
+Jobs live in the storage database, so any number of app instances sharing it
+can claim and run executions. The queue follows visibility-timeout semantics:
+
+* claiming a job leases it for ``lease_seconds`` by pushing its
+  ``available_at`` into the future and stamping a fresh ``lease_id``
+* the worker heartbeats to extend the lease while the execution runs
+* if the worker dies the lease expires and another worker reclaims the job
+  (at-least-once delivery); after ``max_attempts`` claims it is failed
+* completing or heartbeating with a stale ``lease_id`` is rejected, so a
+  worker that lost its lease cannot overwrite the new owner's result
+
+Claims rotate between workflows (the workflow claimed least recently goes
+first) so one workflow with a deep backlog cannot starve the others.
+
+Finished jobs drop their payload (the workflow snapshot) when they
+complete and are deleted ``QUEUE_RETENTION_SECONDS`` after finishing, by
+whichever worker purges first.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import secrets
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from prometheus_client import Counter
+
+from zqautonxg.storage import Database
+
+logger = logging.getLogger("zqautonxg.runtime.queue")
+
+DEFAULT_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", 30))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", 3))
+RETENTION_SECONDS = float(os.getenv("QUEUE_RETENTION_SECONDS", 86400))
+PURGE_INTERVAL = 60.0
+
+QUEUE_CLAIMS = Counter("zqautonxg_queue_claims_total", "Execution jobs claimed", ["reclaimed"])
+QUEUE_COMPLETIONS = Counter("zqautonxg_queue_completions_total", "Execution jobs finished", ["status"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS execution_jobs (
+    id TEXT PRIMARY KEY,
+    workflow_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,              -- queued, leased, success, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,        -- claimable once reached
+    lease_id TEXT,
+    lease_owner TEXT,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS execution_jobs_claimable
+    ON execution_jobs (workflow_id, available_at)
+    WHERE status IN ('queued', 'leased');
+CREATE INDEX IF NOT EXISTS execution_jobs_status ON execution_jobs (status, updated_at);
+CREATE TABLE IF NOT EXISTS execution_queue_fairness (
+    workflow_id TEXT PRIMARY KEY,
+    last_claimed_at REAL NOT NULL
+);
+"""
+
+
+class Job:
+    """A claimed execution job."""
+
+    def __init__(self, row: Any) -> None:
+        self.id: str = row["id"]
+        self.workflow_id: str = row["workflow_id"]
+        self.payload: Dict[str, Any] = json.loads(row["payload"])
+        self.attempts: int = row["attempts"]
+        self.lease_id: Optional[str] = row["lease_id"]
+
+
+class ExecutionQueue:
+    """Durable work queue of workflow executions."""
+
+    def __init__(
+        self,
+        database: Database,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        self.database = database
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        database.executescript(SCHEMA)
+
+    def enqueue(self, job_id: str, workflow_id: str, payload: Dict[str, Any], delay: float = 0.0) -> None:
+        now = time.time()
+        self.database.execute(
+            "INSERT INTO execution_jobs "
+            "(id, workflow_id, payload, status, max_attempts, available_at, enqueued_at, updated_at) "
+            "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, workflow_id, json.dumps(payload), self.max_attempts, now + delay, now, now),
+        )
+
+    def claim(self, owner: str, limit: int = 1) -> List[Job]:
+        """Lease up to ``limit`` available jobs for ``owner``."""
+        jobs: List[Job] = []
+        with self.database.transaction() as db:
+            while len(jobs) < limit:
+                now = time.time()
+                row = db.execute(
+                    "SELECT j.workflow_id FROM execution_jobs j "
+                    "LEFT JOIN execution_queue_fairness f ON f.workflow_id = j.workflow_id "
+                    "WHERE j.status IN ('queued', 'leased') AND j.available_at <= ? "
+                    "GROUP BY j.workflow_id "
+                    "ORDER BY COALESCE(MAX(f.last_claimed_at), 0), MIN(j.enqueued_at) "
+                    "LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    break
+                workflow_id = row["workflow_id"]
+                job_row = db.execute(
+                    "SELECT * FROM execution_jobs "
+                    "WHERE workflow_id = ? AND status IN ('queued', 'leased') AND available_at <= ? "
+                    "ORDER BY enqueued_at LIMIT 1",
+                    (workflow_id, now),
+                ).fetchone()
+                db.execute(
+                    "INSERT INTO execution_queue_fairness (workflow_id, last_claimed_at) VALUES (?, ?) "
+                    "ON CONFLICT (workflow_id) DO UPDATE SET last_claimed_at = excluded.last_claimed_at",
+                    (workflow_id, now),
+                )
+
+                reclaimed = job_row["status"] == "leased"
+                if job_row["attempts"] >= job_row["max_attempts"]:
+                    db.execute(
+                        "UPDATE execution_jobs SET status = 'failed', lease_id = NULL, payload = 'null', "
+                        "updated_at = ?, error = ? WHERE id = ?",
+                        (now, f"Lease expired after {job_row['attempts']} attempt(s)", job_row["id"]),
+                    )
+                    QUEUE_COMPLETIONS.labels(status="failed").inc()
+                    logger.warning(f"Job {job_row['id']} exhausted its attempts")
+                    continue
+
+                lease_id = secrets.token_hex(8)
+                db.execute(
+                    "UPDATE execution_jobs SET status = 'leased', attempts = attempts + 1, "
+                    "lease_id = ?, lease_owner = ?, available_at = ?, updated_at = ? WHERE id = ?",
+                    (lease_id, owner, now + self.lease_seconds, now, job_row["id"]),
+                )
+                job = Job(job_row)
+                job.attempts += 1
+                job.lease_id = lease_id
+                jobs.append(job)
+                QUEUE_CLAIMS.labels(reclaimed=str(reclaimed).lower()).inc()
+                if reclaimed:
+                    logger.warning(f"Reclaimed job {job.id} after an expired lease")
+        return jobs
+
+    def heartbeat(self, jobs: List[Job]) -> List[Job]:
+        """Extend the leases of ``jobs``; returns the jobs whose lease was lost."""
+        lost = []
+        with self.database.transaction() as db:
+            available_at = time.time() + self.lease_seconds
+            for job in jobs:
+                cursor = db.execute(
+                    "UPDATE execution_jobs SET available_at = ? "
+                    "WHERE id = ? AND lease_id = ? AND status = 'leased'",
+                    (available_at, job.id, job.lease_id),
+                )
+                if cursor.rowcount == 0:
+                    lost.append(job)
+        return lost
+
+    def complete(self, job: Job, status: str, result: Dict[str, Any], error: Optional[str] = None) -> bool:
+        """Record the outcome of ``job``; ``False`` if its lease was lost."""
+        cursor = self.database.execute(
+            "UPDATE execution_jobs SET status = ?, result = ?, error = ?, lease_id = NULL, payload = 'null', "
+            "updated_at = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+            (status, json.dumps(result, default=str), error, time.time(), job.id, job.lease_id),
+        )
+        if cursor.rowcount:
+            QUEUE_COMPLETIONS.labels(status=status).inc()
+        return cursor.rowcount == 1
+
+    def release(self, job: Job, delay: float = 0.0) -> None:
+        """Give a leased job back to the queue without counting a failure."""
+        self.database.execute(
+            "UPDATE execution_jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), "
+            "lease_id = NULL, available_at = ?, updated_at = ? WHERE id = ? AND lease_id = ? AND status = 'leased'",
+            (time.time() + delay, time.time(), job.id, job.lease_id),
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.database.fetchone("SELECT * FROM execution_jobs WHERE id = ?", (job_id,))
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def depth(self) -> Dict[str, int]:
+        """Number of queued and leased jobs."""
+        rows = self.database.fetchall(
+            "SELECT status, COUNT(*) AS n FROM execution_jobs WHERE status IN ('queued', 'leased') GROUP BY status"
+        )
+        return {row["status"]: row["n"] for row in rows}
+
+    def purge(self, retention: float = RETENTION_SECONDS) -> int:
+        """Delete jobs that finished more than ``retention`` seconds ago."""
+        cursor = self.database.execute(
+            "DELETE FROM execution_jobs WHERE status IN ('success', 'failed') AND updated_at < ?",
+            (time.time() - retention,),
+        )
+        return cursor.rowcount
+
+
+JobHandler = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class QueueWorker:
+    """Claim jobs from an ``ExecutionQueue`` and run them concurrently."""
+
+    def __init__(
+        self,
+        queue: ExecutionQueue,
+        handler: JobHandler,
+        concurrency: int = 4,
+        poll_interval: float = 0.5,
+        owner: Optional[str] = None,
+    ) -> None:
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+        self.running: Dict[str, Job] = {}
+        self.stopping = False
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._loop_task: Optional["asyncio.Task[None]"] = None
+        self._heartbeat_task: Optional["asyncio.Task[None]"] = None
+        self._wakeup = asyncio.Event()
+        self._purge_at = 0.0
+
+    def notify(self) -> None:
+        """Wake the claim loop early, e.g. right after an enqueue."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        self.stopping = False
+        self._loop_task = asyncio.create_task(self._claim_loop())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"Queue worker {self.owner} started (concurrency {self.concurrency})")
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Stop claiming and wait up to ``timeout`` for running jobs.
+
+        Jobs still running afterwards are cancelled and released back to the
+        queue, so another worker can claim them without waiting for the
+        lease to expire.
+        """
+        self.stopping = True
+        self._wakeup.set()
+        if self._loop_task is not None:
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        unfinished = list(self.running.values())
+        tasks = [task for task in (self._heartbeat_task, *self._tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in unfinished:
+            try:
+                await self.queue.database.run(self.queue.release, job)
+            except Exception as e:
+                logger.error(f"Releasing job {job.id} failed: {e}")
+        if unfinished:
+            logger.warning(f"Released {len(unfinished)} unfinished job(s) back to the queue")
+        logger.info(f"Queue worker {self.owner} stopped")
+
+    async def _purge(self) -> None:
+        now = time.monotonic()
+        if now < self._purge_at:
+            return
+        self._purge_at = now + PURGE_INTERVAL
+        try:
+            removed = await self.queue.database.run(self.queue.purge)
+        except Exception as e:
+            logger.error(f"Purging finished jobs failed: {e}")
+            return
+        if removed:
+            logger.info(f"Purged {removed} finished job(s)")
+
+    async def _claim_loop(self) -> None:
+        database = self.queue.database
+        while not self.stopping:
+            await self._purge()
+            free = self.concurrency - len(self.running)
+            jobs: List[Job] = []
+            if free > 0:
+                try:
+                    jobs = await database.run(self.queue.claim, self.owner, free)
+                except Exception as e:
+                    logger.error(f"Claiming jobs failed: {e}")
+            for job in jobs:
+                self.running[job.id] = job
+                task = asyncio.create_task(self._process(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            if not jobs:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _heartbeat_loop(self) -> None:
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not self.running:
+                continue
+            try:
+                lost = await self.queue.database.run(self.queue.heartbeat, list(self.running.values()))
+            except Exception as e:
+                logger.error(f"Lease heartbeat failed: {e}")
+                continue
+            for job in lost:
+                logger.warning(f"Lost lease on job {job.id}; it may run again elsewhere")
+
+    async def _process(self, job: Job) -> None:
+        try:
+            outcome = await self.handler(job)
+            completed = await self.queue.database.run(
+                self.queue.complete, job, outcome["status"], outcome.get("result") or {}, outcome.get("error")
+            )
+            if not completed:
+                logger.warning(f"Job {job.id} finished after its lease was lost; result discarded")
+        except Exception as e:
+            logger.error(f"Job {job.id} crashed: {e}")
+            await self.queue.database.run(self.queue.complete, job, "failed", {}, str(e))
+        finally:
+            self.running.pop(job.id, None)
+            self._wakeup.set()
@@ -0,0 +1,422 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Immutable workflow versions with structural sharing.
+
+Each version keeps its nodes and edges in a ``PersistentMap`` keyed by id:
+a hash array mapped trie whose updates copy only the path from the root to
+the changed entry and share every other subtree with the previous version.
+An edit touching k of n nodes therefore costs O(k log32 n) memory instead
+of a full copy, and node objects a new version leaves unchanged are the
+very same objects as in the version before.
+
+Diffs walk two tries side by side and skip subtrees they share, so
+comparing neighbouring versions costs about as much as the edit itself.
+Restoring a version reuses its tries as they are.
+
+Node and edge objects held by a version must never be mutated.
+"""
+
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from uuid import UUID
+
+from zqautonxg.models.workflow import Workflow, WorkflowEdge, WorkflowNode
+
+# Versions kept per workflow; older ones are dropped, numbers are never reused
+MAX_VERSIONS = int(os.getenv("WORKFLOW_MAX_VERSIONS", 1000))
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_BITS = 32
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class _Leaf:
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, hash: int, key: Any, value: Any) -> None:
+        self.hash = hash
+        self.key = key
+        self.value = value
+
+
+class _Collision:
+    """Leaves whose keys have the same hash."""
+
+    __slots__ = ("hash", "leaves")
+
+    def __init__(self, hash: int, leaves: Tuple[_Leaf, ...]) -> None:
+        self.hash = hash
+        self.leaves = leaves
+
+
+class _Branch:
+    """Up to 32 children, present where ``bitmap`` has a bit set."""
+
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: Tuple[Any, ...]) -> None:
+        self.bitmap = bitmap
+        self.children = children
+
+
+EMPTY = _Branch(0, ())
+_MISSING: Any = object()
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & ((1 << HASH_BITS) - 1)
+
+
+def _pair(a: _Leaf, b: _Leaf, shift: int) -> Any:
+    """Smallest subtree holding two leaves with different keys."""
+    if shift > HASH_BITS:
+        return _Collision(a.hash, (a, b))
+    ia, ib = (a.hash >> shift) & MASK, (b.hash >> shift) & MASK
+    if ia == ib:
+        return _Branch(1 << ia, (_pair(a, b, shift + BITS),))
+    return _Branch((1 << ia) | (1 << ib), (a, b) if ia < ib else (b, a))
+
+
+def _set(node: Any, shift: int, leaf: _Leaf) -> Tuple[Any, bool]:
+    """Return ``(new node, whether a key was added)``; ``node`` itself if unchanged."""
+    if isinstance(node, _Collision):
+        for i, old in enumerate(node.leaves):
+            if old.key == leaf.key:
+                if old.value is leaf.value:
+                    return node, False
+                return _Collision(node.hash, node.leaves[:i] + (leaf,) + node.leaves[i + 1:]), False
+        return _Collision(node.hash, node.leaves + (leaf,)), True
+    bit = 1 << ((leaf.hash >> shift) & MASK)
+    pos = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        return _Branch(node.bitmap | bit, children[:pos] + (leaf,) + children[pos:]), True
+    child = children[pos]
+    if isinstance(child, _Leaf):
+        if child.key == leaf.key:
+            if child.value is leaf.value:
+                return node, False
+            new, added = leaf, False
+        else:
+            new, added = _pair(child, leaf, shift + BITS), True
+    else:
+        new, added = _set(child, shift + BITS, leaf)
+        if new is child:
+            return node, False
+    return _Branch(node.bitmap, children[:pos] + (new,) + children[pos + 1:]), added
+
+
+def _delete(node: Any, shift: int, hash: int, key: Any) -> Tuple[Any, bool]:
+    """Return ``(new node or None if empty, whether the key was found)``."""
+    if isinstance(node, _Collision):
+        leaves = tuple(leaf for leaf in node.leaves if leaf.key != key)
+        if len(leaves) == len(node.leaves):
+            return node, False
+        return (leaves[0] if len(leaves) == 1 else _Collision(node.hash, leaves)), True
+    bit = 1 << ((hash >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node, False
+    pos = (node.bitmap & (bit - 1)).bit_count()
+    child = node.children[pos]
+    if isinstance(child, _Leaf):
+        if child.key != key:
+            return node, False
+        new = None
+    else:
+        new, found = _delete(child, shift + BITS, hash, key)
+        if not found:
+            return node, False
+    if new is None:
+        if node.bitmap == bit:
+            return None, True
+        return _Branch(node.bitmap & ~bit, node.children[:pos] + node.children[pos + 1:]), True
+    if isinstance(new, _Leaf) and node.bitmap == bit and shift:
+        return new, True  # pull a lone leaf up so equal contents keep a similar shape
+    return _Branch(node.bitmap, node.children[:pos] + (new,) + node.children[pos + 1:]), True
+
+
+def _leaves(node: Any) -> Iterator[_Leaf]:
+    if isinstance(node, _Leaf):
+        yield node
+    elif isinstance(node, _Collision):
+        yield from node.leaves
+    else:
+        for child in node.children:
+            yield from _leaves(child)
+
+
+def _diff(a: Any, b: Any, shift: int, out: List[Tuple[Any, Any, Any]]) -> None:
+    """Append ``(key, old, new)`` for every difference; missing values are ``None``."""
+    if a is b:
+        return
+    if isinstance(a, _Branch) and isinstance(b, _Branch):
+        for index in range(1 << BITS):
+            bit = 1 << index
+            in_a, in_b = a.bitmap & bit, b.bitmap & bit
+            if not in_a and not in_b:
+                continue
+            child_a = a.children[(a.bitmap & (bit - 1)).bit_count()] if in_a else EMPTY
+            child_b = b.children[(b.bitmap & (bit - 1)).bit_count()] if in_b else EMPTY
+            _diff(child_a, child_b, shift + BITS, out)
+        return
+    # Different shapes: compare the (small) subtrees entry by entry
+    old = {leaf.key: leaf.value for leaf in _leaves(a)}
+    for leaf in _leaves(b):
+        value = old.pop(leaf.key, None)
+        if value is not leaf.value:
+            out.append((leaf.key, value, leaf.value))
+    out.extend((key, value, None) for key, value in old.items())
+
+
+class PersistentMap(Generic[K, V]):
+    """Immutable hash map; ``set`` and ``delete`` return a new map."""
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root: Any = EMPTY, size: int = 0) -> None:
+        self._root = root
+        self._size = size
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[K, V]]) -> "PersistentMap[K, V]":
+        result: PersistentMap[K, V] = cls()
+        for key, value in items:
+            result = result.set(key, value)
+        return result
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[K]:
+        return (leaf.key for leaf in _leaves(self._root))
+
+    def get(self, key: Any, default: Optional[V] = None) -> Optional[V]:
+        hash = _hash(key)
+        node, shift = self._root, 0
+        while isinstance(node, _Branch):
+            bit = 1 << ((hash >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            node = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            shift += BITS
+        leaves = node.leaves if isinstance(node, _Collision) else (node,)
+        for leaf in leaves:
+            if leaf.key == key:
+                return leaf.value
+        return default
+
+    def set(self, key: K, value: V) -> "PersistentMap[K, V]":
+        root, added = _set(self._root, 0, _Leaf(_hash(key), key, value))
+        if root is self._root:
+            return self
+        return PersistentMap(root, self._size + added)
+
+    def delete(self, key: K) -> "PersistentMap[K, V]":
+        root, found = _delete(self._root, 0, _hash(key), key)
+        if not found:
+            return self
+        return PersistentMap(EMPTY if root is None else root, self._size - 1)
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        return ((leaf.key, leaf.value) for leaf in _leaves(self._root))
+
+    def values(self) -> Iterator[V]:
+        return (leaf.value for leaf in _leaves(self._root))
+
+    def diff(self, other: "PersistentMap[K, V]") -> List[Tuple[K, Optional[V], Optional[V]]]:
+        """``(key, value here, value in other)`` for keys whose values are not identical."""
+        out: List[Tuple[Any, Any, Any]] = []
+        _diff(self._root, other._root, 0, out)
+        return out
+
+
+# Map values: (insertion sequence, node or edge); the sequence keeps list order stable
+Entry = Tuple[int, Any]
+
+VERSIONED_FIELDS = ("name", "description", "status")
+
+
+class WorkflowVersion:
+    """One immutable state of a workflow."""
+
+    __slots__ = ("number", "name", "description", "status", "nodes", "edges", "created_at")
+
+    def __init__(
+        self,
+        number: int,
+        name: str,
+        description: Optional[str],
+        status: str,
+        nodes: "PersistentMap[str, Entry]",
+        edges: "PersistentMap[str, Entry]",
+        created_at: datetime,
+    ) -> None:
+        self.number = number
+        self.name = name
+        self.description = description
+        self.status = status
+        self.nodes = nodes
+        self.edges = edges
+        self.created_at = created_at
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "version": self.number,
+            "name": self.name,
+            "status": self.status,
+            "node_count": len(self.nodes),
+            "edge_count": len(self.edges),
+            "created_at": self.created_at,
+        }
+
+
+def _ordered(entries: "PersistentMap[str, Entry]") -> List[Any]:
+    return [item for _, item in sorted(entries.values(), key=lambda entry: entry[0])]
+
+
+def _changes(
+    old: "PersistentMap[str, Entry]", new: "PersistentMap[str, Entry]"
+) -> Dict[str, List[Any]]:
+    added, removed, changed = [], [], []
+    for key, before, after in old.diff(new):
+        if before is None:
+            added.append(after[1])
+        elif after is None:
+            removed.append(before[1])
+        elif before[1] != after[1]:
+            changed.append({"id": key, "from": before[1], "to": after[1]})
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+class VersionHistory:
+    """All retained versions of one workflow, newest last."""
+
+    def __init__(self, workflow: Workflow, max_versions: int = MAX_VERSIONS) -> None:
+        self.workflow_id: UUID = workflow.id
+        self.created_at = workflow.created_at
+        self.created_by = workflow.created_by
+        self.max_versions = max(1, max_versions)
+        self.versions: "OrderedDict[int, WorkflowVersion]" = OrderedDict()
+        self._sequence = 0
+        self._append(WorkflowVersion(
+            1,
+            workflow.name,
+            workflow.description,
+            workflow.status,
+            self._merge(PersistentMap(), workflow.nodes, "node"),
+            self._merge(PersistentMap(), workflow.edges, "edge"),
+            workflow.updated_at,
+        ))
+
+    @property
+    def head(self) -> WorkflowVersion:
+        return next(reversed(self.versions.values()))
+
+    def get(self, number: int) -> Optional[WorkflowVersion]:
+        return self.versions.get(number)
+
+    def _append(self, version: WorkflowVersion) -> None:
+        self.versions[version.number] = version
+        while len(self.versions) > self.max_versions:
+            self.versions.popitem(last=False)
+
+    def _merge(
+        self, entries: "PersistentMap[str, Entry]", items: List[Any], kind: str
+    ) -> "PersistentMap[str, Entry]":
+        """``entries`` updated to hold exactly ``items``, sharing what is unchanged."""
+        ids = set()
+        for item in items:
+            if item.id in ids:
+                raise ValueError(f"Workflow contains duplicate {kind} id {item.id!r}")
+            ids.add(item.id)
+            current = entries.get(item.id)
+            if current is not None and current[1] == item:
+                continue
+            if current is None:
+                self._sequence += 1
+            entries = entries.set(item.id, (current[0] if current is not None else self._sequence, item))
+        if len(entries) > len(ids):
+            for key in [key for key in entries if key not in ids]:
+                entries = entries.delete(key)
+        return entries
+
+    def commit(
+        self,
+        nodes: Optional[List[WorkflowNode]] = None,
+        edges: Optional[List[WorkflowEdge]] = None,
+        **fields: Any,
+    ) -> WorkflowVersion:
+        """Record a new version with the given changes.
+
+        Returns the new head, or the current one if nothing changed.
+        """
+        head = self.head
+        values = {name: fields.get(name, getattr(head, name)) for name in VERSIONED_FIELDS}
+        new_nodes = head.nodes if nodes is None else self._merge(head.nodes, nodes, "node")
+        new_edges = head.edges if edges is None else self._merge(head.edges, edges, "edge")
+        if (
+            new_nodes is head.nodes
+            and new_edges is head.edges
+            and all(values[name] == getattr(head, name) for name in VERSIONED_FIELDS)
+        ):
+            return head
+        version = WorkflowVersion(
+            head.number + 1, nodes=new_nodes, edges=new_edges, created_at=datetime.utcnow(), **values
+        )
+        self._append(version)
+        return version
+
+    def restore(self, number: int) -> WorkflowVersion:
+        """Make version ``number`` the new head; its node and edge maps are reused."""
+        old = self.versions[number]
+        head = self.head
+        version = WorkflowVersion(
+            head.number + 1,
+            old.name,
+            old.description,
+            old.status,
+            old.nodes,
+            old.edges,
+            datetime.utcnow(),
+        )
+        self._append(version)
+        return version
+
+    def workflow(self, version: WorkflowVersion) -> Workflow:
+        """Materialize ``version`` as a ``Workflow`` (nodes in insertion order)."""
+        return Workflow.model_construct(
+            id=self.workflow_id,
+            name=version.name,
+            description=version.description,
+            status=version.status,
+            nodes=_ordered(version.nodes),
+            edges=_ordered(version.edges),
+            created_at=self.created_at,
+            updated_at=version.created_at,
+            created_by=self.created_by,
+            version=version.number,
+        )
+
+    def diff(self, old: WorkflowVersion, new: WorkflowVersion) -> Dict[str, Any]:
+        """Field, node and edge changes from ``old`` to ``new``."""
+        return {
+            "from": old.number,
+            "to": new.number,
+            "fields": {
+                name: {"from": getattr(old, name), "to": getattr(new, name)}
+                for name in VERSIONED_FIELDS
+                if getattr(old, name) != getattr(new, name)
+            },
+            "nodes": _changes(old.nodes, new.nodes),
+            "edges": _changes(old.edges, new.edges),
+        }
@@ -0,0 +1,271 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Production server launcher for ZQAutoNXG platform.
+
+Runs ``zqautonxg.app:app`` under uvicorn with one or more worker processes:
+
+* worker count defaults to the CPU count (``WORKERS`` / ``--workers``)
+* uvloop and httptools are used automatically when installed
+* with ``--reuse-port`` every worker gets its own ``SO_REUSEPORT`` listener so
+  the kernel balances connections; otherwise workers share one socket
+* SIGINT/SIGTERM trigger a graceful shutdown: workers stop accepting, drain
+  in-flight requests, executions and WebSocket clients, then exit
+* a worker that dies is restarted after an exponential backoff; if one dies
+  more than ``WORKER_MAX_RESTARTS`` times within ``WORKER_RESTART_WINDOW``
+  seconds the server shuts down and exits with status 1
+"""
+
+import argparse
+import importlib.util
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+APP_IMPORT_STRING = "zqautonxg.app:app"
+
+POLL_INTERVAL = 0.2
+RESTART_BACKOFF = 0.5
+MAX_RESTART_BACKOFF = 30.0
+MAX_RESTARTS = int(os.getenv("WORKER_MAX_RESTARTS", 5))
+RESTART_WINDOW = float(os.getenv("WORKER_RESTART_WINDOW", 60))
+
+logger = logging.getLogger("zqautonxg.server")
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def select_loop() -> str:
+    """Return the fastest available event loop implementation."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def select_http() -> str:
+    """Return the fastest available HTTP/1.1 protocol implementation."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="zqautonxg", description="Run the ZQAutoNXG API server"
+    )
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WORKERS", os.cpu_count() or 1)),
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument("--loop", default=os.getenv("LOOP", "auto"), choices=["auto", "uvloop", "asyncio"])
+    parser.add_argument("--http", default=os.getenv("HTTP", "auto"), choices=["auto", "httptools", "h11"])
+    parser.add_argument(
+        "--reuse-port",
+        action=argparse.BooleanOptionalAction,
+        default=_env_flag("REUSE_PORT", hasattr(socket, "SO_REUSEPORT")),
+        help="Give each worker its own SO_REUSEPORT listener",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT", 30)),
+        help="Seconds to drain in-flight work on shutdown",
+    )
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "INFO").lower())
+    parser.add_argument("--no-banner", action="store_true")
+    return parser
+
+
+def bind_socket(host: str, port: int, reuse_port: bool = False) -> socket.socket:
+    """Create a listening TCP socket suitable for sharing with workers."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def uvicorn_config(args: argparse.Namespace) -> Dict[str, Any]:
+    """Keyword arguments for ``uvicorn.Config`` derived from the CLI options."""
+    return {
+        "app": APP_IMPORT_STRING,
+        "host": args.host,
+        "port": args.port,
+        "loop": select_loop() if args.loop == "auto" else args.loop,
+        "http": select_http() if args.http == "auto" else args.http,
+        "log_level": args.log_level,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "proxy_headers": True,
+    }
+
+
+def _serve(config: Dict[str, Any], sockets: List[socket.socket]) -> None:
+    """Worker process entry point."""
+    import uvicorn
+
+    from zqautonxg.app import configure_logging
+
+    configure_logging()
+    uvicorn.Server(uvicorn.Config(**config)).run(sockets=sockets)
+
+
+class Supervisor:
+    """Start, watch and gracefully stop uvicorn worker processes."""
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        workers: int,
+        reuse_port: bool,
+        graceful_timeout: float,
+    ) -> None:
+        self.config = config
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: List[Optional[multiprocessing.process.BaseProcess]] = [None] * workers
+        # Recent restart times and the pending restart deadline, per worker
+        self.restarts: List[Deque[float]] = [deque() for _ in range(workers)]
+        self.restart_at: List[Optional[float]] = [None] * workers
+        self.should_exit = False
+        self.exit_code = 0
+
+        host, port = config["host"], config["port"]
+        if reuse_port:
+            # The first bind resolves port 0 so every listener shares the port
+            first = bind_socket(host, port, reuse_port=True)
+            port = first.getsockname()[1]
+            self.sockets = [[first]] + [
+                [bind_socket(host, port, reuse_port=True)] for _ in range(workers - 1)
+            ]
+        else:
+            shared = bind_socket(host, port)
+            self.sockets = [[shared]] * workers
+        for listeners in self.sockets:
+            listeners[0].listen(2048)
+
+    @property
+    def port(self) -> int:
+        return self.sockets[0][0].getsockname()[1]
+
+    def _spawn(self, index: int) -> None:
+        process = self.context.Process(
+            target=_serve, args=(self.config, self.sockets[index]), name=f"zqautonxg-worker-{index}"
+        )
+        process.start()
+        self.processes[index] = process
+        logger.info(f"Started worker {index} [pid {process.pid}]")
+
+    def _handle_exit(self, signum: int, frame: Any) -> None:
+        self.should_exit = True
+
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while not self.should_exit:
+            time.sleep(POLL_INTERVAL)
+            for index, process in enumerate(self.processes):
+                if self.should_exit:
+                    break
+                if process is not None and not process.is_alive():
+                    self._restart(index, process)
+
+        return self.shutdown()
+
+    def _restart(self, index: int, process: multiprocessing.process.BaseProcess) -> None:
+        """Schedule or perform the restart of a dead worker, or give up."""
+        now = time.monotonic()
+        due = self.restart_at[index]
+        if due is not None:
+            if now >= due:
+                self.restart_at[index] = None
+                self.restarts[index].append(now)
+                self._spawn(index)
+            return
+        recent = self.restarts[index]
+        while recent and recent[0] <= now - RESTART_WINDOW:
+            recent.popleft()
+        if len(recent) >= MAX_RESTARTS:
+            logger.error(
+                f"Worker {index} exited {len(recent) + 1} times within {RESTART_WINDOW:.0f}s "
+                f"(last exit code {process.exitcode}); shutting down"
+            )
+            self.exit_code = 1
+            self.should_exit = True
+            return
+        delay = min(MAX_RESTART_BACKOFF, RESTART_BACKOFF * 2 ** len(recent))
+        logger.warning(
+            f"Worker {index} [pid {process.pid}] exited with {process.exitcode}; restarting in {delay:.1f}s"
+        )
+        self.restart_at[index] = now + delay
+
+    def shutdown(self) -> int:
+        """Ask every worker to drain and exit, killing any that overrun."""
+        logger.info("Shutting down workers")
+        running = [p for p in self.processes if p is not None and p.is_alive()]
+        for process in running:
+            process.terminate()
+
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        for process in running:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error(f"Worker [pid {process.pid}] did not drain in time; killing")
+                process.kill()
+                process.join()
+
+        for listeners in self.sockets:
+            listeners[0].close()
+        return self.exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ZQAutoNXG server."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    from zqautonxg import _startup_banner
+    from zqautonxg.app import configure_logging
+
+    configure_logging()
+    if not args.no_banner:
+        _startup_banner()
+
+    config = uvicorn_config(args)
+    workers = max(1, args.workers)
+    # Workers inherit this, e.g. for the log store's startup check
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    logger.info(
+        f"Starting {workers} worker(s) on {args.host}:{args.port} "
+        f"(loop={config['loop']}, http={config['http']}, reuse_port={args.reuse_port and workers > 1})"
+    )
+
+    if workers == 1:
+        sock = bind_socket(args.host, args.port)
+        _serve(config, [sock])
+        return 0
+
+    return Supervisor(config, workers, args.reuse_port, args.graceful_timeout).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
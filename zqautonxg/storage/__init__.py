@@ -0,0 +1,26 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Storage layer for ZQAutoNXG platform.
+
+State that must be shared between workers and survive restarts lives in the
+database at ``STORAGE_URL`` (``sqlite:///path/to/zqautonxg.db``). When it is
+unset, features that need storage fall back to in-process state.
+
+Logs are kept separately, in compressed segment files under
+``LOG_STORE_DIR`` (see ``logstore``).
+"""
+
+from .database import Database, StorageError, get_database, open_database
+from .logstore import LogStore, get_log_store, open_log_store
+
+__all__ = [
+    "Database",
+    "LogStore",
+    "StorageError",
+    "get_database",
+    "get_log_store",
+    "open_database",
+    "open_log_store",
+]
@@ -0,0 +1,101 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+SQLite-backed database shared by every worker on a host.
+
+The database runs in WAL mode so readers never block the single writer, and
+``transaction()`` takes the write lock up front (``BEGIN IMMEDIATE``) so
+read-modify-write sequences such as claiming a job are atomic across
+processes. Calls are blocking; async callers go through ``run()``, which
+executes them in a worker thread.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+BUSY_TIMEOUT_MS = 5000
+
+
+class StorageError(RuntimeError):
+    """Raised when the storage layer is misconfigured or unavailable."""
+
+
+class Database:
+    """A SQLite database connection safe to share between threads."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000
+        )
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements atomically while holding the database write lock."""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self.connection.execute(sql, params)
+
+    def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def executescript(self, script: str) -> None:
+        with self._lock:
+            self.connection.executescript(script)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking database call without stalling the event loop."""
+        return await asyncio.to_thread(func, *args)
+
+    def close(self) -> None:
+        with self._lock:
+            self.connection.close()
+
+
+def open_database(url: str) -> Database:
+    """Open the database for a ``sqlite:///path`` (or ``sqlite://:memory:``) URL."""
+    if url.startswith("sqlite:///"):
+        return Database(url[len("sqlite:///"):])
+    if url == "sqlite://:memory:":
+        return Database(":memory:")
+    raise StorageError(f"Unsupported STORAGE_URL {url!r}; expected sqlite:///path")
+
+
+_database: Optional[Database] = None
+
+
+def get_database() -> Optional[Database]:
+    """Return the process-wide database, or ``None`` if storage is disabled."""
+    global _database
+    if _database is None and os.getenv("STORAGE_URL"):
+        _database = open_database(os.environ["STORAGE_URL"])
+    return _database
@@ -0,0 +1,431 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Segmented on-disk log store.
+
+Entries are appended as NDJSON to an active segment in ``LOG_STORE_DIR``.
+When it reaches ``segment_bytes`` it is rotated and sealed: rewritten as
+independently zlib-compressed blocks of about ``block_bytes`` (``.seg``)
+plus a sparse index (``.idx``) holding one fixed-size record per block with
+the block's time range, offset and length. Readers memory-map the index and
+decompress only the blocks a lookup needs, newest first, so days of logs
+are searchable without holding them in memory. The active segment gets the
+same kind of index (``.lidx``) over its uncompressed blocks as they fill, so
+a query reads its unindexed tail plus the blocks in range rather than the
+whole file.
+
+Sealed segments are deleted once all of their entries are older than
+``retention_seconds`` and, oldest first, while the sealed segments take
+more than ``retention_bytes``; the writer checks this on every seal and at
+least every ``RETENTION_INTERVAL`` seconds while it is appending.
+
+Every worker can read the store; only the worker holding the lock on
+``writer.lock`` writes it. With ``EVENT_BUS=redis`` every worker receives
+every entry, so each entry is persisted exactly once, and another worker
+takes over if the writer exits. With the in-memory bus the other workers'
+entries would never reach the writer, so ``open_log_store`` refuses to
+start when ``WEB_CONCURRENCY`` (set by the launcher) reports several
+workers unless ``EVENT_BUS=redis``.
+"""
+
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not POSIX; every worker writes
+    fcntl = None  # type: ignore[assignment]
+
+from .database import StorageError
+
+logger = logging.getLogger("zqautonxg.storage.logstore")
+
+SEGMENT_BYTES = int(os.getenv("LOG_SEGMENT_BYTES", 16 * 1024 * 1024))
+BLOCK_BYTES = int(os.getenv("LOG_BLOCK_BYTES", 64 * 1024))
+RETENTION_SECONDS = float(os.getenv("LOG_RETENTION_HOURS", 72)) * 3600
+RETENTION_BYTES = int(os.getenv("LOG_RETENTION_BYTES", 1024 * 1024 * 1024))
+COMPRESSION_LEVEL = 6
+LOCK_RETRY_SECONDS = 5.0
+RETENTION_INTERVAL = 60.0
+
+# Index record: oldest and newest entry time of a block, its offset and length
+INDEX_RECORD = struct.Struct("<ddQQ")
+
+
+def entry_time(entry: Dict[str, Any]) -> float:
+    """Epoch seconds of an entry's ISO 8601 ``timestamp`` (naive means UTC)."""
+    try:
+        moment = datetime.fromisoformat(entry["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _parse_lines(data: bytes) -> List[Dict[str, Any]]:
+    entries = []
+    for line in data.splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue  # torn write at the end of an active segment
+    return entries
+
+
+class LogStore:
+    """Append-only log segments in one directory."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = SEGMENT_BYTES,
+        block_bytes: int = BLOCK_BYTES,
+        retention_seconds: float = RETENTION_SECONDS,
+        retention_bytes: int = RETENTION_BYTES,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.block_bytes = block_bytes
+        self.retention_seconds = retention_seconds
+        self.retention_bytes = retention_bytes
+        self._writer_lock: Optional[Any] = None
+        self._lock_retry_at = 0.0
+        self._active: Optional[Any] = None
+        self._active_index: Optional[Any] = None
+        self._active_size = 0
+        self._block_start = 0
+        self._block_oldest, self._block_newest = math.inf, -math.inf
+        self._append_lock = threading.Lock()
+        self._retention_at = 0.0
+        self._indexes: Dict[str, mmap.mmap] = {}
+        self._indexes_lock = threading.Lock()
+
+    def _path(self, base: str, suffix: str) -> str:
+        return os.path.join(self.directory, base + suffix)
+
+    # Writing
+
+    @property
+    def is_writer(self) -> bool:
+        return self._writer_lock is not None
+
+    def _acquire_writer(self) -> List[str]:
+        """Try to become the writer; returns segments a previous writer left unsealed."""
+        now = time.monotonic()
+        if now < self._lock_retry_at:
+            return []
+        self._lock_retry_at = now + LOCK_RETRY_SECONDS
+        handle = open(self._path("writer", ".lock"), "a+b")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return []
+        self._writer_lock = handle
+        logger.info(f"Writing log segments to {self.directory}")
+        leftover = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".log"):
+                continue
+            if os.path.exists(self._path(name[:-4], ".seg")):
+                # Sealed before a crash
+                os.unlink(self._path(name[:-4], ".log"))
+                _unlink_quietly(self._path(name[:-4], ".lidx"))
+            else:
+                leftover.append(os.path.join(self.directory, name))
+        return leftover
+
+    def append(self, entries: List[Dict[str, Any]]) -> List[str]:
+        """Persist ``entries`` if this worker is the writer.
+
+        Blocking, like ``seal()``: both are meant to run off the event loop.
+        Returns the paths of rotated segments that are ready for ``seal()``.
+        """
+        ready: List[str] = []
+        if not entries:
+            return ready
+        with self._append_lock:
+            if self._writer_lock is None:
+                ready = self._acquire_writer()
+                if self._writer_lock is None:
+                    return ready
+            if self._active is None:
+                base = f"{time.time_ns():020d}"
+                self._active = open(self._path(base, ".log"), "ab")
+                self._active_index = open(self._path(base, ".lidx"), "ab")
+                self._active_size = self._block_start = 0
+                self._block_oldest, self._block_newest = math.inf, -math.inf
+            lines: List[bytes] = []
+            records: List[bytes] = []
+            for entry in entries:
+                line = (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode()
+                lines.append(line)
+                self._active_size += len(line)
+                moment = entry_time(entry)
+                self._block_oldest = min(self._block_oldest, moment)
+                self._block_newest = max(self._block_newest, moment)
+                if self._active_size - self._block_start >= self.block_bytes:
+                    records.append(INDEX_RECORD.pack(
+                        self._block_oldest, self._block_newest,
+                        self._block_start, self._active_size - self._block_start,
+                    ))
+                    self._block_start = self._active_size
+                    self._block_oldest, self._block_newest = math.inf, -math.inf
+            self._active.write(b"".join(lines))
+            self._active.flush()
+            if records:
+                # After the data, so readers never see a record past the end of the file
+                self._active_index.write(b"".join(records))
+                self._active_index.flush()
+            if self._active_size >= self.segment_bytes:
+                ready.append(self._active.name)
+                self._close_active()
+            now = time.monotonic()
+            if now >= self._retention_at:
+                self._retention_at = now + RETENTION_INTERVAL
+                self.enforce_retention()
+        return ready
+
+    def _close_active(self) -> None:
+        for handle in (self._active, self._active_index):
+            if handle is not None:
+                handle.close()
+        self._active = self._active_index = None
+
+    def seal(self, path: str) -> None:
+        """Compress a rotated segment into indexed blocks, then apply retention."""
+        base = os.path.basename(path)[:-4]
+        index = bytearray()
+        offset = 0
+        seg_tmp = self._path(base, ".seg.tmp")
+        with open(path, "rb") as source, open(seg_tmp, "wb") as target:
+            lines: List[bytes] = []
+            size = 0
+            oldest, newest = math.inf, -math.inf
+
+            def write_block() -> None:
+                nonlocal offset
+                block = zlib.compress(b"".join(lines), COMPRESSION_LEVEL)
+                target.write(block)
+                index.extend(INDEX_RECORD.pack(oldest, newest, offset, len(block)))
+                offset += len(block)
+
+            for line in source:
+                try:
+                    moment = entry_time(json.loads(line))
+                except ValueError:
+                    continue
+                lines.append(line if line.endswith(b"\n") else line + b"\n")
+                size += len(line)
+                oldest, newest = min(oldest, moment), max(newest, moment)
+                if size >= self.block_bytes:
+                    write_block()
+                    lines, size = [], 0
+                    oldest, newest = math.inf, -math.inf
+            if lines:
+                write_block()
+            target.flush()
+            os.fsync(target.fileno())
+        if index:
+            with open(self._path(base, ".idx.tmp"), "wb") as f:
+                f.write(index)
+                f.flush()
+                os.fsync(f.fileno())
+            # Index first: readers only use a .seg once its .idx exists
+            os.replace(self._path(base, ".idx.tmp"), self._path(base, ".idx"))
+            os.replace(seg_tmp, self._path(base, ".seg"))
+        else:
+            os.unlink(seg_tmp)
+        os.unlink(path)
+        _unlink_quietly(self._path(base, ".lidx"))
+        self.enforce_retention()
+
+    def enforce_retention(self, now: Optional[float] = None) -> int:
+        """Delete expired or excess sealed segments; returns how many were removed."""
+        cutoff = (time.time() if now is None else now) - self.retention_seconds
+        sealed = []
+        for base, kind in self._segments():
+            if kind != "seg":
+                continue
+            try:
+                index = self._index(base)
+                size = os.path.getsize(self._path(base, ".seg")) + len(index)
+            except FileNotFoundError:
+                continue
+            newest = max(
+                INDEX_RECORD.unpack_from(index, i)[1] for i in range(0, len(index), INDEX_RECORD.size)
+            )
+            sealed.append((base, newest, size))
+        total = sum(size for _, _, size in sealed)
+        removed = 0
+        for base, newest, size in sealed:
+            if newest >= cutoff and total <= self.retention_bytes:
+                continue
+            for suffix in (".seg", ".idx"):
+                _unlink_quietly(self._path(base, suffix))
+            with self._indexes_lock:
+                stale = self._indexes.pop(base, None)
+            if stale is not None:
+                stale.close()
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Removed {removed} expired log segment(s)")
+        return removed
+
+    # Reading
+
+    def _segments(self) -> List[Tuple[str, str]]:
+        """``(base, "seg" | "log")`` of every readable segment, oldest first."""
+        names = os.listdir(self.directory)
+        sealed = {name[:-4] for name in names if name.endswith(".seg")}
+        segments = []
+        for name in sorted(names):
+            if name.endswith(".seg"):
+                segments.append((name[:-4], "seg"))
+            elif name.endswith(".log") and name[:-4] not in sealed:
+                segments.append((name[:-4], "log"))
+        return segments
+
+    def _index(self, base: str) -> mmap.mmap:
+        with self._indexes_lock:
+            index = self._indexes.get(base)
+            if index is None:
+                with open(self._path(base, ".idx"), "rb") as f:
+                    index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._indexes[base] = index
+            return index
+
+    def _blocks(
+        self, base: str, kind: str, since: Optional[float], before: Optional[float]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Blocks of one segment that may hold entries in range, newest first."""
+        if kind == "log":
+            yield from self._active_blocks(base, since, before)
+            return
+        index = self._index(base)
+        with open(self._path(base, ".seg"), "rb") as f:
+            for position in range(len(index) - INDEX_RECORD.size, -1, -INDEX_RECORD.size):
+                oldest, newest, offset, length = INDEX_RECORD.unpack_from(index, position)
+                if (since is not None and newest < since) or (before is not None and oldest >= before):
+                    continue
+                f.seek(offset)
+                yield _parse_lines(zlib.decompress(f.read(length)))
+
+    def _active_blocks(
+        self, base: str, since: Optional[float], before: Optional[float]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Unindexed tail of an unsealed segment, then its indexed blocks in range."""
+        try:
+            with open(self._path(base, ".lidx"), "rb") as f:
+                index = f.read()
+        except FileNotFoundError:
+            index = b""
+        index = index[:len(index) - len(index) % INDEX_RECORD.size]  # torn record
+        with open(self._path(base, ".log"), "rb") as f:
+            if index:
+                _, _, offset, length = INDEX_RECORD.unpack_from(index, len(index) - INDEX_RECORD.size)
+                f.seek(offset + length)
+            yield _parse_lines(f.read())
+            for position in range(len(index) - INDEX_RECORD.size, -1, -INDEX_RECORD.size):
+                oldest, newest, offset, length = INDEX_RECORD.unpack_from(index, position)
+                if (since is not None and newest < since) or (before is not None and oldest >= before):
+                    continue
+                f.seek(offset)
+                yield _parse_lines(f.read(length))
+
+    def read(
+        self,
+        limit: int,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        since: Optional[float] = None,
+        before: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` entries matching the filters, oldest first.
+
+        ``since`` (inclusive) and ``before`` (exclusive) are epoch seconds;
+        the index skips blocks entirely outside that range.
+        """
+        matches: List[Dict[str, Any]] = []
+        if limit <= 0:
+            return matches
+        needle = search.lower() if search else None
+        segments = self._segments()
+        live = {base for base, _ in segments}
+        with self._indexes_lock:
+            for base in [b for b in self._indexes if b not in live]:
+                self._indexes.pop(base).close()
+        for base, kind in reversed(segments):
+            try:
+                for block in self._blocks(base, kind, since, before):
+                    for entry in reversed(block):
+                        if level and entry.get("level") != level:
+                            continue
+                        if needle and needle not in str(entry.get("message", "")).lower():
+                            continue
+                        if since is not None or before is not None:
+                            moment = entry_time(entry)
+                            if (since is not None and moment < since) or (before is not None and moment >= before):
+                                continue
+                        matches.append(entry)
+                        if len(matches) >= limit:
+                            matches.reverse()
+                            return matches
+            except (FileNotFoundError, ValueError):
+                continue  # sealed or removed (and its index closed) while reading
+        matches.reverse()
+        return matches
+
+    def close(self) -> None:
+        self._close_active()
+        if self._writer_lock is not None:
+            self._writer_lock.close()
+            self._writer_lock = None
+        with self._indexes_lock:
+            for index in self._indexes.values():
+                index.close()
+            self._indexes.clear()
+
+
+_log_store: Optional[LogStore] = None
+
+
+def get_log_store() -> Optional[LogStore]:
+    """Return the process-wide log store, or ``None`` if ``LOG_STORE_DIR`` is unset."""
+    global _log_store
+    if _log_store is None and os.getenv("LOG_STORE_DIR"):
+        _log_store = LogStore(os.environ["LOG_STORE_DIR"])
+    return _log_store
+
+
+def open_log_store() -> Optional[LogStore]:
+    """Open the log store at startup, refusing a setup it could not serve."""
+    if not os.getenv("LOG_STORE_DIR"):
+        return None
+    workers = int(os.getenv("WEB_CONCURRENCY") or 1)
+    if workers > 1 and os.getenv("EVENT_BUS", "memory") != "redis":
+        # Only one worker writes the store; with the in-memory bus it would
+        # never see the entries logged by the others
+        raise StorageError("LOG_STORE_DIR with several workers requires EVENT_BUS=redis")
+    return get_log_store()
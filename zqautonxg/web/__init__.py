@@ -0,0 +1,15 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+HTTP delivery for ZQAutoNXG platform.
+
+Responses are compressed with the best encoding the client accepts (zstd,
+br or gzip; see ``COMPRESSION_ENCODINGS``) and the web interface is served
+from memory, precompressed when the application is built.
+"""
+
+from .compression import CODECS, CompressionMiddleware, negotiate
+from .static import StaticAsset, StaticAssets
+
+__all__ = ["CODECS", "CompressionMiddleware", "StaticAsset", "StaticAssets", "negotiate"]
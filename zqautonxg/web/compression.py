@@ -0,0 +1,200 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Response compression negotiated from ``Accept-Encoding``.
+
+Supports ``zstd`` (with the ``zstandard`` package), ``br`` (with
+``brotli``) and ``gzip``; the client's highest-weighted encoding wins and
+ties go to the order in ``COMPRESSION_ENCODINGS``. Only compressible
+content types at least ``minimum_size`` bytes long are compressed, with a
+level that drops as the body grows so large payloads do not stall the
+event loop. Streaming responses (more than one body message, e.g. Server-
+Sent Events) and responses that already carry a ``Content-Encoding`` are
+passed through untouched.
+
+Identical payloads are compressed once: results for bodies up to
+``CACHE_MAX_BODY`` bytes are kept in a small LRU cache keyed by a hash of
+the body.
+"""
+
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1000))
+PREFERRED_ENCODINGS = [
+    e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if e.strip()
+]
+CACHE_MAX_BODY = 256 * 1024
+CACHE_MAX_ENTRIES = 256
+
+# Level per body size: (largest body, level), the last entry has no limit
+LEVELS: Dict[str, List[Tuple[float, int]]] = {
+    "zstd": [(64 * 1024, 6), (1024 * 1024, 3), (float("inf"), 1)],
+    "br": [(64 * 1024, 5), (1024 * 1024, 4), (float("inf"), 1)],
+    "gzip": [(64 * 1024, 6), (1024 * 1024, 4), (float("inf"), 1)],
+}
+# Levels for assets compressed once at startup
+MAX_LEVELS = {"zstd": 19, "br": 11, "gzip": 9}
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/openmetrics-text",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+})
+# Streams must reach the client as they are produced
+STREAMING_TYPES = frozenset({"text/event-stream"})
+
+COMPRESSED_RESPONSES = Counter(
+    "zqautonxg_compressed_responses_total", "Responses compressed by encoding", ["encoding", "cache"]
+)
+
+Compressor = Callable[[bytes, int], bytes]
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _available_codecs() -> Dict[str, Compressor]:
+    codecs: Dict[str, Compressor] = {"gzip": _gzip}
+    try:
+        import brotli
+
+        codecs["br"] = lambda data, level: brotli.compress(data, quality=level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        codecs["zstd"] = lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+    except ImportError:
+        pass
+    return codecs
+
+
+CODECS = _available_codecs()
+
+
+def negotiate(accept_encoding: str, available: Optional[List[str]] = None) -> Optional[str]:
+    """Pick the encoding for an ``Accept-Encoding`` header, or ``None`` for identity."""
+    if not accept_encoding:
+        return None
+    offered = [e for e in PREFERRED_ENCODINGS if e in CODECS] if available is None else available
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip()] = weight
+    wildcard = weights.get("*", 0.0)
+    best: Optional[str] = None
+    best_weight = 0.0
+    for encoding in offered:
+        weight = weights.get(encoding, wildcard)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compression_level(encoding: str, size: int) -> int:
+    for limit, level in LEVELS[encoding]:
+        if size <= limit:
+            return level
+    return LEVELS[encoding][-1][1]
+
+
+def compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in STREAMING_TYPES:
+        return False
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+
+class CompressionMiddleware:
+    """Compress eligible HTTP responses with the negotiated encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if len(body) > CACHE_MAX_BODY:
+            COMPRESSED_RESPONSES.labels(encoding=encoding, cache="skip").inc()
+            return CODECS[encoding](body, compression_level(encoding, len(body)))
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        compressed = self.cache.get(key)
+        if compressed is not None:
+            self.cache.move_to_end(key)
+            COMPRESSED_RESPONSES.labels(encoding=encoding, cache="hit").inc()
+            return compressed
+        compressed = CODECS[encoding](body, compression_level(encoding, len(body)))
+        self.cache[key] = compressed
+        if len(self.cache) > CACHE_MAX_ENTRIES:
+            self.cache.popitem(last=False)
+        COMPRESSED_RESPONSES.labels(encoding=encoding, cache="miss").inc()
+        return compressed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal pending
+            if message["type"] == "http.response.start":
+                pending = message  # held until the first body chunk shows what to do
+                return
+            start, pending = pending, None
+            if start is None:
+                await send(message)
+                return
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            eligible = (
+                message["type"] == "http.response.body"
+                and "content-encoding" not in headers
+                and compressible(headers.get("content-type", ""))
+            )
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+            if not eligible or message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(start)
+                await send(message)
+                return
+            compressed = self.compress(encoding, body)
+            if len(compressed) < len(body):
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,83 @@
+# Copyright © 2025 Zubin Qayam — ZQAutoNXG Powered by ZQ AI LOGIC
+# Licensed under the Apache License, Version 2.0
+
+"""
+Precompressed static assets.
+
+The frontend directory is read once, when the application is built: each
+file is held in memory together with its gzip (and, when available, br and
+zstd) encodings at the highest level, so serving an asset never touches the
+disk or compresses anything. Responses carry a strong ``ETag`` per encoding
+and ``Cache-Control``; HTML pages are revalidated on every load (cheap with
+``If-None-Match``), other assets are cached for ``STATIC_MAX_AGE`` seconds.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .compression import CODECS, MAX_LEVELS, PREFERRED_ENCODINGS, compressible, negotiate
+
+logger = logging.getLogger("zqautonxg.web.static")
+
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", 3600))
+
+
+class StaticAsset:
+    """One file and its precompressed encodings."""
+
+    __slots__ = ("media_type", "etag", "variants", "cache_control")
+
+    def __init__(self, path: str, data: bytes) -> None:
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = hashlib.sha256(data).hexdigest()[:32]
+        self.variants: Dict[Optional[str], bytes] = {None: data}
+        if compressible(self.media_type):
+            for encoding, compress in CODECS.items():
+                compressed = compress(data, MAX_LEVELS[encoding])
+                if len(compressed) < len(data):
+                    self.variants[encoding] = compressed
+        if self.media_type == "text/html":
+            self.cache_control = "no-cache"
+        else:
+            self.cache_control = f"public, max-age={STATIC_MAX_AGE}"
+
+    def response(self, request: Request) -> Response:
+        offered = [e for e in PREFERRED_ENCODINGS if e in self.variants]
+        encoding = negotiate(request.headers.get("accept-encoding", ""), offered)
+        etag = f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.media_type, headers=headers)
+
+
+class StaticAssets:
+    """Every file under ``directory``, keyed by its relative path."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.assets: Dict[str, StaticAsset] = {}
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    data = f.read()
+                relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                self.assets[relative] = StaticAsset(path, data)
+        size = sum(len(v) for asset in self.assets.values() for v in asset.variants.values())
+        logger.info(f"Loaded {len(self.assets)} static asset(s) from {directory} ({size} bytes)")
+
+    def get(self, path: str) -> Optional[StaticAsset]:
+        return self.assets.get(path)